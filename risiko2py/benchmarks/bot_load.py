@@ -0,0 +1,150 @@
+"""
+Bot-only games as a load generator, and the cost of the bot levels.
+
+Starts the WSGI server with a fresh database (or uses --url), creates games
+where every seat is a bot and advances them through the HTTP API: every turn
+is one POST /api/game/ready (the turn is resolved and all bots plan and send
+their fleets in the same request), followed by the GET /since/<version> a
+watching client would send. Reports turns per second, latency and how the
+games went.
+
+    python bot_load.py --games 8 --clients 4 --turns 30 --level normal
+    python bot_load.py --levels easy,normal,hard --galaxies 5 --planets 300
+
+--direct times only the bot planning of each level in this process, without
+the server.
+
+Rate limits are switched off for the started server, a running server needs
+RATE_LIMIT_ENABLED=0 as well.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from load_test import api, free_port, start_server
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "server"))
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+def run_games(url, token, args, level):
+    bots = {f"Bot {i + 1}": level for i in range(args.bots)}
+    games = []
+    for _ in range(args.games):
+        answer = api(url, "/game/start", {"players": [], "bots": bots, "galaxies": args.galaxies,
+                                          "planets": args.planets}, token)
+        games.append(answer["game_id"])
+
+    latencies, errors = [], []
+    lock = threading.Lock()
+    next_game = iter([game_id for game_id in games for _ in range(args.turns)])
+
+    def client():
+        version = 0
+        while True:
+            with lock:
+                game_id = next(next_game, None)
+            if game_id is None:
+                return
+            start = time.perf_counter()
+            answer = api(url, "/game/ready", {"game_id": game_id, "player": "Bot 1"}, token)
+            latency = time.perf_counter() - start
+            if "patch" not in answer:
+                errors.append(answer)
+                continue
+            version = answer["patch"]["version"]
+            # What a client watching the game would fetch after the turn
+            api(url, f"/game/{game_id}/since/{version - 1}", token=token)
+            with lock:
+                latencies.append(latency)
+
+    threads = [threading.Thread(target=client) for _ in range(args.clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    owners = {}
+    fleets = 0
+    for game_id in games:
+        state = json.loads(api(url, f"/game/{game_id}", token=token)["state"])
+        fleets += len(state["fleets"])
+        for system in state["systems"]:
+            owners[system["owner"]] = owners.get(system["owner"], 0) + 1
+    print(f"{level}: {len(latencies)} turns in {elapsed:.1f} s, {len(latencies) / elapsed:.1f} turns/s, "
+          f"p50 {percentile(latencies, 50) * 1000:.0f} ms, p95 {percentile(latencies, 95) * 1000:.0f} ms, "
+          f"{len(errors)} errors")
+    bot_systems = sum(count for owner, count in owners.items() if owner in bots)
+    print(f"  after {args.turns} turns: bots own {bot_systems} systems, {fleets} fleets underway")
+
+def run_direct(args, levels):
+    import random
+    from utils.galaxy_gen import generate_galaxies
+    from utils.bots import BotView, plan_orders
+    import numpy as np
+
+    players = [f"Bot {i + 1}" for i in range(args.bots)]
+    systems, coords = generate_galaxies(args.galaxies, args.planets, players, seed=1)
+    # Spread owners so there is something to score
+    rnd = random.Random(1)
+    for system in systems:
+        if system["owner"] is None and rnd.random() < 0.3:
+            system["owner"] = rnd.choice(players + ["Pirates"])
+            system["current_ships"] = rnd.randint(10, 300)
+    state = {"systems": systems, "fleets": [], "button_coords": coords}
+    start = time.perf_counter()
+    view = BotView(state)
+    print(f"{args.galaxies} x {args.planets}, {len(players)} bots: arrays in {(time.perf_counter() - start) * 1000:.1f} ms")
+    rng = np.random.default_rng(1)
+    for level in levels:
+        start = time.perf_counter()
+        orders = sum(len(plan_orders(view, player, level, rng)) for player in players)
+        elapsed = time.perf_counter() - start
+        print(f"  {level:6}: {elapsed * 1000 / len(players):7.2f} ms per bot and year, {orders} orders")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="running server, default: start one")
+    parser.add_argument("--levels", default="normal", help="comma separated: easy,normal,hard")
+    parser.add_argument("--games", type=int, default=8)
+    parser.add_argument("--bots", type=int, default=4, help="bots per game")
+    parser.add_argument("--galaxies", type=int, default=1)
+    parser.add_argument("--planets", type=int, default=80)
+    parser.add_argument("--turns", type=int, default=30, help="turns per game")
+    parser.add_argument("--clients", type=int, default=4, help="concurrent HTTP clients")
+    parser.add_argument("--direct", action="store_true")
+    args = parser.parse_args()
+    levels = args.levels.split(",")
+
+    if args.direct:
+        run_direct(args, levels)
+        return
+
+    proc = None
+    tmp = tempfile.TemporaryDirectory()
+    url = args.url
+    if url is None:
+        proc, url = start_server("wsgi", free_port(), os.path.join(tmp.name, "bots.db"), {"RATE_LIMIT_ENABLED": "0"})
+    try:
+        api(url, "/user/register", {"username": "botload", "password": "botload"})
+        token = api(url, "/user/login", {"username": "botload", "password": "botload"})["access_token"]
+        for level in levels:
+            run_games(url, token, args, level)
+    finally:
+        if proc is not None:
+            proc.kill()
+            proc.wait()
+        tmp.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Galaxy drawing: one QPushButton per system against the GalaxyCanvas.
+
+Builds a ButtonGrid with the given number of systems both ways and reports how
+long building, showing and resizing take, and the time of one full repaint.
+
+    python canvas_bench.py --systems 600,1000,2000
+
+Runs without a display with QT_QPA_PLATFORM=offscreen.
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "client"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from ui.game_ui import ButtonGrid
+
+def make_coords(num_systems):
+    cols = max(15, int(math.sqrt(num_systems * 1.5)))
+    rows = math.ceil(num_systems * 1.5 / cols)
+    positions = random.sample([(r, c) for r in range(rows) for c in range(cols)], num_systems)
+    return {i + 1: positions[i] for i in range(num_systems)}
+
+def bench(app, num_systems, use_canvas, frames):
+    owners = [f"Player{i}" for i in range(8)]
+    coords = make_coords(num_systems)
+    start = time.perf_counter()
+    grid = ButtonGrid(num_buttons=num_systems, owners=owners, button_coords=coords, use_canvas=use_canvas)
+    for sys_id in grid.systems:
+        grid.state.set_system(0, sys_id, owner=random.choice(owners + [None]))
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    grid.resize(1600, 1000)
+    grid.show()
+    app.processEvents()
+    show = time.perf_counter() - start
+
+    start = time.perf_counter()
+    grid.resize(1200, 800)
+    app.processEvents()
+    resize = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        grid.repaint()
+    frame = (time.perf_counter() - start) / frames
+    grid.close()
+    grid.deleteLater()
+    app.processEvents()
+    return build, show, resize, frame
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--systems", default="600,1000,2000")
+    parser.add_argument("--frames", type=int, default=30)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    print(f"{'systems':>8} {'widget':>8} {'build ms':>10} {'show ms':>10} {'resize ms':>10} {'frame ms':>10}")
+    for num_systems in (int(n) for n in args.systems.split(",")):
+        for use_canvas in (False, True):
+            build, show, resize, frame = bench(app, num_systems, use_canvas, args.frames)
+            print(f"{num_systems:>8} {'canvas' if use_canvas else 'buttons':>8} {build * 1000:>10.1f} "
+                  f"{show * 1000:>10.1f} {resize * 1000:>10.1f} {frame * 1000:>10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Frame time of the fleet overlay with many fleets in flight.
+
+Fills a galaxy with random fleets between its systems, then measures full
+repaints of the grid (buttons and fleets) and the cost of a turn update, where
+every fleet moves one step and some arrive and get replaced.
+
+    python fleet_bench.py --systems 600 --fleets 1000,5000 --canvas
+
+Runs without a display with QT_QPA_PLATFORM=offscreen.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "client"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from ui.game_ui import ButtonGrid
+from ui.fleet_overlay import fleet_total_turns
+from game_state import FleetRecord
+
+def random_fleet(grid, owners):
+    source, destination = random.sample(list(grid.systems), 2)
+    total = fleet_total_turns(grid.systems[source].grid_pos, grid.systems[destination].grid_pos)
+    return FleetRecord(source, destination, 10, random.choice(owners), random.randint(1, total), 0, 0)
+
+def next_turn(grid, fleets, owners):
+    moved = []
+    for fleet in fleets:
+        if fleet.turns > 1:
+            moved.append(FleetRecord(fleet.source, fleet.destination, fleet.ships, fleet.owner, fleet.turns - 1, 0, 0))
+        else:
+            moved.append(random_fleet(grid, owners))
+    return moved
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--systems", type=int, default=600)
+    parser.add_argument("--fleets", default="1000,5000")
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--canvas", action="store_true", help="draw the galaxy on a GalaxyCanvas")
+    args = parser.parse_args()
+
+    random.seed(1)
+    app = QApplication.instance() or QApplication(sys.argv)
+    owners = [f"Player{i}" for i in range(8)]
+    grid = ButtonGrid(num_buttons=args.systems, owners=owners, use_canvas=args.canvas)
+    grid.player_owner = owners[0]
+    grid.resize(1600, 1000)
+    grid.show()
+    app.processEvents()
+
+    def frame_time():
+        start = time.perf_counter()
+        for _ in range(args.frames):
+            grid.repaint()
+        return (time.perf_counter() - start) / args.frames * 1000
+
+    base = frame_time()
+    print(f"{args.systems} systems, {'canvas' if args.canvas else 'buttons'}, no fleets: {base:.2f} ms per frame")
+    for count in (int(n) for n in args.fleets.split(",")):
+        fleets = [random_fleet(grid, owners) for _ in range(count)]
+        grid.fleets = fleets
+        grid.updateFleetOverlay()
+        grid.repaint()
+        frame = frame_time()
+
+        start = time.perf_counter()
+        fleets = next_turn(grid, fleets, owners)
+        grid.fleets = fleets
+        grid.updateFleetOverlay()
+        grid.repaint()
+        turn = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        grid.fleets = fleets + [random_fleet(grid, [owners[0]]) for _ in range(10)]
+        grid.updateFleetOverlay()
+        grid.repaint()
+        added = (time.perf_counter() - start) * 1000
+        print(f"{count:>6} fleets: {frame:7.2f} ms per frame, turn update {turn:7.2f} ms, "
+              f"10 fleets launched {added:7.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Galaxy generation of /game/start: the old loops against utils/galaxy_gen.py.
+
+The old code shuffled a list of all cells per galaxy and looked for start
+planets with a loop over every player for every system. It only works up to
+the 600 cells of a 40 x 15 grid, so it is timed only where the planets fit.
+Also times json.dumps of the state, which start_game does right after, and
+counts the systems that touch another one (left, right, above, below) in the
+jittered grid layout.
+
+    python galaxy_gen_bench.py --galaxies 100 --planets 1000 --players 8
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "server"))
+
+from utils.galaxy_gen import generate_galaxies, map_size, ROWS, COLS
+
+def old_generate(galaxies, planets, players):
+    # The loops start_game had before galaxy_gen.py
+    rows, cols = ROWS, COLS
+    galaxy_button_coords = {}
+    for galaxy_index in range(galaxies):
+        positions = [(row, col) for row in range(rows) for col in range(cols)]
+        random.shuffle(positions)
+        galaxy_button_coords[galaxy_index] = {i + 1: positions[i] for i in range(planets)}
+    player_start_planets = {}
+    for idx, player in enumerate(players):
+        system_ids = list(range(1, planets + 1))
+        random.shuffle(system_ids)
+        player_start_planets[player] = (idx % galaxies, system_ids[0])
+    systems = []
+    for galaxy_index in range(galaxies):
+        for sys_id in range(1, planets + 1):
+            owner = None
+            current_ships = 0
+            ship_production = random.randint(1, 10)
+            defense_factor = round(random.uniform(0.7, 1.0), 2)
+            for player, (g_idx, s_id) in player_start_planets.items():
+                if galaxy_index == g_idx and sys_id == s_id:
+                    owner = player
+                    current_ships = 250
+                    ship_production = 10
+                    defense_factor = 1.0
+            systems.append({"galaxy": galaxy_index, "system_id": sys_id, "owner": owner,
+                            "current_ships": current_ships, "ship_production": ship_production,
+                            "defense_factor": defense_factor,
+                            "coords": galaxy_button_coords[galaxy_index][sys_id]})
+    return systems, galaxy_button_coords
+
+def touching(coords):
+    count = 0
+    for positions in coords.values():
+        cells = set(positions.values())
+        count += sum(1 for row, col in cells if (row + 1, col) in cells or (row, col + 1) in cells)
+    return count
+
+def best_of(repeat, func, *args):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--galaxies", type=int, default=100)
+    parser.add_argument("--planets", type=int, default=1000)
+    parser.add_argument("--players", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    players = [f"Player {i + 1}" for i in range(args.players)]
+
+    sizes = [(args.galaxies, min(args.planets, ROWS * COLS)), (args.galaxies, args.planets),
+             (1, args.galaxies * args.planets)]
+    for galaxies, planets in dict.fromkeys(sizes):
+        rows, cols = map_size(planets)
+        print(f"{galaxies} galaxies x {planets} planets on {rows} x {cols}, {len(players)} players")
+        new_time, (systems, coords) = best_of(args.repeat, generate_galaxies, galaxies, planets, players)
+        owned = sum(1 for system in systems if system["owner"])
+        print(f"  galaxy_gen:  {new_time * 1000:8.1f} ms ({len(systems)} systems, {owned} start planets, "
+              f"{touching(coords)} touching)")
+        if planets <= ROWS * COLS:
+            old_time, _ = best_of(args.repeat, old_generate, galaxies, planets, players)
+            print(f"  old loops:   {old_time * 1000:8.1f} ms ({old_time / new_time:.1f}x)")
+        else:
+            print("  old loops:   -- (only 40 x 15 cells)")
+        dump_time, _ = best_of(args.repeat, json.dumps, {"systems": systems, "button_coords": coords})
+        print(f"  json.dumps:  {dump_time * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
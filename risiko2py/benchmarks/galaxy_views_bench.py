@@ -0,0 +1,98 @@
+"""
+Time and memory to open a loaded game in MultiGrid, all galaxy views built up
+front against views built on demand.
+
+Every case runs in its own process so the memory numbers don't mix.
+
+    python galaxy_views_bench.py --galaxies 1,10,50 --planets 80
+
+Runs without a display with QT_QPA_PLATFORM=offscreen.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "client"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+def make_state(galaxies, planets, owners):
+    positions = [(row, col) for row in range(40) for col in range(15)]
+    state = {"galaxies": galaxies, "planets": planets, "year": 1, "version": 1,
+             "systems": [], "fleets": [], "button_coords": {}}
+    for galaxy in range(galaxies):
+        coords = random.sample(positions, planets)
+        state["button_coords"][str(galaxy)] = {str(i + 1): coords[i] for i in range(planets)}
+        for i in range(planets):
+            state["systems"].append({"galaxy": galaxy, "system_id": i + 1,
+                                     "owner": random.choice(owners + [None]),
+                                     "current_ships": random.randint(0, 300),
+                                     "ship_production": random.randint(1, 10),
+                                     "defense_factor": 1.0})
+    return state
+
+def open_game(galaxies, planets, lazy):
+    from PyQt5.QtWidgets import QApplication
+    from ui.game_ui import ButtonGrid, MultiGrid
+    from game_state import ClientGameState
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    owners = [f"Player{i}" for i in range(4)]
+    text = json.dumps(make_state(galaxies, planets, owners))
+    base = rss_mb()
+
+    start = time.perf_counter()
+    state = json.loads(text)
+    game_state = ClientGameState()
+    game_state.load_state(state)
+
+    def make_grid(galaxy):
+        grid = ButtonGrid(num_buttons=planets, owners=owners, button_coords=state["button_coords"][str(galaxy)],
+                          state=game_state, galaxy_index=galaxy)
+        grid.player_owner = owners[0]
+        return grid
+
+    if lazy:
+        multigrid = MultiGrid(factory=make_grid, count=galaxies, release=lambda galaxy, grid: grid.detach())
+    else:
+        multigrid = MultiGrid([make_grid(g) for g in range(galaxies)])
+    multigrid.resize(1200, 900)
+    multigrid.show()
+    app.processEvents()
+    first_paint = time.perf_counter() - start
+    # Let the idle prefetch run
+    for _ in range(10):
+        app.processEvents()
+    return {"open_ms": first_paint * 1000, "rss_mb": rss_mb() - base, "views": len(multigrid.views)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--galaxies", default="1,10,50")
+    parser.add_argument("--planets", type=int, default=80)
+    parser.add_argument("--run", nargs=3, metavar=("GALAXIES", "PLANETS", "LAZY"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        random.seed(1)
+        galaxies, planets, lazy = int(args.run[0]), int(args.run[1]), args.run[2] == "1"
+        print(json.dumps(open_game(galaxies, planets, lazy)))
+        return
+
+    print(f"{'galaxies':>9} {'views':>7} {'open ms':>9} {'built':>6} {'RSS MB':>8}")
+    for galaxies in (int(g) for g in args.galaxies.split(",")):
+        for lazy in (False, True):
+            output = subprocess.run([sys.executable, __file__, "--run", str(galaxies), str(args.planets), str(int(lazy))],
+                                    capture_output=True, text=True, check=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{galaxies:>9} {'lazy' if lazy else 'eager':>7} {result['open_ms']:>9.1f} "
+                  f"{result['views']:>6} {result['rss_mb']:>8.1f}")
+
+if __name__ == "__main__":
+    main()
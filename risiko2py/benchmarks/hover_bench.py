@@ -0,0 +1,55 @@
+"""
+Frame time while sweeping the mouse across a button galaxy.
+
+Sends Enter/Leave events to the buttons one after the other, like a mouse
+moving over the grid, and lets Qt process and paint after every step. Reports
+the time per step (one "frame") and how many top level widgets were left.
+
+    python hover_bench.py --systems 600 --steps 1000
+
+Runs without a display with QT_QPA_PLATFORM=offscreen.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "client"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEvent
+from PyQt5.QtWidgets import QApplication
+from ui.game_ui import ButtonGrid
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--systems", type=int, default=600)
+    parser.add_argument("--steps", type=int, default=1000)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    grid = ButtonGrid(num_buttons=args.systems, owners=["Player0", "Player1"], use_canvas=False)
+    grid.player_owner = "Player0"
+    grid.resize(1200, 900)
+    grid.show()
+    app.processEvents()
+    buttons = list(grid.buttons.values())
+
+    times = []
+    for step in range(args.steps):
+        button = buttons[step % len(buttons)]
+        start = time.perf_counter()
+        app.sendEvent(button, QEvent(QEvent.Enter))
+        app.processEvents()
+        app.sendEvent(button, QEvent(QEvent.Leave))
+        app.processEvents()
+        times.append(time.perf_counter() - start)
+
+    times.sort()
+    print(f"{args.steps} hover steps over {args.systems} systems")
+    print(f"  mean {1000 * sum(times) / len(times):.2f} ms, p50 {1000 * times[len(times) // 2]:.2f} ms, "
+          f"p99 {1000 * times[int(len(times) * 0.99)]:.2f} ms")
+    print(f"  top level widgets afterwards: {len(app.topLevelWidgets())}")
+
+if __name__ == "__main__":
+    main()
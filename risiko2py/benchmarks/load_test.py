@@ -0,0 +1,197 @@
+"""
+Load test for the game server: many idle connections plus a few busy clients.
+
+Against a running server:
+    python load_test.py --url http://localhost:5000 --idle 1000 --concurrency 20
+
+Start the WSGI (app.run) and the ASGI (uvicorn) server one after the other on
+this machine, each with a fresh database, and compare them:
+    python load_test.py --compare --idle 1000 --concurrency 20
+
+Idle connections send half a request and then wait, like clients sitting in a
+long poll. The busy clients fetch /api/game/<id> in a loop over keep-alive
+connections. For started servers the script also reports threads and memory.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from urllib.parse import urlparse
+
+SERVER_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../server"))
+
+def api(url, path, data=None, token=None):
+    headers = {"Content-Type": "application/json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    body = json.dumps(data).encode("utf-8") if data is not None else None
+    request = urllib.request.Request(url + "/api" + path, data=body, headers=headers)
+    try:
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return json.loads(e.read())
+
+def setup_game(url, planets):
+    api(url, "/user/register", {"username": "loadtest", "password": "loadtest"})
+    token = api(url, "/user/login", {"username": "loadtest", "password": "loadtest"})["access_token"]
+    game_id = api(url, "/game/start", {"players": ["A", "B"], "planets": planets}, token)["game_id"]
+    return token, game_id
+
+async def open_idle(host, port, count):
+    connections = []
+    for _ in range(count):
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            break
+        writer.write(b"GET /api/game/1 HTTP/1.1\r\nHost: loadtest\r\n")
+        connections.append(writer)
+    await asyncio.sleep(0.5)
+    return connections
+
+async def busy_client(host, port, path, token, stop_at, latencies, errors):
+    request = (f"GET {path} HTTP/1.1\r\nHost: loadtest\r\n"
+               f"Authorization: Bearer {token}\r\n\r\n").encode("latin1")
+    reader, writer = await asyncio.open_connection(host, port)
+    while time.perf_counter() < stop_at:
+        start = time.perf_counter()
+        try:
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            if not head.startswith(b"HTTP/1.1 200"):
+                errors.append(head.split(b"\r\n")[0])
+            if b"connection: close" in head.lower():
+                # The werkzeug server does not keep connections alive
+                writer.close()
+                reader, writer = await asyncio.open_connection(host, port)
+        except (OSError, asyncio.IncompleteReadError) as e:
+            errors.append(e)
+            writer.close()
+            reader, writer = await asyncio.open_connection(host, port)
+            continue
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+async def run_load(url, token, game_id, idle, concurrency, duration):
+    parsed = urlparse(url)
+    idle_connections = await open_idle(parsed.hostname, parsed.port, idle)
+    latencies, errors = [], []
+    stop_at = time.perf_counter() + duration
+    await asyncio.gather(*[
+        busy_client(parsed.hostname, parsed.port, f"/api/game/{game_id}", token, stop_at, latencies, errors)
+        for _ in range(concurrency)
+    ])
+    for writer in idle_connections:
+        writer.close()
+    latencies.sort()
+    return {
+        "idle_open": len(idle_connections),
+        "requests": len(latencies),
+        "req_per_s": len(latencies) / duration,
+        "p50_ms": 1000 * latencies[len(latencies) // 2] if latencies else None,
+        "p99_ms": 1000 * latencies[int(len(latencies) * 0.99)] if latencies else None,
+        "errors": len(errors)
+    }
+
+def process_stats(pid):
+    stats = {}
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key == "Threads":
+                stats["threads"] = int(value)
+            elif key == "VmRSS":
+                stats["rss_mb"] = int(value.split()[0]) / 1024
+    return stats
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def start_server(kind, port, db_path, env=None):
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}", **(env or {}))
+    if kind == "wsgi":
+        code = ("from app import app, db\n"
+                "with app.app_context(): db.create_all()\n"
+                f"app.run(host='127.0.0.1', port={port}, threaded=True)")
+        cmd = [sys.executable, "-c", code]
+    else:
+        cmd = [sys.executable, "-m", "uvicorn", "asgi:application", "--host", "127.0.0.1",
+               "--port", str(port), "--log-level", "warning", "--backlog", "4096"]
+    proc = subprocess.Popen(cmd, cwd=SERVER_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(url + "/")
+            return proc, url
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError(f"{kind} server did not start")
+
+def measure(url, args, pid=None):
+    token, game_id = setup_game(url, args.planets)
+    result = asyncio.run(run_load(url, token, game_id, args.idle, args.concurrency, args.duration))
+    if pid:
+        # Open the idle connections once more to see what holding them costs
+        async def hold():
+            parsed = urlparse(url)
+            connections = await open_idle(parsed.hostname, parsed.port, args.idle)
+            stats = process_stats(pid)
+            for writer in connections:
+                writer.close()
+            return stats
+        result.update(asyncio.run(hold()))
+    return result
+
+def print_table(results):
+    columns = ["idle_open", "requests", "req_per_s", "p50_ms", "p99_ms", "errors", "threads", "rss_mb"]
+    print(f"{'server':<8}" + "".join(f"{c:>11}" for c in columns))
+    for name, result in results.items():
+        cells = []
+        for c in columns:
+            value = result.get(c)
+            cells.append(f"{value:>11.1f}" if isinstance(value, float) else f"{str(value):>11}")
+        print(f"{name:<8}" + "".join(cells))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--compare", action="store_true", help="start WSGI and ASGI servers and compare them")
+    parser.add_argument("--idle", type=int, default=500, help="idle connections held open")
+    parser.add_argument("--concurrency", type=int, default=20, help="busy clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--planets", type=int, default=80)
+    args = parser.parse_args()
+
+    if not args.compare:
+        print_table({"target": measure(args.url, args)})
+        return
+
+    results = {}
+    for kind in ("wsgi", "asgi"):
+        with tempfile.TemporaryDirectory() as tmp:
+            proc, url = start_server(kind, free_port(), os.path.join(tmp, "load.db"))
+            try:
+                results[kind] = measure(url, args, proc.pid)
+            finally:
+                proc.terminate()
+                proc.wait()
+    print_table(results)
+
+if __name__ == "__main__":
+    main()
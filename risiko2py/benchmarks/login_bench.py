@@ -0,0 +1,115 @@
+"""
+Login throughput under concurrency.
+
+Starts the WSGI server with a fresh database, then for every concurrency level
+lets that many clients log in as fast as they can. Next to them one client keeps
+calling GET /api/user to show how the rest of the server copes with the burst.
+
+    python login_bench.py --hash-method scrypt --concurrency 1,4,16,64
+    python login_bench.py --hash-method pbkdf2:sha256:1000 --hash-workers 2
+
+Rate limits are switched off for the benchmark.
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.request
+
+from load_test import api, free_port, start_server
+
+def post_login(url):
+    request = urllib.request.Request(url + "/api/user/login",
+                                     data=json.dumps({"username": "bench", "password": "bench"}).encode("utf-8"),
+                                     headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+def get_user(url, token):
+    request = urllib.request.Request(url + "/api/user", headers={"Authorization": f"Bearer {token}"})
+    with urllib.request.urlopen(request) as response:
+        response.read()
+
+def percentile(values, p):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return 1000 * values[min(len(values) - 1, int(len(values) * p))]
+
+def run_level(url, token, concurrency, duration):
+    stop_at = time.perf_counter() + duration
+    login_times, user_times, statuses = [], [], []
+    lock = threading.Lock()
+
+    def login_client():
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            status = post_login(url)
+            with lock:
+                statuses.append(status)
+                if status == 200:
+                    login_times.append(time.perf_counter() - start)
+
+    def user_client():
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            get_user(url, token)
+            user_times.append(time.perf_counter() - start)
+            time.sleep(0.02)
+
+    threads = [threading.Thread(target=login_client) for _ in range(concurrency)]
+    threads.append(threading.Thread(target=user_client))
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return {
+        "concurrency": concurrency,
+        "logins_per_s": len(login_times) / duration,
+        "login_p50_ms": percentile(login_times, 0.5),
+        "login_p99_ms": percentile(login_times, 0.99),
+        "busy_503": statuses.count(503),
+        "user_p50_ms": percentile(user_times, 0.5),
+        "user_p99_ms": percentile(user_times, 0.99)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hash-method", default="scrypt", help="werkzeug hash method, sets the hash cost")
+    parser.add_argument("--hash-workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--max-pending", type=int, default=0, help="hashes accepted at a time, 0 = as many as workers")
+    parser.add_argument("--concurrency", default="1,4,16,64")
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    env = {
+        "RATE_LIMIT_ENABLED": "0",
+        "PASSWORD_HASH_METHOD": args.hash_method,
+        "PASSWORD_HASH_WORKERS": str(args.hash_workers),
+        "PASSWORD_HASH_MAX_PENDING": str(args.max_pending)
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        proc, url = start_server("wsgi", free_port(), os.path.join(tmp, "login.db"), env)
+        try:
+            api(url, "/user/register", {"username": "bench", "password": "bench"})
+            token = api(url, "/user/login", {"username": "bench", "password": "bench"})["access_token"]
+            results = [run_level(url, token, int(c), args.duration) for c in args.concurrency.split(",")]
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    print(f"hash method {args.hash_method}, {args.hash_workers} hash workers")
+    columns = list(results[0])
+    print("".join(f"{c:>14}" for c in columns))
+    for result in results:
+        print("".join(f"{result[c]:>14.1f}" if isinstance(result[c], float) else f"{result[c]:>14}"
+                      for c in columns))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Cost of the galaxy overview (GalaxyMinimap) next to the galaxy views.
+
+Builds a game with many galaxies in a ClientGameState and measures the first
+paint of the overview, a turn without owner changes (only ship counts move)
+and a turn where a few systems in one galaxy change owner (only the time
+spent in the overview, not in the state). For comparison it times flipping
+through every galaxy with MultiGrid, the only way to see them all before the
+overview.
+
+    python minimap_bench.py --galaxies 50 --systems 600
+
+Runs without a display with QT_QPA_PLATFORM=offscreen.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "client"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from ui.game_ui import ButtonGrid, MultiGrid
+from ui.galaxy_minimap import GalaxyMinimap
+from game_state import ClientGameState
+
+def make_state(galaxies, num_systems, owners, rows=40, cols=15):
+    cols = max(cols, (num_systems + rows - 1) // rows)
+    systems, coords = [], {}
+    for galaxy in range(galaxies):
+        positions = random.sample([(r, c) for r in range(rows) for c in range(cols)], num_systems)
+        coords[str(galaxy)] = {str(i + 1): positions[i] for i in range(num_systems)}
+        systems += [{
+            "galaxy": galaxy,
+            "system_id": i + 1,
+            "owner": random.choice(owners + [None]),
+            "current_ships": random.randint(0, 300),
+            "ship_production": random.randint(1, 10),
+            "defense_factor": 1.0
+        } for i in range(num_systems)]
+    return {"galaxies": galaxies, "year": 1, "version": 1, "systems": systems, "fleets": [], "button_coords": coords}
+
+def timed(app, action):
+    start = time.perf_counter()
+    action()
+    app.processEvents()
+    return (time.perf_counter() - start) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--galaxies", type=int, default=50)
+    parser.add_argument("--systems", type=int, default=600)
+    args = parser.parse_args()
+
+    random.seed(1)
+    app = QApplication.instance() or QApplication(sys.argv)
+    owners = [f"Player{i}" for i in range(8)]
+    owner_colors = {owner: "#{:06X}".format(random.randint(0, 0xFFFFFF)) for owner in owners}
+    state = make_state(args.galaxies, args.systems, owners)
+    game_state = ClientGameState()
+    game_state.load_state(state)
+
+    minimap = GalaxyMinimap(game_state, args.galaxies, owner_colors)
+    print(f"overview first paint:       {timed(app, minimap.show):8.1f} ms")
+    # Count the tiles drawn and the time the overview spends in the turn
+    renders, spent = [], [0.0]
+    original_render, original_changed = minimap.render_tile, minimap.systems_changed
+    minimap.render_tile = lambda galaxy: renders.append(galaxy) or original_render(galaxy)
+    def systems_changed(systems):
+        start = time.perf_counter()
+        original_changed(systems)
+        spent[0] += time.perf_counter() - start
+    minimap.systems_changed = systems_changed
+    def turn(change):
+        renders.clear()
+        spent[0] = 0.0
+        state["version"] += 1
+        change()
+        game_state.load_state(state)
+        start = time.perf_counter()
+        minimap.repaint()
+        return (spent[0] + time.perf_counter() - start) * 1000
+
+    def production():
+        for sys in state["systems"]:
+            sys["current_ships"] += sys["ship_production"]
+    print(f"turn, no owner changes:     {turn(production):8.1f} ms, {len(renders)} tiles drawn")
+
+    def conquest():
+        for sys in random.sample([s for s in state["systems"] if s["galaxy"] == 0], 5):
+            sys["owner"] = random.choice(owners)
+    print(f"turn, 5 owners in 1 galaxy: {turn(conquest):8.1f} ms, {len(renders)} tiles drawn")
+    minimap.detach()
+
+    def make_grid(galaxy_index):
+        coords = {int(k): tuple(v) for k, v in state["button_coords"][str(galaxy_index)].items()}
+        return ButtonGrid(num_buttons=args.systems, owners=owners, button_coords=coords,
+                          owner_colors=owner_colors, state=game_state, galaxy_index=galaxy_index)
+    multigrid = MultiGrid(factory=make_grid, count=args.galaxies, release=lambda index, grid: grid.detach())
+    multigrid.resize(1200, 900)
+    multigrid.show()
+    app.processEvents()
+    def flip_all():
+        for _ in range(args.galaxies):
+            multigrid.showNextGalaxy()
+            app.processEvents()
+    print(f"flipping through galaxies:  {timed(app, flip_all):8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Saves of the hot-seat game: CSV folders against the single .r2save file.
+
+Plays a game with random fleets for a number of turns and saves after every
+turn, once the old way (a new folder with players.csv and systems.csv +
+fleets.csv per galaxy) and once as an autosave delta appended to one file.
+Prints time, files and bytes written, then the time to load the last save
+and checks that both give the same game. Also runs the converter on the last
+CSV folder.
+
+    python save_bench.py --galaxies 10 --systems 200 --turns 50
+"""
+import argparse
+import csv
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from hotseat_engine import HotSeatGame
+from hotseat_save import SaveFile, convert_csv_folder
+
+def write_csv_folder(game, folder):
+    # The save format of older versions, as MultiGrid.saveGame wrote it
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, "players.csv"), "w", newline="") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["Owner", "Color", "Ready"])
+        for owner in game.owners:
+            writer.writerow([owner, game.owner_colors[owner], "True" if owner in game.ready_set else "False"])
+    for galaxy, systems in enumerate(game.galaxies):
+        galaxy_folder = os.path.join(folder, f"galaxy_{galaxy}")
+        os.makedirs(galaxy_folder, exist_ok=True)
+        with open(os.path.join(galaxy_folder, "systems.csv"), "w", newline="") as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(["Type", "ID", "Current Ships", "Ship Production", "Defense Factor", "Owner", "Grid Position", "Year"])
+            for system in systems.values():
+                writer.writerow(["System", system.system_id, system.current_ships, system.ship_production,
+                                 system.defense_factor, system.owner, str(system.grid_pos), game.year])
+        with open(os.path.join(galaxy_folder, "fleets.csv"), "w", newline="") as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(["Type", "Source", "Destination", "Ships", "Turns", "Owner", "Year"])
+            for fleet in game.fleets[galaxy]:
+                writer.writerow(["Fleet", fleet["source"], fleet["destination"], fleet["ships"],
+                                 fleet["turns"], fleet["owner"], fleet["year"]])
+
+def folder_size(path):
+    files = size = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            files += 1
+            size += os.path.getsize(os.path.join(root, name))
+    return files, size
+
+def play_turn(game, orders):
+    for galaxy, systems in enumerate(game.galaxies):
+        ids = list(systems)
+        for _ in range(orders):
+            source = systems[random.choice(ids)]
+            if source.owner in game.owners and source.current_ships > 10:
+                game.launch_fleet(galaxy, source.system_id, random.choice(ids),
+                                  source.current_ships // 2, source.owner)
+    for owner in game.owners:
+        game.set_ready(owner)
+
+def same_game(a, b):
+    return a.to_dict() == b.to_dict()
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--galaxies", type=int, default=10)
+    parser.add_argument("--systems", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--orders", type=int, default=5, help="fleet orders per galaxy and turn")
+    args = parser.parse_args()
+
+    random.seed(1)
+    owners = ["Alice", "Bob", "Carol", "Dave"]
+    game = HotSeatGame.new(args.galaxies, args.systems, owners)
+    game.assign_starting_planets({owner: i % args.galaxies for i, owner in enumerate(owners)})
+    game.assign_pirate_planets()
+
+    workdir = tempfile.mkdtemp(prefix="save_bench_")
+    try:
+        save_file = SaveFile(os.path.join(workdir, "autosave.r2save"))
+        save_file.write_snapshot(game)
+        csv_time = file_time = 0.0
+        folder = None
+        for turn in range(args.turns):
+            play_turn(game, args.orders)
+            folder = os.path.join(workdir, "csv", f"save_{turn}")
+            start = time.perf_counter()
+            write_csv_folder(game, folder)
+            csv_time += time.perf_counter() - start
+            start = time.perf_counter()
+            save_file.append_delta(game)
+            file_time += time.perf_counter() - start
+
+        csv_files, csv_bytes = folder_size(os.path.join(workdir, "csv"))
+        file_bytes = os.path.getsize(save_file.path)
+        print(f"{args.galaxies} galaxies x {args.systems} systems, {args.turns} turns")
+        print(f"CSV folders:  {csv_time * 1000 / args.turns:7.2f} ms per save, {csv_files} files, {csv_bytes / 1024:.0f} KB")
+        print(f"single file:  {file_time * 1000 / args.turns:7.2f} ms per save, 1 file, {file_bytes / 1024:.0f} KB")
+
+        start = time.perf_counter()
+        from_csv = HotSeatGame.load_csv(folder)
+        csv_load = time.perf_counter() - start
+        start = time.perf_counter()
+        from_file, _ = SaveFile.load(save_file.path)
+        file_load = time.perf_counter() - start
+        print(f"load CSV folder: {csv_load * 1000:.1f} ms, load file after {args.turns} turns: {file_load * 1000:.1f} ms")
+        print(f"same game: csv={same_game(from_csv, game)} file={same_game(from_file, game)}")
+
+        converted, _ = SaveFile.load(convert_csv_folder(folder))
+        print(f"converted folder is the same game: {same_game(converted, game)}")
+    finally:
+        shutil.rmtree(workdir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Time of ButtonGrid.update_from_state on a button galaxy.
+
+Feeds the grid full game states the way the client gets them from the server:
+once with no owner changes (only ship counts move) and once with a share of
+the systems changing owner every update.
+
+    python update_bench.py --systems 600 --updates 50 --changed 0.05
+
+Runs without a display with QT_QPA_PLATFORM=offscreen.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "client"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from ui.game_ui import ButtonGrid
+
+def make_state(num_systems, owners):
+    systems = [{
+        "galaxy": 0,
+        "system_id": i + 1,
+        "owner": random.choice(owners + [None]),
+        "current_ships": random.randint(0, 300),
+        "ship_production": random.randint(1, 10),
+        "defense_factor": 1.0
+    } for i in range(num_systems)]
+    return {"year": 1, "version": 1, "systems": systems, "fleets": []}
+
+def next_state(state, owners, changed):
+    state = json.loads(json.dumps(state))
+    state["year"] += 1
+    state["version"] += 1
+    for sys in state["systems"]:
+        sys["current_ships"] += sys["ship_production"]
+        if random.random() < changed:
+            sys["owner"] = random.choice(owners + [None])
+    return state
+
+def run(app, grid, states):
+    start = time.perf_counter()
+    for state in states:
+        grid.update_from_state(json.dumps(state))
+        app.processEvents()
+    return (time.perf_counter() - start) / len(states)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--systems", type=int, default=600)
+    parser.add_argument("--updates", type=int, default=50)
+    parser.add_argument("--changed", type=float, default=0.05, help="share of systems changing owner per update")
+    args = parser.parse_args()
+
+    random.seed(1)
+    app = QApplication.instance() or QApplication(sys.argv)
+    owners = [f"Player{i}" for i in range(8)]
+    grid = ButtonGrid(num_buttons=args.systems, owners=owners, use_canvas=False)
+    grid.player_owner = owners[0]
+    grid.resize(1200, 900)
+    grid.show()
+
+    state = make_state(args.systems, owners)
+    grid.update_from_state(json.dumps(state))
+    app.processEvents()
+    for label, changed in (("no owner changes", 0.0), (f"{args.changed:.0%} owners change", args.changed)):
+        states = []
+        for _ in range(args.updates):
+            state = next_state(state, owners, changed)
+            states.append(state)
+        print(f"{label:>20}: {run(app, grid, states) * 1000:7.2f} ms per update_from_state")
+
+if __name__ == "__main__":
+    main()
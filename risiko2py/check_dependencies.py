@@ -9,7 +9,8 @@ dependencies = {
         "Flask-JWT-Extended",
         "Flask-Cors",
         "psycopg2-binary",
-        "python-dotenv"
+        "python-dotenv",
+        "numpy"
     ],
     "client": [
         "requests",
@@ -0,0 +1,372 @@
+"""
+Client side game state, the single source of truth for the views.
+
+Systems and fleets are slotted records instead of attributes on widgets, so the
+state takes little memory, can be used without Qt (tests, tools, the local
+engine) and the views only redraw what changed.
+"""
+import json
+import random
+
+class SystemRecord:
+    __slots__ = ("galaxy", "system_id", "owner", "current_ships", "ship_production", "defense_factor", "grid_pos")
+
+    # Values that come from the server, grid_pos is layout
+    FIELDS = ("owner", "current_ships", "ship_production", "defense_factor")
+
+    def __init__(self, galaxy, system_id, owner=None, current_ships=0, ship_production=1,
+                 defense_factor=1.0, grid_pos=None):
+        self.galaxy = galaxy
+        self.system_id = system_id
+        self.owner = owner
+        self.current_ships = current_ships
+        self.ship_production = ship_production
+        self.defense_factor = defense_factor
+        self.grid_pos = grid_pos
+
+    def update(self, values):
+        """Set the values of a system dict, returns True if anything changed."""
+        changed = False
+        for field in self.FIELDS:
+            if field in values and getattr(self, field) != values[field]:
+                setattr(self, field, values[field])
+                changed = True
+        return changed
+
+    def to_dict(self):
+        return {"galaxy": self.galaxy, "system_id": self.system_id, "owner": self.owner,
+                "current_ships": self.current_ships, "ship_production": self.ship_production,
+                "defense_factor": self.defense_factor}
+
+class FleetRecord:
+    __slots__ = ("source", "destination", "ships", "owner", "turns", "source_galaxy", "dest_galaxy")
+
+    def __init__(self, source, destination, ships, owner, turns, source_galaxy=None, dest_galaxy=None):
+        self.source = source
+        self.destination = destination
+        self.ships = ships
+        self.owner = owner
+        self.turns = turns
+        self.source_galaxy = source_galaxy
+        self.dest_galaxy = dest_galaxy
+
+    @classmethod
+    def from_dict(cls, fleet):
+        return cls(fleet["source"], fleet["destination"], fleet["ships"], fleet["owner"], fleet["turns"],
+                   fleet.get("source_galaxy"), fleet.get("dest_galaxy"))
+
+    def to_dict(self):
+        fleet = {"source": self.source, "destination": self.destination, "ships": self.ships,
+                 "owner": self.owner, "turns": self.turns}
+        if self.source_galaxy is not None:
+            fleet["source_galaxy"] = self.source_galaxy
+        if self.dest_galaxy is not None:
+            fleet["dest_galaxy"] = self.dest_galaxy
+        return fleet
+
+    def key(self):
+        return tuple(getattr(self, field) for field in self.__slots__)
+
+    def __eq__(self, other):
+        return isinstance(other, FleetRecord) and self.key() == other.key()
+
+    def galaxies(self):
+        """Galaxies the fleet is shown in, None for every galaxy (fleets without galaxy info)."""
+        if self.source_galaxy is None or self.dest_galaxy is None:
+            return None
+        return {self.source_galaxy, self.dest_galaxy}
+
+class ClientGameState:
+    """
+    The game as the client knows it, indexed by galaxy and system id.
+
+    Full states and versioned patches from the server are parsed once and
+    compared with the records. Observers subscribe per galaxy and only hear
+    about their galaxy's changes:
+
+        observer.systems_changed(systems)    # changed SystemRecords of the galaxy
+        observer.fleets_changed(fleets)      # all FleetRecords shown in the galaxy
+        observer.turn_changed(year, version, ready_set)
+
+    A new observer first gets the galaxy's current state.
+
+    Fleet orders are shown before the server answers (launch_fleet): the ships
+    are taken from the source and the fleet is drawn right away. Until the
+    order is confirmed or rejected, server values of the source system are
+    shown minus the pending ships, so other updates don't undo it.
+    """
+    def __init__(self):
+        self.systems = {}   # galaxy -> {system_id: SystemRecord}
+        self.fleets = {}    # galaxy -> [FleetRecord] shown in that galaxy
+        self.galaxies = 1
+        self.year = 1
+        self.version = 0
+        self.ready_set = set()
+        self.observers = {}  # galaxy -> [observer]
+        self.pending = []    # FleetRecords of orders the server hasn't answered yet
+
+    # --- observers ---
+
+    def subscribe(self, galaxy, observer):
+        self.observers.setdefault(galaxy, []).append(observer)
+        observer.systems_changed(list(self.systems.get(galaxy, {}).values()))
+        observer.fleets_changed(self.fleets.get(galaxy, []))
+        observer.turn_changed(self.year, self.version, self.ready_set)
+
+    def unsubscribe(self, galaxy, observer):
+        observers = self.observers.get(galaxy, [])
+        if observer in observers:
+            observers.remove(observer)
+
+    def notify(self, changed, fleets_changed, year, version, ready_set):
+        turn_changed = (year, version, ready_set) != (self.year, self.version, self.ready_set)
+        self.year, self.version, self.ready_set = year, version, ready_set
+        for galaxy, observers in self.observers.items():
+            for observer in list(observers):
+                if galaxy in changed:
+                    observer.systems_changed(changed[galaxy])
+                if galaxy in fleets_changed:
+                    observer.fleets_changed(self.fleets.get(galaxy, []))
+                if turn_changed:
+                    observer.turn_changed(year, version, ready_set)
+
+    # --- lookups ---
+
+    def system(self, galaxy, system_id):
+        return self.systems.get(galaxy, {}).get(system_id)
+
+    def galaxy_systems(self, galaxy):
+        return self.systems.setdefault(galaxy, {})
+
+    def add_galaxy(self, galaxy, coords):
+        """
+        Make sure the galaxy has a record for every system in coords ({system_id: (row, col)}).
+        Systems the server didn't send get random production like a new local game.
+        """
+        systems = self.galaxy_systems(galaxy)
+        for system_id, pos in coords.items():
+            record = systems.get(system_id)
+            if record is None:
+                systems[system_id] = SystemRecord(galaxy, system_id,
+                                                  ship_production=random.randint(1, 10),
+                                                  defense_factor=round(random.uniform(0.7, 1.0), 2),
+                                                  grid_pos=tuple(pos))
+            elif record.grid_pos is None:
+                record.grid_pos = tuple(pos)
+        self.galaxies = max(self.galaxies, galaxy + 1)
+
+    # --- server updates ---
+
+    def load_state(self, state):
+        """Take a full game state (dict or JSON text)."""
+        if isinstance(state, str):
+            state = json.loads(state)
+        self.galaxies = state.get("galaxies", self.galaxies)
+        changed = self.diff_systems(state.get("systems", []), state.get("button_coords", {}))
+        fleets_changed = self.set_fleets(state.get("fleets", []))
+        self.notify(changed, fleets_changed, state.get("year", 1), state.get("version", 0), self.ready_set)
+
+    def apply_patch(self, patch):
+        """
+        Apply a patch from the server (see server/utils/patches.py).
+        Returns False if a version was missed and the full state is needed.
+        """
+        version = patch.get("version", 0)
+        if version != self.version + 1:
+            return False
+        changed = self.diff_systems(patch.get("systems", []))
+        fleets_changed = set()
+        if "fleets" in patch:
+            fleets_changed = self.set_fleets(patch["fleets"])
+        if patch.get("new_fleets"):
+            fleets_changed |= self.add_fleets(patch["new_fleets"])
+        ready_set = self.ready_set
+        if "players" in patch:
+            ready_set = {p["owner"] for p in patch["players"] if isinstance(p, dict) and p.get("ready")}
+        self.notify(changed, fleets_changed, patch.get("year", self.year), version, ready_set)
+        return True
+
+    def diff_systems(self, systems, button_coords=None):
+        """Store the systems, returns {galaxy: [changed SystemRecords]}."""
+        changed = {}
+        for sys in systems:
+            galaxy, system_id = sys.get("galaxy"), sys["system_id"]
+            if self.pending and "current_ships" in sys:
+                pending_ships = self.pending_ships(galaxy, system_id)
+                if pending_ships:
+                    sys = dict(sys, current_ships=sys["current_ships"] - pending_ships)
+            galaxy_systems = self.galaxy_systems(galaxy)
+            record = galaxy_systems.get(system_id)
+            if record is None:
+                record = galaxy_systems[system_id] = SystemRecord(galaxy, system_id)
+                record.update(sys)
+            elif not record.update(sys):
+                continue
+            if record.grid_pos is None and button_coords:
+                pos = (button_coords.get(str(galaxy)) or button_coords.get(galaxy) or {}).get(str(system_id))
+                record.grid_pos = tuple(pos) if pos else None
+            changed.setdefault(galaxy, []).append(record)
+        return changed
+
+    def group_fleets(self, fleets):
+        grouped = {galaxy: [] for galaxy in range(self.galaxies)}
+        self.add_to_groups(grouped, fleets)
+        return grouped
+
+    def add_to_groups(self, grouped, fleets):
+        for fleet in fleets:
+            if not isinstance(fleet, FleetRecord):
+                fleet = FleetRecord.from_dict(fleet)
+            galaxies = fleet.galaxies()
+            for galaxy in (list(grouped) if galaxies is None else galaxies):
+                grouped.setdefault(galaxy, []).append(fleet)
+
+    def set_fleets(self, fleets):
+        """Replace all fleets, returns the galaxies whose fleets changed."""
+        grouped = self.group_fleets(fleets)
+        # Orders in flight are not in the server's list yet
+        self.add_to_groups(grouped, self.pending)
+        changed = {galaxy for galaxy in set(grouped) | set(self.fleets)
+                   if grouped.get(galaxy, []) != self.fleets.get(galaxy, [])}
+        self.fleets = grouped
+        return changed
+
+    def add_fleets(self, fleets):
+        grouped = self.group_fleets(fleets)
+        changed = set()
+        for galaxy, new in grouped.items():
+            if new:
+                self.fleets.setdefault(galaxy, []).extend(new)
+                changed.add(galaxy)
+        return changed
+
+    def to_state(self, base=None):
+        """
+        The game as a state dict like the server's. Keys that are not kept
+        here (button_coords, owner_colors, planets) are taken from base.
+        """
+        state = dict(base or {})
+        state["galaxies"] = self.galaxies
+        state["systems"] = [record.to_dict() for galaxy in sorted(self.systems, key=str)
+                            for record in self.systems[galaxy].values()]
+        # Fleets are listed in every galaxy they are shown in
+        fleets, seen = [], set()
+        for galaxy_fleets in self.fleets.values():
+            for fleet in galaxy_fleets:
+                if id(fleet) not in seen:
+                    seen.add(id(fleet))
+                    fleets.append(fleet.to_dict())
+        state["fleets"] = fleets
+        state["year"] = self.year
+        state["version"] = self.version
+        return state
+
+    # --- fleet orders sent to the server ---
+
+    def pending_ships(self, galaxy, system_id):
+        return sum(fleet.ships for fleet in self.pending
+                   if fleet.source == system_id and fleet.source_galaxy == galaxy)
+
+    def launch_fleet(self, fleet):
+        """
+        Show a fleet order before the server answered: take the ships from the
+        source and add the fleet. Returns the order for confirm_fleet/reject_fleet.
+        """
+        source = self.system(fleet.source_galaxy, fleet.source)
+        source.current_ships -= fleet.ships
+        self.pending.append(fleet)
+        fleets_changed = set()
+        for galaxy in (fleet.galaxies() or range(self.galaxies)):
+            self.fleets.setdefault(galaxy, []).append(fleet)
+            fleets_changed.add(galaxy)
+        self.notify({fleet.source_galaxy: [source]}, fleets_changed, self.year, self.version, self.ready_set)
+        return fleet
+
+    def confirm_fleet(self, order, patch):
+        """
+        The server accepted the order, patch is its answer. The pending fleet
+        is replaced by the server's one in place, so views that show the same
+        thing have nothing to redraw. Returns False like apply_patch.
+        """
+        self.pending = [fleet for fleet in self.pending if fleet is not order]
+        new_fleets = patch.get("new_fleets") or []
+        confirmed = next((FleetRecord.from_dict(f) for f in new_fleets
+                          if (f["source"], f["destination"], f["ships"], f["owner"]) ==
+                          (order.source, order.destination, order.ships, order.owner)), None)
+        replaced = set()
+        if confirmed is not None:
+            for galaxy, galaxy_fleets in self.fleets.items():
+                for index, fleet in enumerate(galaxy_fleets):
+                    if fleet is order:
+                        galaxy_fleets[index] = confirmed
+                        replaced.add(galaxy)
+            if replaced:
+                patch = dict(patch, new_fleets=[f for f in new_fleets if FleetRecord.from_dict(f) != confirmed])
+        if not replaced:
+            self.drop_pending_fleet(order)
+        if not self.apply_patch(patch):
+            return False
+        if replaced and confirmed != order:
+            # The server's flight time differs from ours, redraw the fleet
+            self.notify({}, replaced, self.year, self.version, self.ready_set)
+        return True
+
+    def reject_fleet(self, order):
+        """The server refused the order, give the ships back and remove the fleet."""
+        if not any(fleet is order for fleet in self.pending):
+            return
+        self.pending = [fleet for fleet in self.pending if fleet is not order]
+        source = self.system(order.source_galaxy, order.source)
+        source.current_ships += order.ships
+        fleets_changed = self.drop_pending_fleet(order)
+        self.notify({order.source_galaxy: [source]}, fleets_changed, self.year, self.version, self.ready_set)
+
+    def drop_pending_fleet(self, order):
+        fleets_changed = set()
+        for galaxy, galaxy_fleets in self.fleets.items():
+            kept = [fleet for fleet in galaxy_fleets if fleet is not order]
+            if len(kept) != len(galaxy_fleets):
+                self.fleets[galaxy] = kept
+                fleets_changed.add(galaxy)
+        return fleets_changed
+
+    # --- local changes (games without a server) ---
+
+    def set_system(self, galaxy, system_id, **values):
+        record = self.system(galaxy, system_id)
+        if record is not None and record.update(values):
+            self.notify({galaxy: [record]}, set(), self.year, self.version, self.ready_set)
+
+    def resolve_local_turn(self, galaxy):
+        """
+        Production and fleet arrivals of one galaxy, then the next year.
+        The rules of the old offline nextTurn.
+        """
+        systems = self.galaxy_systems(galaxy)
+        changed = {}
+        for record in systems.values():
+            if record.owner is not None:
+                record.current_ships += record.ship_production
+                changed[record.system_id] = record
+        remaining = []
+        for fleet in self.fleets.get(galaxy, []):
+            fleet.turns -= 1
+            if fleet.turns > 0:
+                remaining.append(fleet)
+                continue
+            dest = systems.get(fleet.destination)
+            if dest is None:
+                continue
+            # If the destination is unowned or owned by the same player, add ships.
+            if dest.owner == fleet.owner or dest.owner is None:
+                dest.current_ships += fleet.ships
+                dest.owner = fleet.owner
+            # Simple combat logic: if fewer ships, take over.
+            elif fleet.ships > dest.current_ships:
+                dest.owner = fleet.owner
+                dest.current_ships = fleet.ships - dest.current_ships
+            else:
+                dest.current_ships -= fleet.ships
+            changed[dest.system_id] = dest
+        self.fleets[galaxy] = remaining
+        self.notify({galaxy: list(changed.values())}, {galaxy}, self.year + 1, self.version, self.ready_set)
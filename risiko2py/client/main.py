@@ -1,29 +1,20 @@
+import time
+STARTED = time.perf_counter()
+
 import sys
+import argparse
+import importlib.util
 import subprocess
 
-def install(package):
-    subprocess.check_call([sys.executable, "-m", "pip", "install", package])
-
-# List your client dependencies here
+# List your client dependencies here (only installed with --install-missing)
 client_dependencies = [
     "requests",
     "PyQt5",
     "cryptography"
 ]
 
-for dep in client_dependencies:
-    try:
-        __import__(dep.split('==')[0])
-    except ImportError:
-        print(f"Installing missing dependency: {dep}")
-        install(dep)
-
-# Now import the rest of your application
-import os
-from PyQt5.QtWidgets import QApplication, QMessageBox, QInputDialog
-from ui.game_ui import GameUI
-from network.client import GameClient
-from ui.auth_dialog import AuthDialog
+# Time from start to the first window (the server address dialog) we aim for
+STARTUP_TARGET_MS = 250
 
 dark_stylesheet = """
     QWidget { background-color: #111; color: #fff; }
@@ -38,19 +29,109 @@ dark_stylesheet = """
     QTableWidget, QHeaderView::section { background-color: #222; color: #fff; }
 """
 
-def main():
+DEFAULT_URL = "http://risiko2.shroomy.ac"
+
+def install_missing():
+    """pip install the dependencies that can't be found (without importing them)."""
+    for dep in client_dependencies:
+        if importlib.util.find_spec(dep.split('==')[0]) is None:
+            print(f"Installing missing dependency: {dep}")
+            subprocess.check_call([sys.executable, "-m", "pip", "install", dep])
+
+def elapsed_ms(since=STARTED):
+    return (time.perf_counter() - since) * 1000
+
+def server_dialog():
+    from PyQt5.QtWidgets import QInputDialog
+    dialog = QInputDialog()
+    dialog.setWindowTitle("Server Address")
+    dialog.setLabelText("Enter server API URL:")
+    dialog.setTextValue(DEFAULT_URL)
+    return dialog
+
+def wait_for_paint(app, widget, timeout=5.0):
+    """Show the widget and process events until it was painted once."""
+    from PyQt5.QtCore import QObject, QEvent
+
+    class PaintWatcher(QObject):
+        painted = False
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint:
+                self.painted = True
+            return False
+
+    watcher = PaintWatcher()
+    widget.installEventFilter(watcher)
+    widget.show()
+    deadline = time.perf_counter() + timeout
+    while not watcher.painted and time.perf_counter() < deadline:
+        app.processEvents()
+    widget.removeEventFilter(watcher)
+
+def profile_startup():
+    """Start the client without a server and print where the time goes."""
+    timings = [("python start -> main.py", elapsed_ms())]
+    step = time.perf_counter()
+    from PyQt5.QtWidgets import QApplication
+    timings.append(("import PyQt5.QtWidgets", elapsed_ms(step)))
+    step = time.perf_counter()
     app = QApplication(sys.argv)
     app.setStyleSheet(dark_stylesheet)
+    timings.append(("QApplication", elapsed_ms(step)))
+    step = time.perf_counter()
+    dialog = server_dialog()
+    wait_for_paint(app, dialog)
+    timings.append(("server dialog first paint", elapsed_ms(step)))
+    first_window = elapsed_ms()
+    dialog.close()
+
+    # What the later windows pay for
+    for module in ("ui.auth_dialog", "network.client", "ui.game_ui"):
+        step = time.perf_counter()
+        __import__(module)
+        timings.append((f"import {module}", elapsed_ms(step)))
+    from ui.game_ui import GameUI
+    step = time.perf_counter()
+    game_ui = GameUI()
+    wait_for_paint(app, game_ui)
+    timings.append(("GameUI first paint", elapsed_ms(step)))
+    game_ui.close()
+
+    for name, ms in timings:
+        print(f"{name:32s} {ms:8.1f} ms")
+    verdict = "ok" if first_window <= STARTUP_TARGET_MS else "SLOW"
+    print(f"{'first window':32s} {first_window:8.1f} ms  (target {STARTUP_TARGET_MS} ms: {verdict})")
+    print(f"{'total':32s} {elapsed_ms():8.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Risiko2Py client")
+    parser.add_argument("--install-missing", action="store_true",
+                        help="pip install missing dependencies before starting")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print import and first paint timings and exit")
+    args, qt_args = parser.parse_known_args()
+    if args.install_missing:
+        install_missing()
+    if args.profile_startup:
+        profile_startup()
+        return
+
+    # Only Qt is needed for the first window, requests & co. are imported after it
+    from PyQt5.QtWidgets import QApplication, QMessageBox
+    app = QApplication(sys.argv[:1] + qt_args)
+    app.setStyleSheet(dark_stylesheet)
 
     # Prompt for server address
-    default_url = "http://risiko2.shroomy.ac"
-    api_url, ok = QInputDialog.getText(None, "Server Address", "Enter server API URL:", text=default_url)
+    dialog = server_dialog()
+    ok = dialog.exec_()
+    api_url = dialog.textValue()
     if not ok or not api_url.strip():
         QMessageBox.critical(None, "No Server", "You must enter a server address to continue.")
         sys.exit(1)
     api_url = api_url.strip()
 
     # Show login/register dialog
+    from ui.auth_dialog import AuthDialog
     auth = AuthDialog(api_url)
     result = auth.exec_()
     if not result or not auth.token:
@@ -58,6 +139,8 @@ def main():
         sys.exit(1)
 
     # Pass the token and api_url to your GameClient or GameUI as needed
+    from network.client import GameClient
+    from ui.game_ui import GameUI
     client = GameClient(token=auth.token, api_url=api_url)
     game_ui = GameUI(client=client)
     game_ui.show()
@@ -65,5 +148,3 @@ def main():
 
 if __name__ == '__main__':
     main()
-
-
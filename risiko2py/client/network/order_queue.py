@@ -0,0 +1,41 @@
+"""
+Sends orders to the server without blocking the UI.
+
+Orders of a game go through one worker thread, so the server gets them in
+the order they were given (the versions of the answers follow each other).
+The answer is handed back to the Qt thread through a queued signal, where
+done(response) or failed(error) is called.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from PyQt5.QtCore import QObject, pyqtSignal
+
+class OrderQueue(QObject):
+    finished = pyqtSignal(object, object, object)  # callbacks, response, error
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.finished.connect(self.deliver)
+
+    def post(self, url, data, headers, done, failed):
+        self.executor.submit(self.send, url, data, headers, (done, failed))
+
+    def send(self, url, data, headers, callbacks):
+        # Runs in the worker thread, the signal crosses over to the Qt thread
+        try:
+            response = requests.post(url, json=data, headers=headers, timeout=30)
+        except requests.RequestException as e:
+            self.finished.emit(callbacks, None, e)
+            return
+        self.finished.emit(callbacks, response, None)
+
+    def deliver(self, callbacks, response, error):
+        done, failed = callbacks
+        if error is not None:
+            failed(error)
+        else:
+            done(response)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
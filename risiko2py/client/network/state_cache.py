@@ -0,0 +1,79 @@
+"""
+On-disk cache of game states per (server, game_id).
+
+Each game is one zlib compressed JSON file {"state": ..., "players": ...}.
+Opening a cached game shows it right away, the client then only asks the
+server for what changed since the cached version (/game/<id>/since/<version>).
+The files are kept in least recently used order (file mtime), the oldest are
+removed when the cache gets bigger than max_bytes.
+"""
+import os
+import json
+import zlib
+import hashlib
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".risiko2py", "state_cache")
+CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+class StateCache:
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def path(self, server, game_id):
+        server_key = hashlib.sha1(server.rstrip("/").encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, f"{server_key}_{game_id}.json.z")
+
+    def load(self, server, game_id):
+        """Returns (state, players) or None if the game is not cached (or the file is broken)."""
+        path = self.path(server, game_id)
+        try:
+            with open(path, "rb") as f:
+                data = json.loads(zlib.decompress(f.read()))
+            # Mark as recently used
+            os.utime(path)
+        except (OSError, ValueError, zlib.error):
+            return None
+        return data.get("state"), data.get("players")
+
+    def save(self, server, game_id, state, players):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(server, game_id)
+        data = zlib.compress(json.dumps({"state": state, "players": players},
+                                        separators=(",", ":")).encode("utf-8"))
+        # Write next to it and rename, a crash never leaves half a file
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self.cleanup(keep=path)
+
+    def remove(self, server, game_id):
+        try:
+            os.remove(self.path(server, game_id))
+        except OSError:
+            pass
+
+    def cleanup(self, keep=None):
+        """Remove the least recently used files until the cache fits into max_bytes."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json.z"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
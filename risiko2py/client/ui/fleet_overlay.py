@@ -0,0 +1,126 @@
+import math
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtCore import Qt, QRectF, QLineF
+from PyQt5.QtGui import QPainter, QPixmap, QColor, QPen
+
+MARKER_SIZE = 6.0
+
+def fleet_total_turns(source_pos, dest_pos):
+    """Flight time of a fleet, the same formula as the server's send_fleet."""
+    distance = math.sqrt((source_pos[0] - dest_pos[0]) ** 2 + (source_pos[1] - dest_pos[1]) ** 2)
+    return max(1, int(round(distance)))
+
+class FleetOverlay(QWidget):
+    """
+    Draws the fleets in flight over a galaxy view: a line from source to
+    destination and a marker for how far the fleet got.
+
+    The lines and markers of one owner are kept as batches and drawn with one
+    drawLines and one drawRects call, however many fleets there are. Batches
+    are only rebuilt for owners whose fleets changed (launches are appended),
+    or for everyone when the view geometry changed (resize, zoom, pan). The
+    drawn layer is cached in a pixmap, so repaints of the view below (hover,
+    tooltips) don't draw the fleets again.
+
+    The grid provides system_center(sys_id) (in this widget's coordinates)
+    and system_grid_pos(sys_id). Mouse events go through to the view below.
+    """
+    def __init__(self, grid, parent=None):
+        super().__init__(parent or grid)
+        self.grid = grid
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setAttribute(Qt.WA_NoSystemBackground)
+        self.fleets_by_owner = {}   # owner -> [(source, destination, turns)] drawn in this galaxy
+        self.paths = {}             # owner -> ([QLineF], [QRectF])
+        self.layer = None
+
+    def set_fleets(self, fleets):
+        galaxy = getattr(self.grid, "galaxy_index", None)
+        by_owner = {}
+        for fleet in fleets:
+            # Only fleets that stay in this galaxy have a path to draw
+            if fleet.source_galaxy not in (None, galaxy) or fleet.dest_galaxy not in (None, galaxy):
+                continue
+            # A copy of what is drawn, the local turn changes the FleetRecords in place
+            by_owner.setdefault(fleet.owner, []).append((fleet.source, fleet.destination, fleet.turns))
+        added = []
+        for owner in set(self.fleets_by_owner) | set(by_owner):
+            old, new = self.fleets_by_owner.get(owner, []), by_owner.get(owner, [])
+            if old == new:
+                continue
+            if owner in self.paths and len(new) > len(old) and new[:len(old)] == old:
+                # Fleets were only added, extend the owner's batches
+                lines, markers = self.paths[owner]
+                first_line, first_marker = len(lines), len(markers)
+                self.add_to_paths(self.paths[owner], new[len(old):])
+                added.append((owner, lines[first_line:], markers[first_marker:]))
+            else:
+                self.paths.pop(owner, None)
+                self.layer = None
+        self.fleets_by_owner = by_owner
+        if self.layer is not None and added:
+            # Draw only the launched fleets onto the cached layer
+            painter = QPainter(self.layer)
+            for owner, lines, markers in added:
+                self.draw_batch(painter, owner, lines, markers)
+            painter.end()
+        self.update()
+
+    def invalidate(self):
+        """The positions of the systems on screen changed."""
+        self.paths.clear()
+        self.layer = None
+        self.update()
+
+    def add_to_paths(self, paths, fleets):
+        lines, markers = paths
+        for source, destination, turns in fleets:
+            start = self.grid.system_center(source)
+            end = self.grid.system_center(destination)
+            if start is None or end is None:
+                continue
+            lines.append(QLineF(start, end))
+            total = fleet_total_turns(self.grid.system_grid_pos(source), self.grid.system_grid_pos(destination))
+            progress = min(1.0, max(0.0, 1 - turns / total))
+            at = start + (end - start) * progress
+            markers.append(QRectF(at.x() - MARKER_SIZE / 2, at.y() - MARKER_SIZE / 2, MARKER_SIZE, MARKER_SIZE))
+
+    def owner_paths(self, owner):
+        paths = self.paths.get(owner)
+        if paths is None:
+            paths = self.paths[owner] = ([], [])
+            self.add_to_paths(paths, self.fleets_by_owner.get(owner, []))
+        return paths
+
+    def render_layer(self):
+        ratio = self.devicePixelRatioF()
+        layer = QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+        layer.setDevicePixelRatio(ratio)
+        layer.fill(Qt.transparent)
+        painter = QPainter(layer)
+        for owner in self.fleets_by_owner:
+            lines, markers = self.owner_paths(owner)
+            self.draw_batch(painter, owner, lines, markers)
+        painter.end()
+        return layer
+
+    def draw_batch(self, painter, owner, lines, markers):
+        color = QColor(self.grid.owner_style(owner)[0])
+        painter.setPen(QPen(color, 1))
+        painter.drawLines(lines)
+        painter.setPen(QPen(QColor("#000000"), 1))
+        painter.setBrush(color)
+        painter.drawRects(markers)
+
+    def paintEvent(self, event):
+        if not self.fleets_by_owner or self.width() <= 0 or self.height() <= 0:
+            return
+        if self.layer is None:
+            self.layer = self.render_layer()
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.layer)
+        painter.end()
+
+    def resizeEvent(self, event):
+        self.invalidate()
+        super().resizeEvent(event)
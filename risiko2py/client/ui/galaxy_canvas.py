@@ -0,0 +1,213 @@
+from PyQt5.QtWidgets import QWidget, QMenu, QToolTip, QSizePolicy
+from PyQt5.QtCore import Qt, QPointF, QRectF
+from PyQt5.QtGui import QPainter, QColor, QFont
+
+GRID_COLOR = "#444444"
+HOVER_COLOR = "#FFD700"
+
+class GalaxyCanvas(QWidget):
+    """
+    Draws all systems of a galaxy (the grid's SystemRecords) in one paintEvent
+    instead of one QPushButton per system. Hit-testing is grid-cell arithmetic,
+    the mouse wheel zooms around the cursor and dragging pans. Hover shows the
+    system info, a click opens the same menu as the buttons.
+    """
+    MIN_ZOOM = 1.0
+    MAX_ZOOM = 8.0
+    # Below this cell size (pixels) the system ids are not drawn
+    MIN_LABEL_SIZE = 14
+
+    def __init__(self, grid):
+        super().__init__(grid)
+        self.grid = grid
+        self.zoom = 1.0
+        self.offset = QPointF(0, 0)
+        self.hover_id = None
+        self.press_pos = None
+        self.drag_start_offset = None
+        self.label_font = QFont()
+        # Drawn on top, told when zoom or pan move the systems (see fleet_overlay.py)
+        self.overlay = None
+        self.setMouseTracking(True)
+        self.setMinimumSize(300, 300)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.rebuild_index()
+
+    def rebuild_index(self):
+        """Call after systems moved (grid_pos changed)."""
+        self.cell_index = {}
+        rows = cols = 1
+        for sys_id, cell in self.grid.systems.items():
+            if cell.grid_pos is None:
+                continue
+            row, col = cell.grid_pos
+            self.cell_index[(row, col)] = sys_id
+            rows = max(rows, row + 1)
+            cols = max(cols, col + 1)
+        self.rows, self.cols = rows, cols
+        self.view_changed()
+
+    # --- geometry ---
+
+    def cell_size(self):
+        return (self.width() * self.zoom / self.cols, self.height() * self.zoom / self.rows)
+
+    def cell_at(self, pos):
+        """System id under a widget position, or None."""
+        cw, ch = self.cell_size()
+        col = int((pos.x() - self.offset.x()) // cw)
+        row = int((pos.y() - self.offset.y()) // ch)
+        return self.cell_index.get((row, col))
+
+    def cell_center(self, sys_id):
+        cell = self.grid.systems.get(sys_id)
+        if cell is None or cell.grid_pos is None:
+            return None
+        cw, ch = self.cell_size()
+        row, col = cell.grid_pos
+        return QPointF(self.offset.x() + (col + 0.5) * cw, self.offset.y() + (row + 0.5) * ch)
+
+    def view_changed(self):
+        if self.overlay is not None:
+            self.overlay.setGeometry(self.rect())
+            self.overlay.invalidate()
+        self.update()
+
+    def clamp_offset(self):
+        cw, ch = self.cell_size()
+        min_x = min(0, self.width() - cw * self.cols)
+        min_y = min(0, self.height() - ch * self.rows)
+        self.offset = QPointF(max(min_x, min(0, self.offset.x())), max(min_y, min(0, self.offset.y())))
+
+    def set_zoom(self, zoom, anchor=None):
+        zoom = max(self.MIN_ZOOM, min(self.MAX_ZOOM, zoom))
+        if anchor is None:
+            anchor = QPointF(self.width() / 2, self.height() / 2)
+        # Keep the point under the anchor where it is
+        factor = zoom / self.zoom
+        self.offset = anchor - (anchor - self.offset) * factor
+        self.zoom = zoom
+        self.clamp_offset()
+        self.view_changed()
+
+    # --- painting ---
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#111111"))
+        cw, ch = self.cell_size()
+        ox, oy = self.offset.x(), self.offset.y()
+        # Only the cells inside the repainted area
+        area = event.rect()
+        first_col = max(0, int((area.left() - ox) // cw))
+        last_col = min(self.cols - 1, int((area.right() - ox) // cw))
+        first_row = max(0, int((area.top() - oy) // ch))
+        last_row = min(self.rows - 1, int((area.bottom() - oy) // ch))
+
+        owner_colors = self.grid.owner_colors
+        colors = {}
+        labels = cw >= self.MIN_LABEL_SIZE and ch >= self.MIN_LABEL_SIZE
+        if labels:
+            self.label_font.setPixelSize(max(8, int(min(cw, ch) * 0.45)))
+            painter.setFont(self.label_font)
+        painter.setPen(QColor(GRID_COLOR))
+        cells = self.grid.systems
+        for (row, col), sys_id in self.cell_index.items():
+            if not (first_row <= row <= last_row and first_col <= col <= last_col):
+                continue
+            cell = cells[sys_id]
+            owner = cell.owner if cell.owner in owner_colors else None
+            if owner not in colors:
+                colors[owner] = tuple(QColor(c) for c in self.grid.owner_style(owner))
+            bg, fg = colors[owner]
+            rect = QRectF(ox + col * cw + 1, oy + row * ch + 1, cw - 2, ch - 2)
+            painter.fillRect(rect, bg)
+            if labels:
+                painter.setPen(fg)
+                painter.drawText(rect, Qt.AlignCenter, str(sys_id))
+        if self.hover_id is not None and self.hover_id in cells:
+            row, col = cells[self.hover_id].grid_pos
+            painter.setPen(QColor(HOVER_COLOR))
+            painter.drawRect(QRectF(ox + col * cw, oy + row * ch, cw - 1, ch - 1))
+        painter.end()
+
+    def update_cell(self, sys_id):
+        """Repaint only one system."""
+        cell = self.grid.systems.get(sys_id)
+        if cell is None or cell.grid_pos is None:
+            return
+        cw, ch = self.cell_size()
+        row, col = cell.grid_pos
+        self.update(int(self.offset.x() + col * cw) - 1, int(self.offset.y() + row * ch) - 1,
+                    int(cw) + 3, int(ch) + 3)
+
+    # --- interaction ---
+
+    def info_text(self, cell):
+        return (f"System {cell.system_id}\n"
+                f"Current Ships: {cell.current_ships}\n"
+                f"Ship Production: {cell.ship_production}\n"
+                f"Defense Factor: {cell.defense_factor}\n"
+                f"Owner: {cell.owner}")
+
+    def mouseMoveEvent(self, event):
+        if self.press_pos is not None and (event.pos() - self.press_pos).manhattanLength() > 4:
+            self.offset = self.drag_start_offset + QPointF(event.pos() - self.press_pos)
+            self.clamp_offset()
+            self.view_changed()
+            return
+        sys_id = self.cell_at(event.pos())
+        if sys_id != self.hover_id:
+            previous, self.hover_id = self.hover_id, sys_id
+            if previous is not None:
+                self.update_cell(previous)
+            if sys_id is None:
+                QToolTip.hideText()
+            else:
+                self.update_cell(sys_id)
+                QToolTip.showText(event.globalPos(), self.info_text(self.grid.systems[sys_id]), self)
+
+    def leaveEvent(self, event):
+        if self.hover_id is not None:
+            previous, self.hover_id = self.hover_id, None
+            self.update_cell(previous)
+        QToolTip.hideText()
+        super().leaveEvent(event)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.press_pos = event.pos()
+            self.drag_start_offset = QPointF(self.offset)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() != Qt.LeftButton or self.press_pos is None:
+            return
+        dragged = (event.pos() - self.press_pos).manhattanLength() > 4
+        self.press_pos = None
+        if dragged:
+            return
+        sys_id = self.cell_at(event.pos())
+        if sys_id is not None:
+            self.open_menu(sys_id, event.globalPos())
+
+    def open_menu(self, sys_id, global_pos):
+        cell = self.grid.systems[sys_id]
+        menu = QMenu(self)
+        for line in self.info_text(cell).split("\n")[1:]:
+            menu.addAction(line)
+        menu.addSeparator()
+        action1 = menu.addAction("Select as first system for distance calculation")
+        action1.triggered.connect(lambda: self.grid.selectFirstSystem(cell))
+        action2 = menu.addAction("Send Fleet from this System")
+        action2.triggered.connect(lambda: self.grid.selectSourceForFleetSend(cell))
+        menu.exec_(global_pos)
+
+    def wheelEvent(self, event):
+        steps = event.angleDelta().y() / 120
+        if steps:
+            self.set_zoom(self.zoom * (1.25 ** steps), QPointF(event.pos()))
+
+    def resizeEvent(self, event):
+        self.clamp_offset()
+        self.view_changed()
+        super().resizeEvent(event)
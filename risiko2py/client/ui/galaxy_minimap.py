@@ -0,0 +1,135 @@
+from PyQt5.QtWidgets import QWidget, QToolTip
+from PyQt5.QtCore import Qt, QRect
+from PyQt5.QtGui import QPainter, QImage, QPixmap, QColor
+
+TILE_SIZE = 56
+TILE_GAP = 6
+UNOWNED_COLOR = "#555555"
+EMPTY_COLOR = "#111111"
+CURRENT_COLOR = "#FFD700"
+
+class GalaxyMinimap(QWidget):
+    """
+    Overview of every galaxy of a game as a small ownership map: one pixel per
+    grid cell in the owner's color, scaled down to a tile. The tiles are cached
+    as pixmaps and only drawn again for galaxies where a system changed its
+    owner. Clicking a tile calls on_select(galaxy_index).
+
+    Reads the ClientGameState directly, so galaxies without a built view are
+    shown as well.
+    """
+    def __init__(self, state, count, owner_colors=None, on_select=None, parent=None):
+        super().__init__(parent)
+        self.state = state
+        self.count = count
+        self.owner_colors = owner_colors or {}
+        self.on_select = on_select
+        self.current_index = 0
+        self.owners = {}    # galaxy -> {system_id: owner} as drawn
+        self.tiles = {}     # galaxy -> QPixmap
+        self.dirty = set()  # galaxies whose tile has to be drawn again
+        self.colors = {}
+        # Two tiles per row for more than a few galaxies, the parent scrolls
+        self.tile_columns = 2 if count > 4 else 1
+        tile_rows = (count + self.tile_columns - 1) // self.tile_columns
+        self.setFixedSize(TILE_GAP + self.tile_columns * (TILE_SIZE + TILE_GAP),
+                          TILE_GAP + max(1, tile_rows) * (TILE_SIZE + TILE_GAP))
+        self.setMouseTracking(True)
+        for galaxy in range(count):
+            state.subscribe(galaxy, self)
+
+    def detach(self):
+        for galaxy in range(self.count):
+            self.state.unsubscribe(galaxy, self)
+
+    # --- ClientGameState observer callbacks ---
+
+    def systems_changed(self, systems):
+        for system in systems:
+            owners = self.owners.setdefault(system.galaxy, {})
+            if owners.get(system.system_id, False) != system.owner:
+                owners[system.system_id] = system.owner
+                if system.galaxy not in self.dirty:
+                    self.dirty.add(system.galaxy)
+                    self.update(self.tile_rect(system.galaxy))
+
+    def fleets_changed(self, fleets):
+        pass
+
+    def turn_changed(self, year, version, ready_set):
+        pass
+
+    # --- tiles ---
+
+    def tile_rect(self, galaxy):
+        row, col = divmod(galaxy, self.tile_columns)
+        return QRect(TILE_GAP + col * (TILE_SIZE + TILE_GAP), TILE_GAP + row * (TILE_SIZE + TILE_GAP),
+                     TILE_SIZE, TILE_SIZE)
+
+    def tile_at(self, pos):
+        for galaxy in range(self.count):
+            if self.tile_rect(galaxy).contains(pos):
+                return galaxy
+        return None
+
+    def owner_color(self, owner):
+        color = self.colors.get(owner)
+        if color is None:
+            color = self.colors[owner] = QColor(self.owner_colors.get(owner, UNOWNED_COLOR)).rgb()
+        return color
+
+    def render_tile(self, galaxy):
+        systems = self.state.galaxy_systems(galaxy)
+        placed = [record for record in systems.values() if record.grid_pos is not None]
+        rows = max((record.grid_pos[0] for record in placed), default=0) + 1
+        cols = max((record.grid_pos[1] for record in placed), default=0) + 1
+        # One pixel per grid cell, smooth scaling mixes the colors of big maps
+        image = QImage(cols, rows, QImage.Format_RGB32)
+        image.fill(QColor(EMPTY_COLOR))
+        for record in placed:
+            image.setPixel(record.grid_pos[1], record.grid_pos[0], self.owner_color(record.owner))
+        mode = Qt.SmoothTransformation if cols > TILE_SIZE or rows > TILE_SIZE else Qt.FastTransformation
+        image = image.scaled(TILE_SIZE, TILE_SIZE, Qt.KeepAspectRatio, mode)
+        tile = QPixmap(TILE_SIZE, TILE_SIZE)
+        tile.fill(QColor(EMPTY_COLOR))
+        painter = QPainter(tile)
+        painter.drawImage((TILE_SIZE - image.width()) // 2, (TILE_SIZE - image.height()) // 2, image)
+        painter.end()
+        return tile
+
+    def set_current(self, index):
+        previous, self.current_index = self.current_index, index
+        self.update(self.tile_rect(previous).adjusted(-3, -3, 3, 3))
+        self.update(self.tile_rect(index).adjusted(-3, -3, 3, 3))
+
+    # --- painting and mouse ---
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(event.rect(), QColor(EMPTY_COLOR))
+        for galaxy in range(self.count):
+            rect = self.tile_rect(galaxy)
+            if not rect.adjusted(-3, -3, 3, 3).intersects(event.rect()):
+                continue
+            if galaxy in self.dirty or galaxy not in self.tiles:
+                self.tiles[galaxy] = self.render_tile(galaxy)
+                self.dirty.discard(galaxy)
+            painter.drawPixmap(rect.topLeft(), self.tiles[galaxy])
+            if galaxy == self.current_index:
+                painter.setPen(QColor(CURRENT_COLOR))
+                painter.drawRect(rect.adjusted(-2, -2, 1, 1))
+        painter.end()
+
+    def mouseMoveEvent(self, event):
+        galaxy = self.tile_at(event.pos())
+        if galaxy is None:
+            QToolTip.hideText()
+        else:
+            QToolTip.showText(event.globalPos(), f"Galaxy {galaxy + 1}", self)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() != Qt.LeftButton:
+            return
+        galaxy = self.tile_at(event.pos())
+        if galaxy is not None and self.on_select is not None:
+            self.on_select(galaxy)
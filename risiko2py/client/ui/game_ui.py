@@ -1,16 +1,30 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QLineEdit, QGridLayout, QMenu,
-    QMessageBox, QInputDialog, QDialog, QFileDialog, QStackedWidget, QListWidget
+    QMessageBox, QInputDialog, QDialog, QFileDialog, QStackedWidget, QListWidget, QScrollArea
 )
-from PyQt5.QtCore import Qt, QEvent
+from PyQt5.QtCore import Qt, QEvent, QTimer, QPointF
 from PyQt5.QtGui import QIcon, QGuiApplication
 import random
 import math
 import os
 import csv
 import requests
+from collections import OrderedDict
+from functools import lru_cache
+from ui.galaxy_canvas import GalaxyCanvas
+from ui.fleet_overlay import FleetOverlay, fleet_total_turns
+from ui.galaxy_minimap import GalaxyMinimap
+from game_state import ClientGameState, FleetRecord
+from network.state_cache import StateCache
+from network.order_queue import OrderQueue
+
+# Galaxies with more systems than this are drawn on a GalaxyCanvas instead of buttons
+CANVAS_THRESHOLD = 200
+# Galaxy views MultiGrid keeps alive, the least recently shown ones are dropped
+MAX_GALAXY_VIEWS = 5
 
 # --- new helper ----------------------------------------------------------------
+@lru_cache(maxsize=None)
 def invert_color(hex_color: str) -> str:
     """
     Return the literal inverse color of hex_color (e.g. #112233 -> #EEDDCC).
@@ -29,12 +43,34 @@ def invert_color(hex_color: str) -> str:
     except Exception:
         return "#000000"
 
+class SystemInfoPopup(QLabel):
+    """Hover info of a system. Each grid has one and only updates its text."""
+    def __init__(self, parent):
+        super().__init__(parent, Qt.ToolTip)
+        self.setMargin(6)
+
+    def show_for(self, system, button):
+        self.setText(f"Current Ships: {system.current_ships}\n"
+                     f"Ship Production: {system.ship_production}\n"
+                     f"Defense Factor: {system.defense_factor}\n"
+                     f"Owner: {system.owner}")
+        self.adjustSize()
+        self.move(button.mapToGlobal(button.rect().bottomLeft()))
+        self.show()
+
 class ButtonGrid(QWidget):
-    def __init__(self, num_buttons=80, owners=None, button_coords=None, owner_colors=None):
+    """
+    View of one galaxy. The data lives in a ClientGameState (a local one is
+    created if none is given), the grid subscribes to its galaxy and keeps only
+    widgets: one QPushButton per system, or a GalaxyCanvas for large galaxies.
+    """
+    def __init__(self, num_buttons=80, owners=None, button_coords=None, owner_colors=None, use_canvas=None,
+                 state=None, galaxy_index=0):
         super().__init__()
         self.setWindowIcon(QIcon("designs/icon.png"))
         self.year = 1
         self.num_buttons = num_buttons
+        self.use_canvas = num_buttons > CANVAS_THRESHOLD if use_canvas is None else use_canvas
         self.owners = owners if owners is not None else ["Default_Player"]
         # Use provided owner_colors or generate
         if owner_colors:
@@ -45,14 +81,33 @@ class ButtonGrid(QWidget):
         if button_coords:
             self.button_coords = {int(k): tuple(v) for k, v in button_coords.items()}
         else:
-            rows, cols = 40, 15
+            # 40 x 15 like the server, scaled up if more buttons don't fit
+            scale = math.sqrt(max(1.0, self.num_buttons * 7.5 / 600))
+            rows, cols = math.ceil(40 * scale), math.ceil(15 * scale)
             positions = [(row, col) for row in range(rows) for col in range(cols)]
             random.shuffle(positions)
             self.button_coords = {i+1: positions[i] for i in range(self.num_buttons)}
-        self.buttons = {}
+        self.galaxy_index = galaxy_index
+        self.state = state if state is not None else ClientGameState()
+        self.state.add_galaxy(galaxy_index, self.button_coords)
+        # system id -> SystemRecord of this galaxy, owned by the state
+        self.systems = self.state.galaxy_systems(galaxy_index)
+        self.buttons = {}   # system id -> QPushButton (not used with the canvas)
         self.fleets = []
         self.ready_set = set()
+        # (owner, color) -> stylesheet, so every owner's CSS is built only once
+        self.style_cache = {}
+        self.info_popup = None
+        # GameUI.open_game gives every grid its OrderQueue and sets game_ui, the
+        # answers are handled through those, a grid can be dropped before they come
+        self.orders = None
+        self.game_ui = None
         self.initUI()
+        self.state.subscribe(galaxy_index, self)
+
+    def detach(self):
+        """Stop following the state, for views that are dropped."""
+        self.state.unsubscribe(self.galaxy_index, self)
 
     def initUI(self):
         main_layout = QVBoxLayout()
@@ -64,19 +119,24 @@ class ButtonGrid(QWidget):
         main_layout.addWidget(self.readiness_label)
 
         self.grid = QGridLayout()
-        for i in range(self.num_buttons):
-            button = QPushButton(str(i+1))
-            pos = self.button_coords[i+1]
-            button.grid_pos = pos
-            self.buttons[i+1] = button
-            button.current_ships = 0
-            button.ship_production = random.randint(1, 10)
-            button.defense_factor = round(random.uniform(0.7, 1.0), 2)
-            button.owner = None
-            # Ensure unowned buttons get explicit bg+text so text is visible
-            self.update_button_color(button)
-            self.grid.addWidget(button, pos[0], pos[1])
-            button.installEventFilter(self)
+        if not self.use_canvas:
+            for sys_id, system in self.systems.items():
+                button = QPushButton(str(sys_id))
+                button.sys_id = sys_id
+                self.buttons[sys_id] = button
+                # Ensure unowned buttons get explicit bg+text so text is visible
+                self.update_button_color(system)
+                self.grid.addWidget(button, system.grid_pos[0], system.grid_pos[1])
+                button.installEventFilter(self)
+        if self.use_canvas:
+            # One widget draws the whole galaxy
+            self.canvas = GalaxyCanvas(self)
+            self.grid.addWidget(self.canvas, 0, 0)
+            self.fleet_overlay = FleetOverlay(self, parent=self.canvas)
+            self.canvas.overlay = self.fleet_overlay
+        else:
+            self.fleet_overlay = FleetOverlay(self)
+            self.placeFleetOverlay()
         main_layout.addLayout(self.grid)
 
         hbox = QHBoxLayout()
@@ -110,15 +170,45 @@ class ButtonGrid(QWidget):
             self.update_next_turn_button_color()
 
     def recreateGridLayout(self):
+        if self.use_canvas:
+            self.canvas.rebuild_index()
+            return
         while self.grid.count():
             item = self.grid.takeAt(0)
             widget = item.widget()
             if widget is not None:
                 widget.setParent(None)
         for sys_id, button in self.buttons.items():
-            pos = button.grid_pos if button.grid_pos is not None else self.button_coords.get(sys_id)
+            pos = self.systems[sys_id].grid_pos or self.button_coords.get(sys_id)
             if pos:
                 self.grid.addWidget(button, pos[0], pos[1])
+        self.placeFleetOverlay()
+
+    def placeFleetOverlay(self):
+        # The overlay spans every cell of the button grid, on top of the buttons
+        positions = [s.grid_pos for s in self.systems.values() if s.grid_pos is not None] or [(0, 0)]
+        rows = max(p[0] for p in positions) + 1
+        cols = max(p[1] for p in positions) + 1
+        self.grid.addWidget(self.fleet_overlay, 0, 0, rows, cols)
+        self.fleet_overlay.raise_()
+        self.fleet_overlay.show()
+        self.fleet_overlay.invalidate()
+
+    # --- used by FleetOverlay ---
+
+    def system_center(self, sys_id):
+        if self.use_canvas:
+            return self.canvas.cell_center(sys_id)
+        button = self.buttons.get(sys_id)
+        if button is None or button.parent() is None:
+            return None
+        return QPointF(button.geometry().center() - self.fleet_overlay.pos())
+
+    def system_grid_pos(self, sys_id):
+        return self.systems[sys_id].grid_pos
+
+    def updateFleetOverlay(self):
+        self.fleet_overlay.set_fleets(self.fleets)
 
     def openGameMenuAtStart(self):
         dialog = QDialog(self)
@@ -167,7 +257,7 @@ class ButtonGrid(QWidget):
         Assign each player a unique starting planet.
         Set fleet count to 250, production to 10, defense to 1.0.
         """
-        available_ids = list(self.buttons.keys())
+        available_ids = list(self.systems.keys())
         random.shuffle(available_ids)
         self.starting_planets = {}
         for owner in self.owners:
@@ -175,87 +265,64 @@ class ButtonGrid(QWidget):
                 break
             sys_id = available_ids.pop()
             self.starting_planets[owner] = sys_id
-            button = self.buttons[sys_id]
-            button.owner = owner
-            button.current_ships = 250
-            button.ship_production = 10
-            button.defense_factor = 1.0
-            self.update_button_color(button)
+            self.state.set_system(self.galaxy_index, sys_id, owner=owner, current_ships=250,
+                                  ship_production=10, defense_factor=1.0)
             # Optional: show info
             # QMessageBox.information(self, "Starting Planet Assigned",
             #     f"System {sys_id} is now assigned to {owner}.")
 
     def assignPiratePlanets(self):
-        for sys_id, button in self.buttons.items():
-            if button.owner is None and random.random() < 0.35:
-                button.owner = "Pirates"
-                self.update_button_color(button)
+        for sys_id, system in list(self.systems.items()):
+            if system.owner is None and random.random() < 0.35:
+                self.state.set_system(self.galaxy_index, sys_id, owner="Pirates")
 
     def nextTurn(self):
-        # Increase production on each system.
-        for num, button in self.buttons.items():
-            if button.owner is not None:
-                button.current_ships += button.ship_production
-
-        # Process fleets: decrement turns and deliver if arrival reached.
-        fleets_to_remove = []
-        for fleet in list(self.fleets):
-            fleet["turns"] -= 1
-            if fleet["turns"] <= 0:
-                dest_button = self.buttons.get(fleet["destination"])
-                if dest_button:
-                    # If the destination is unowned or owned by the same player, add ships.
-                    if dest_button.owner == fleet["owner"] or dest_button.owner is None:
-                        dest_button.current_ships += fleet["ships"]
-                        dest_button.owner = fleet["owner"]
-                        self.update_button_color(dest_button)
-                    else:
-                        # Simple combat logic: if fewer ships, take over.
-                        if fleet["ships"] > dest_button.current_ships:
-                            dest_button.owner = fleet["owner"]
-                            dest_button.current_ships = fleet["ships"] - dest_button.current_ships
-                            self.update_button_color(dest_button)
-                        else:
-                            dest_button.current_ships -= fleet["ships"]
-                fleets_to_remove.append(fleet)
-        
-        # Remove processed fleets.
-        for f in fleets_to_remove:
-            self.fleets.remove(f)
+        # Production and fleet arrivals, the state tells the views what changed
+        self.state.resolve_local_turn(self.galaxy_index)
 
         QMessageBox.information(self, "Turn Ended", "Production added and fleets processed!")
-        self.year += 1
-        self.updateInfoLabel()
         self.refreshGameState()
 
     def eventFilter(self, obj, event):
         if isinstance(obj, QPushButton):
             if event.type() == QEvent.Enter:
-                self.openMenu(obj)
+                self.showSystemInfo(obj)
                 return True
             elif event.type() == QEvent.Leave:
-                if hasattr(self, "current_menu") and self.current_menu is not None:
-                    self.current_menu.close()
-                    self.current_menu = None
+                if self.info_popup is not None:
+                    self.info_popup.hide()
+            elif event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+                if obj.rect().contains(event.pos()):
+                    self.openMenu(obj)
         return super().eventFilter(obj, event)
 
+    def showSystemInfo(self, button):
+        # One popup per grid, created on the first hover
+        if self.info_popup is None:
+            self.info_popup = SystemInfoPopup(self)
+        self.info_popup.show_for(self.systems[button.sys_id], button)
+
     def openMenu(self, button):
+        if self.info_popup is not None:
+            self.info_popup.hide()
+        system = self.systems[button.sys_id]
         menu = QMenu(self)
-        menu.addAction(f"Current Ships: {button.current_ships}")
-        menu.addAction(f"Ship Production: {button.ship_production}")
-        menu.addAction(f"Defense Factor: {button.defense_factor}")
-        menu.addAction(f"Owner: {button.owner}")
+        # Deleted once closed, a new one is built for the next click
+        menu.setAttribute(Qt.WA_DeleteOnClose)
+        menu.addAction(f"Current Ships: {system.current_ships}")
+        menu.addAction(f"Ship Production: {system.ship_production}")
+        menu.addAction(f"Defense Factor: {system.defense_factor}")
+        menu.addAction(f"Owner: {system.owner}")
         menu.addSeparator()
         action1 = menu.addAction("Select as first system for distance calculation")
-        action1.triggered.connect(lambda: self.selectFirstSystem(button))
+        action1.triggered.connect(lambda: self.selectFirstSystem(system))
         action2 = menu.addAction("Send Fleet from this System")
-        action2.triggered.connect(lambda: self.selectSourceForFleetSend(button))
+        action2.triggered.connect(lambda: self.selectSourceForFleetSend(system))
         menu.addAction("Other Action")
-        self.current_menu = menu
         menu.popup(button.mapToGlobal(button.rect().bottomLeft()))
 
-    def selectFirstSystem(self, button):
-        num = int(button.text())
+    def selectFirstSystem(self, system):
+        num = system.system_id
         self.distance_inputs = [num]
         self.input_field.clear()
         self.input_field.setPlaceholderText("Enter second button number")
@@ -266,11 +333,11 @@ class ButtonGrid(QWidget):
         self.input_field.returnPressed.connect(self.processDistanceInput)
         self.input_field.setFocus()
 
-    def selectSourceForFleetSend(self, button):
-        if button.owner != self.player_owner:
+    def selectSourceForFleetSend(self, system):
+        if system.owner != self.player_owner:
             QMessageBox.warning(self, "Invalid Source", "You can only send fleets from systems you own.")
             return
-        src = int(button.text())
+        src = system.system_id
         self.fleet_inputs = [src]
         self.input_field.clear()
         self.input_field.setPlaceholderText("Enter destination system id")
@@ -330,10 +397,10 @@ class ButtonGrid(QWidget):
                 return
             value = int(text)
             if len(self.fleet_inputs) == 0:
-                if value not in self.buttons:
+                if value not in self.systems:
                     raise ValueError("Invalid system id.")
-                source_button = self.buttons[value]
-                if source_button.owner != self.player_owner:
+                source_system = self.systems[value]
+                if source_system.owner != self.player_owner:
                     raise ValueError("You can only send fleets from systems you own.")
             self.fleet_inputs.append(value)
             if len(self.fleet_inputs) == 1:
@@ -352,28 +419,12 @@ class ButtonGrid(QWidget):
                 pos2 = self.button_coords.get(dest)
                 if pos1 is None or pos2 is None:
                     raise ValueError("Invalid source or destination.")
-                distance = math.sqrt((pos1[0]-pos2[0])**2 + (pos1[1]-pos2[1])**2)
-                turns_required = math.ceil(distance)
-                source_button = self.buttons.get(src)
-                if source_button.current_ships < ships_to_send:
+                source_system = self.systems.get(src)
+                if source_system.current_ships < ships_to_send:
                     raise ValueError("Not enough ships available!")
                 # --- SEND TO SERVER ---
-                if hasattr(self, 'game_id') and hasattr(self, 'client'):
-                    headers = {"Authorization": f"Bearer {self.client.token}"}
-                    data = {
-                        "game_id": self.game_id,
-                        "source": src,
-                        "destination": dest,
-                        "ships": ships_to_send,
-                        "owner": source_button.owner
-                    }
-                    response = requests.post(f"{self.client.api_url}/game/send_fleet", json=data, headers=headers)
-                    if response.status_code == 200:
-                        new_state = response.json().get("state")
-                        self.update_from_state(new_state)
-                        QMessageBox.information(self, "Fleet Launched", "Fleet sent to server!")
-                    else:
-                        QMessageBox.warning(self, "Fleet Error", f"Failed to send fleet: {response.text}")
+                if self.orders is not None and hasattr(self, 'game_id') and hasattr(self, 'client'):
+                    self.sendFleetOrder(source_system, dest, ships_to_send, fleet_total_turns(pos1, pos2))
                 else:
                     QMessageBox.warning(self, "Error", "Game ID or client not set.")
                 self.input_field.clear()
@@ -384,6 +435,40 @@ class ButtonGrid(QWidget):
         except Exception as e:
             QMessageBox.warning(self, "Fleet Input Error", str(e))
 
+    def sendFleetOrder(self, source_system, dest, ships, turns):
+        """
+        Show the fleet at once and send the order in the background. The
+        server's answer replaces the shown fleet, a refusal takes it back.
+        """
+        galaxy = self.galaxy_index
+        state, game_ui, game_id = self.state, self.game_ui, self.game_id
+        order = state.launch_fleet(FleetRecord(source_system.system_id, dest, ships, source_system.owner,
+                                               turns, galaxy, galaxy))
+        headers = {"Authorization": f"Bearer {self.client.token}"}
+        data = {
+            "game_id": self.game_id,
+            "galaxy": galaxy,
+            "source": source_system.system_id,
+            "destination": dest,
+            "ships": ships,
+            "owner": source_system.owner
+        }
+
+        # Only the state and GameUI are used here, not this grid
+        def done(response):
+            if response.status_code == 200:
+                if not state.confirm_fleet(order, response.json().get("patch")):
+                    game_ui.reload_game(game_id)
+            else:
+                state.reject_fleet(order)
+                game_ui.order_failed("Fleet Error", f"Failed to send fleet: {response.text}")
+
+        def failed(error):
+            state.reject_fleet(order)
+            game_ui.order_failed("Fleet Error", f"Failed to send fleet: {error}")
+
+        self.orders.post(f"{self.client.api_url}/game/send_fleet", data, headers, done, failed)
+
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_F:
             self.startFleetSend()
@@ -421,20 +506,28 @@ class ButtonGrid(QWidget):
         self.input_field.setFocus()
     
     def readyNextTurn(self):
-        if hasattr(self, 'game_id') and hasattr(self, 'client'):
-            headers = {"Authorization": f"Bearer {self.client.token}"}
-            data = {"game_id": self.game_id, "player": self.player_owner}
-            response = requests.post(f"{self.client.api_url}/game/ready", json=data, headers=headers)
+        """
+        Send ready through the order queue, after the fleet orders given before.
+        The patch of the answer turns the button green (turn_changed).
+        """
+        if self.orders is None or not hasattr(self, 'game_id') or not hasattr(self, 'client'):
+            QMessageBox.warning(self, "Error", "Game ID or client not set.")
+            return
+        state, game_ui, game_id = self.state, self.game_ui, self.game_id
+        headers = {"Authorization": f"Bearer {self.client.token}"}
+        data = {"game_id": game_id, "player": self.player_owner}
+
+        def done(response):
             if response.status_code == 200:
-                new_state = response.json().get("state")
-                self.update_from_state(new_state)
-                # --- Set button green after declaring readiness ---
-                bg = "#1a7f1a"
-                self.next_turn_button.setStyleSheet(f"background-color: {bg}; color: {invert_color(bg)};")
+                if not state.apply_patch(response.json().get("patch")):
+                    game_ui.reload_game(game_id)
             else:
-                QMessageBox.warning(self, "Error", f"Failed to mark ready: {response.text}")
-        else:
-            QMessageBox.warning(self, "Error", "Game ID or client not set.")
+                game_ui.order_failed("Error", f"Failed to mark ready: {response.text}")
+
+        def failed(error):
+            game_ui.order_failed("Error", f"Failed to mark ready: {error}")
+
+        self.orders.post(f"{self.client.api_url}/game/ready", data, headers, done, failed)
 
     def declareReadiness(self):
         if hasattr(self, 'game_id') and hasattr(self, 'client'):
@@ -442,9 +535,9 @@ class ButtonGrid(QWidget):
             data = {"game_id": self.game_id, "player": self.player_owner}
             response = requests.post(f"{self.client.api_url}/game/ready", json=data, headers=headers)
             if response.status_code == 200:
-                new_state = response.json().get("state")
-                self.update_from_state(new_state)
-                self.show_readiness_status(new_state)
+                patch = response.json().get("patch")
+                self.handle_patch(patch)
+                self.show_readiness_status(patch)
             else:
                 QMessageBox.warning(self, "Error", f"Failed to declare readiness: {response.text}")
         else:
@@ -477,58 +570,81 @@ class ButtonGrid(QWidget):
 
     def updateInfoLabel(self):
         galaxy_num = getattr(self, 'galaxy_index', 0)
-        self.info_label.setText(f"Owner: {self.player_owner} | Game Year: {self.year} | Galaxy: {galaxy_num + 1}")
+        self.info_label.setText(f"Owner: {getattr(self, 'player_owner', 'N/A')} | Game Year: {self.year} | Galaxy: {galaxy_num + 1}")
         if hasattr(self, "year_label"):
             self.year_label.setText(f"Year: {self.year}")
 
-    def update_button_color(self, button):
-        if button.owner and button.owner in self.owner_colors:
-            bg = self.owner_colors[button.owner]
+    def owner_style(self, owner):
+        """Background and text color of a system owned by owner."""
+        if owner and owner in self.owner_colors:
+            bg = self.owner_colors[owner]
             # text = inverse for owner-colored buttons
-            text_col = invert_color(bg)
-        else:
-            # Unowned: white background, force black text so it's always visible
-            bg = "#FFFFFF"
-            text_col = "#000000"
-        button.setStyleSheet(f"background-color: {bg}; color: {text_col};")
+            return bg, invert_color(bg)
+        # Unowned: white background, force black text so it's always visible
+        return "#FFFFFF", "#000000"
+
+    def update_button_color(self, system):
+        if self.use_canvas:
+            self.canvas.update_cell(system.system_id)
+            return
+        button = self.buttons.get(system.system_id)
+        if button is None:
+            return
+        style = self.owner_stylesheet(system.owner)
+        # setStyleSheet makes Qt re-parse the CSS and re-polish the button, skip it if nothing changed
+        if getattr(button, "applied_style", None) != style:
+            button.applied_style = style
+            button.setStyleSheet(style)
+
+    def owner_stylesheet(self, owner):
+        key = (owner, self.owner_colors.get(owner))
+        style = self.style_cache.get(key)
+        if style is None:
+            bg, text_col = self.owner_style(owner)
+            style = self.style_cache[key] = f"background-color: {bg}; color: {text_col};"
+        return style
 
     def update_from_state(self, state):
-        import json
-        if isinstance(state, str):
-            state = json.loads(state)
-        systems = state.get("systems", [])
-        fleets = state.get("fleets", [])
-        year = state.get("year", 1)
+        # The state parses it once and updates every grid of the game
+        self.state.load_state(state)
 
-        # Store previous year to detect change
-        prev_year = getattr(self, "year", 1)
+    # --- ClientGameState observer callbacks ---
 
-        # Update systems (planets)
-        for sys in systems:
-            if hasattr(self, "galaxy_index") and sys.get("galaxy") != self.galaxy_index:
-                continue
-            btn = self.buttons.get(sys["system_id"])
-            if btn:
-                btn.owner = sys["owner"]
-                btn.current_ships = sys["current_ships"]
-                btn.ship_production = sys["ship_production"]
-                btn.defense_factor = sys["defense_factor"]
-                self.update_button_color(btn)
-
-        self.fleets = [fleet for fleet in fleets if hasattr(self, "galaxy_index") and (
-            fleet.get("source_galaxy", self.galaxy_index) == self.galaxy_index or
-            fleet.get("dest_galaxy", self.galaxy_index) == self.galaxy_index
-        )]
+    def systems_changed(self, systems):
+        for system in systems:
+            self.update_button_color(system)
 
+    def fleets_changed(self, fleets):
+        self.fleets = list(fleets)
+        self.updateFleetOverlay()
+
+    def turn_changed(self, year, version, ready_set):
+        prev_year = self.year
+        # A freshly built view only takes over the current turn
+        first_state = not hasattr(self, "state_version")
         self.year = year
+        self.state_version = version
+        self.ready_set = set(ready_set)
         self.updateInfoLabel()
-        if hasattr(self, "year_label"):
-            self.year_label.setText(f"Year: {self.year}")
-
-        # --- Set button red if year has advanced ---
-        if year != prev_year:
+        # --- Set button red if year has advanced, green once this player is ready ---
+        if year != prev_year and not first_state:
             bg = "#a11a1a"
             self.next_turn_button.setStyleSheet(f"background-color: {bg}; color: {invert_color(bg)};")
+        elif getattr(self, "player_owner", None) in self.ready_set:
+            bg = "#1a7f1a"
+            self.next_turn_button.setStyleSheet(f"background-color: {bg}; color: {invert_color(bg)};")
+
+    def handle_patch(self, patch):
+        if not self.state.apply_patch(patch):
+            self.reload_state()
+
+    def reload_state(self):
+        headers = {"Authorization": f"Bearer {self.client.token}"}
+        response = requests.get(f"{self.client.api_url}/game/{self.game_id}", headers=headers)
+        if response.status_code != 200:
+            QMessageBox.warning(self, "Error", f"Failed to reload the game: {response.text}")
+            return
+        self.state.load_state(response.json()["state"])
 
     def update_next_turn_button_color(self):
         # Check if the current owner is ready (in self.ready_set or via server state if available)
@@ -550,17 +666,38 @@ class ButtonGrid(QWidget):
     
 # New integrated class: MultiGrid combines multiple ButtonGrids and handles arrow key navigation.
 class MultiGrid(QWidget):
-    def __init__(self, grids):
+    """
+    Shows one galaxy at a time. Galaxy views are built by factory(index) when the
+    user navigates to them, the neighbours of the current galaxy are prefetched
+    when the event loop is idle, and views beyond max_views are dropped again
+    (release(index, grid) is called for them). Passing a list of prebuilt grids
+    keeps all of them. An overview (GalaxyMinimap) is shown next to the
+    galaxies, clicking a galaxy there shows it.
+    """
+    def __init__(self, grids=None, factory=None, count=None, max_views=MAX_GALAXY_VIEWS, release=None,
+                 overview=None):
         super().__init__()
         self.setFocusPolicy(Qt.StrongFocus)  # Accept key events
         self.setFocus()  # Request initial focus
         self.stack = QStackedWidget()
-        self.grids = grids
-
-        # Add each ButtonGrid to the stack
-        for grid in grids:
+        if grids is not None:
+            factory, count, max_views = grids.__getitem__, len(grids), len(grids)
+        self.factory = factory
+        self.count = count
+        self.max_views = max(1, max_views)
+        self.release = release
+        self.views = OrderedDict()  # galaxy index -> grid, least recently shown first
+        self.current_index = 0
+        for index, grid in enumerate(grids or []):
+            self.views[index] = grid
             self.stack.addWidget(grid)
 
+        # Builds one neighbour per timeout, a 0 ms timer fires when the event loop is idle
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(0)
+        self.prefetch_timer.timeout.connect(self.prefetchNeighbour)
+
         # Create navigation buttons
         self.prev_button = QPushButton("Previous Galaxy")
         self.next_button = QPushButton("Next Galaxy")
@@ -578,26 +715,83 @@ class MultiGrid(QWidget):
         layout.addWidget(self.prev_button)
         layout.addWidget(self.stack, stretch=1)
         layout.addWidget(self.next_button)
+        self.overview = overview
+        if overview is not None:
+            overview.on_select = self.showGalaxy
+            scroll = QScrollArea()
+            scroll.setWidget(overview)
+            scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+            scroll.setFixedWidth(overview.width() + scroll.verticalScrollBar().sizeHint().width() + 2)
+            scroll.setFocusPolicy(Qt.NoFocus)
+            layout.addWidget(scroll)
         self.setLayout(layout)
 
         # Set the first galaxy as current and update its info label.
-        self.stack.setCurrentIndex(0)
-        self.grids[0].updateInfoLabel()
+        self.showGalaxy(0)
+
+    @property
+    def grids(self):
+        """The galaxy views that are currently built."""
+        return list(self.views.values())
+
+    def currentGrid(self):
+        return self.views[self.current_index]
+
+    def view(self, index):
+        grid = self.views.get(index)
+        if grid is None:
+            grid = self.views[index] = self.factory(index)
+            self.stack.addWidget(grid)
+        return grid
+
+    def showGalaxy(self, index):
+        grid = self.view(index)
+        self.views.move_to_end(index)
+        self.current_index = index
+        self.stack.setCurrentWidget(grid)
+        grid.updateInfoLabel()
+        if self.overview is not None:
+            self.overview.set_current(index)
+        self.evictViews()
+        self.prefetch_timer.start()
+
+    def evictViews(self, keep=()):
+        while len(self.views) > self.max_views:
+            index = next((i for i in self.views if i != self.current_index and i not in keep), None)
+            if index is None:
+                break
+            grid = self.views.pop(index)
+            self.stack.removeWidget(grid)
+            if self.release is not None:
+                self.release(index, grid)
+            grid.deleteLater()
+
+    def neighbours(self):
+        return [(self.current_index + 1) % self.count, (self.current_index - 1) % self.count]
+
+    def prefetchNeighbour(self):
+        keep = set(self.neighbours()) | {self.current_index}
+        for index in self.neighbours():
+            if index in self.views:
+                continue
+            # Only make room by dropping galaxies that are not around the current one
+            if len(self.views) >= self.max_views and all(i in keep for i in self.views):
+                return
+            self.view(index)
+            # Keep the shown galaxy the most recently used one
+            self.views.move_to_end(self.current_index)
+            self.evictViews(keep)
+            self.prefetch_timer.start()
+            return
 
     def showPreviousGalaxy(self):
-        current_index = self.stack.currentIndex()
-        new_index = (current_index - 1) % self.stack.count()
-        self.stack.setCurrentIndex(new_index)
-        self.grids[new_index].updateInfoLabel()
+        self.showGalaxy((self.current_index - 1) % self.count)
 
     def showNextGalaxy(self):
-        current_index = self.stack.currentIndex()
-        new_index = (current_index + 1) % self.stack.count()
-        self.stack.setCurrentIndex(new_index)
-        self.grids[new_index].updateInfoLabel()
+        self.showGalaxy((self.current_index + 1) % self.count)
 
     def keyPressEvent(self, event):
-        current_grid = self.grids[self.stack.currentIndex()]
+        current_grid = self.currentGrid()
         key = event.key()
         if key == Qt.Key_Left:
             self.showPreviousGalaxy()
@@ -635,7 +829,7 @@ class GameSetupDialog(QDialog):
         galaxy_label = QLabel("Number of Galaxies:")
         self.galaxy_spin = QSpinBox()
         self.galaxy_spin.setMinimum(1)
-        self.galaxy_spin.setMaximum(10)
+        self.galaxy_spin.setMaximum(100)
         self.galaxy_spin.setValue(1)
         galaxy_layout.addWidget(galaxy_label)
         galaxy_layout.addWidget(self.galaxy_spin)
@@ -646,7 +840,7 @@ class GameSetupDialog(QDialog):
         planet_label = QLabel("Planets per Galaxy:")
         self.planet_spin = QSpinBox()
         self.planet_spin.setMinimum(10)
-        self.planet_spin.setMaximum(200)
+        self.planet_spin.setMaximum(1000)
         self.planet_spin.setValue(80)
         planet_layout.addWidget(planet_label)
         planet_layout.addWidget(self.planet_spin)
@@ -710,6 +904,11 @@ class GameUI(QWidget):
     def __init__(self, client=None):
         super().__init__()
         self.client = client
+        self.state_cache = StateCache()
+        self.loaded_game_window = None
+        self.loaded_game = None
+        # Fleet orders and ready of the loaded games, in the order they were given
+        self.orders = OrderQueue(self)
         self.setWindowTitle("Risiko Game")
         self.setGeometry(100, 100, 600, 400)
         self.layout = QVBoxLayout()
@@ -736,6 +935,10 @@ class GameUI(QWidget):
 
         self.setLayout(self.layout)
 
+    def closeEvent(self, event):
+        self.orders.shutdown()
+        super().closeEvent(event)
+
     def delete_all_games(self):
         from PyQt5.QtWidgets import QMessageBox
         reply = QMessageBox.question(self, "Delete All Games",
@@ -855,84 +1058,177 @@ class GameUI(QWidget):
             return
 
         game_id = selected_game_id["id"]
-        # Now load the selected game as before
+        cached = self.state_cache.load(self.client.api_url, game_id)
+        if cached is not None:
+            # Show the cached game right away, then get what changed since
+            state, players = cached
+            self.open_game(game_id, state, players)
+            QTimer.singleShot(0, lambda: self.catch_up(game_id))
+            return
+
         response = requests.get(f"{self.client.api_url}/game/{game_id}", headers=headers)
         if response.status_code == 200:
             game_data = response.json()
-            game_id = game_data["game_id"]
             import json
             state = json.loads(game_data["state"])
             players = json.loads(game_data["players"])
-            owners = [p["owner"] if isinstance(p, dict) and "owner" in p else p for p in players]
-            num_galaxies = state.get("galaxies", 1)
-            num_planets = state.get("planets", 80)
-            systems = state.get("systems", [])
-            button_coords_all = state.get("button_coords", {})
-            owner_colors = state.get("owner_colors", {})
-
-            grids = []
-            for galaxy_index in range(num_galaxies):
-                button_coords = button_coords_all.get(str(galaxy_index)) or button_coords_all.get(galaxy_index)
-                grid = ButtonGrid(
-                    num_buttons=num_planets,
-                    owners=owners,
-                    button_coords=button_coords,
-                    owner_colors=owner_colors
-                )
-                grid.galaxy_index = galaxy_index
-                grid.game_id = game_id
-                grid.client = self.client
-                if owner_colors:
-                    grid.owner_colors = owner_colors.copy()
-                if button_coords:
-                    for sys_id, pos in button_coords.items():
-                        sys_id = int(sys_id)
-                        if sys_id in grid.buttons:
-                            grid.buttons[sys_id].grid_pos = tuple(pos)
-                            grid.button_coords[sys_id] = tuple(pos)
-                for sys in systems:
-                    if sys["galaxy"] == galaxy_index:
-                        btn = grid.buttons.get(sys["system_id"])
-                        if btn:
-                            btn.owner = sys["owner"]
-                            btn.current_ships = sys["current_ships"]
-                            btn.ship_production = sys["ship_production"]
-                            btn.defense_factor = sys["defense_factor"]
-                            grid.update_button_color(btn)
-                grid.player_owner = owners[0] if owners else "Default_Player"
-                grid.player_color = grid.owner_colors.get(grid.player_owner, "#FFFFFF")
-                grids.append(grid)
-            multigrid = MultiGrid(grids)
-            win = QDialog(self)
-            win.setWindowTitle(f"Loaded Game {game_id}")
-            layout = QVBoxLayout()
-            layout.addWidget(multigrid)
-            win.setLayout(layout)
-
-            # --- Ensure window fits the screen and is resizable ---
-            screen = QGuiApplication.primaryScreen()
-            screen_geometry = screen.availableGeometry()
-            min_width, min_height = 800, 600
-            max_width, max_height = screen_geometry.width(), screen_geometry.height()
-            # Set sensible minimum and maximum
-            win.setMinimumSize(min_width, min_height)
-            win.setMaximumSize(max_width, max_height)
-            # Resize to 90% of screen, but not below minimum
-            width = max(min_width, int(max_width * 0.9))
-            height = max(min_height, int(max_height * 0.9))
-            win.resize(width, height)
-            # Center the window
-            win.move(
-                screen_geometry.left() + (max_width - width) // 2,
-                screen_geometry.top() + (max_height - height) // 2
-            )
-
-            win.show()
-            self.loaded_game_window = win
+            self.open_game(game_data["game_id"], state, players)
+            self.save_to_cache()
             QMessageBox.information(self, "Game Loaded", "Game state has been loaded successfully!")
         else:
             QMessageBox.warning(self, "Error", f"Failed to load the game: {response.text}")
 
+    def open_game(self, game_id, state, players):
+        """Show a game window for the state (from the server or the cache)."""
+        owners = [p["owner"] if isinstance(p, dict) and "owner" in p else p for p in players]
+        num_galaxies = state.get("galaxies", 1)
+        num_planets = state.get("planets", 80)
+        button_coords_all = state.get("button_coords", {})
+        owner_colors = state.get("owner_colors", {})
+
+        game_state = ClientGameState()
+        # One pass over the systems fills the state of every galaxy
+        game_state.load_state(state)
+
+        def make_grid(galaxy_index):
+            # Built by MultiGrid when the galaxy is first shown or prefetched
+            button_coords = button_coords_all.get(str(galaxy_index)) or button_coords_all.get(galaxy_index)
+            grid = ButtonGrid(
+                num_buttons=num_planets,
+                owners=owners,
+                button_coords=button_coords,
+                owner_colors=owner_colors,
+                state=game_state,
+                galaxy_index=galaxy_index
+            )
+            grid.game_id = game_id
+            grid.client = self.client
+            grid.orders = self.orders
+            grid.game_ui = self
+            grid.player_owner = owners[0] if owners else "Default_Player"
+            grid.player_color = grid.owner_colors.get(grid.player_owner, "#FFFFFF")
+            return grid
+
+        overview = GalaxyMinimap(game_state, num_galaxies, owner_colors) if num_galaxies > 1 else None
+        multigrid = MultiGrid(factory=make_grid, count=num_galaxies,
+                              release=lambda galaxy_index, grid: grid.detach(), overview=overview)
+        win = QDialog(self)
+        win.setWindowTitle(f"Loaded Game {game_id}")
+        layout = QVBoxLayout()
+        layout.addWidget(multigrid)
+        win.setLayout(layout)
+
+        # --- Ensure window fits the screen and is resizable ---
+        screen = QGuiApplication.primaryScreen()
+        screen_geometry = screen.availableGeometry()
+        min_width, min_height = 800, 600
+        max_width, max_height = screen_geometry.width(), screen_geometry.height()
+        # Set sensible minimum and maximum
+        win.setMinimumSize(min_width, min_height)
+        win.setMaximumSize(max_width, max_height)
+        # Resize to 90% of screen, but not below minimum
+        width = max(min_width, int(max_width * 0.9))
+        height = max(min_height, int(max_height * 0.9))
+        win.resize(width, height)
+        # Center the window
+        win.move(
+            screen_geometry.left() + (max_width - width) // 2,
+            screen_geometry.top() + (max_height - height) // 2
+        )
+
+        win.show()
+        if self.loaded_game_window is not None and self.loaded_game_window is not win:
+            self.loaded_game_window.close()
+        self.loaded_game_window = win
+        # What the cache needs: the state keys the ClientGameState doesn't keep and the players
+        self.loaded_game = {"game_id": game_id, "state": game_state, "base": state, "players": players}
+        win.finished.connect(lambda result, game=self.loaded_game: self.save_to_cache(game))
+
+    def reload_game(self, game_id):
+        """Load the whole state again, when a patch of an order answer doesn't fit."""
+        game = self.loaded_game
+        if game is None or game["game_id"] != game_id:
+            return
+        headers = {"Authorization": f"Bearer {self.client.token}"}
+        try:
+            response = requests.get(f"{self.client.api_url}/game/{game_id}", headers=headers)
+        except requests.RequestException as e:
+            self.order_failed("Error", f"Failed to reload the game: {e}")
+            return
+        if response.status_code != 200:
+            self.order_failed("Error", f"Failed to reload the game: {response.text}")
+            return
+        game["state"].load_state(response.json()["state"])
+
+    def order_failed(self, title, text):
+        # The game window if it is still open, the grid that sent the order may be gone
+        parent = self.loaded_game_window if self.loaded_game_window is not None else self
+        QMessageBox.warning(parent, title, text)
+
+    def catch_up(self, game_id):
+        """Bring the game opened from the cache up to the server's version."""
+        game = self.loaded_game
+        if game is None or game["game_id"] != game_id:
+            return
+        game_state = game["state"]
+        headers = {"Authorization": f"Bearer {self.client.token}"}
+        try:
+            response = requests.get(f"{self.client.api_url}/game/{game_id}/since/{game_state.version}",
+                                    headers=headers)
+        except requests.RequestException as e:
+            QMessageBox.warning(self, "Offline", f"Showing the cached game, the server can't be reached: {e}")
+            return
+        if response.status_code == 404:
+            self.state_cache.remove(self.client.api_url, game_id)
+            QMessageBox.warning(self, "Error", "The game doesn't exist on the server any more.")
+            return
+        if response.status_code != 200:
+            QMessageBox.warning(self, "Error", f"Failed to update the game: {response.text}")
+            return
+        data = response.json()
+        patches = data.get("patches")
+        if patches is not None:
+            for patch in patches:
+                if not game_state.apply_patch(patch):
+                    # Shouldn't happen, the server only sends complete chains
+                    self.state_cache.remove(self.client.api_url, game_id)
+                    return self.catch_up_full(game_id)
+                if "players" in patch:
+                    game["players"] = patch["players"]
+        else:
+            import json
+            state = json.loads(data["state"])
+            players = json.loads(data["players"])
+            layout_keys = ("galaxies", "planets", "button_coords", "owner_colors")
+            if any(state.get(key) != game["base"].get(key) for key in layout_keys) or players != game["players"]:
+                # Another map or other players (a replaced save), build the window again
+                self.open_game(game_id, state, players)
+            else:
+                game_state.load_state(state)
+        self.save_to_cache()
+
+    def catch_up_full(self, game_id):
+        headers = {"Authorization": f"Bearer {self.client.token}"}
+        response = requests.get(f"{self.client.api_url}/game/{game_id}", headers=headers)
+        if response.status_code == 200:
+            import json
+            data = response.json()
+            self.open_game(game_id, json.loads(data["state"]), json.loads(data["players"]))
+            self.save_to_cache()
+
+    def save_to_cache(self, game=None):
+        game = game or self.loaded_game
+        if game is None or not self.client or not self.client.api_url:
+            return
+        game_state = game["state"]
+        players = [dict(p, ready=p.get("owner") in game_state.ready_set) if isinstance(p, dict) else p
+                   for p in game["players"]]
+        try:
+            self.state_cache.save(self.client.api_url, game["game_id"], game_state.to_state(game["base"]), players)
+        except OSError:
+            # The cache only makes loading faster, playing works without it
+            pass
+
 from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QSpinBox, QLineEdit, QPushButton, QMessageBox
 from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QSpinBox, QLineEdit, QPushButton, QColorDialog, QSlider
 from PyQt5.QtCore import Qt
@@ -975,7 +1271,7 @@ class GameSetupDialog(QDialog):
         galaxy_label = QLabel("Number of Galaxies:")
         self.galaxy_spin = QSpinBox()
         self.galaxy_spin.setMinimum(1)
-        self.galaxy_spin.setMaximum(10)
+        self.galaxy_spin.setMaximum(100)
         self.galaxy_spin.setValue(1)
         galaxy_layout.addWidget(galaxy_label)
         galaxy_layout.addWidget(self.galaxy_spin)
@@ -986,7 +1282,7 @@ class GameSetupDialog(QDialog):
         planet_label = QLabel("Planets per Galaxy:")
         self.planet_spin = QSpinBox()
         self.planet_spin.setMinimum(10)
-        self.planet_spin.setMaximum(200)
+        self.planet_spin.setMaximum(1000)
         self.planet_spin.setValue(80)
         planet_layout.addWidget(planet_label)
         planet_layout.addWidget(self.planet_spin)
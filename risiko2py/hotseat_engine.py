@@ -0,0 +1,340 @@
+"""
+In-memory engine of the offline hot-seat game (old_game.py).
+
+The engine holds the whole game and is the only place where it changes: the
+button grids only show it. Nothing is read from disk during a game. No Qt in
+here.
+
+The engine remembers what changed since the last save (take_changes), so an
+autosave only has to write the delta (see hotseat_save.py). load_csv reads
+the save folders of older versions (players.csv and galaxy_<n>/systems.csv +
+fleets.csv).
+"""
+import csv
+import math
+import os
+import random
+import re
+
+ROWS, COLS = 40, 15
+# 600 cells for 80 systems, bigger maps keep that density
+CELLS_PER_SYSTEM = ROWS * COLS / 80
+
+class System:
+    __slots__ = ("system_id", "grid_pos", "owner", "current_ships", "ship_production", "defense_factor")
+
+    def __init__(self, system_id, grid_pos, owner=None, current_ships=0, ship_production=1, defense_factor=1.0):
+        self.system_id = system_id
+        self.grid_pos = grid_pos
+        self.owner = owner
+        self.current_ships = current_ships
+        self.ship_production = ship_production
+        self.defense_factor = defense_factor
+
+_GRID_POS = re.compile(r"^\s*[\(\[]\s*(-?\d+)\s*,\s*(-?\d+)\s*[\)\]]\s*$")
+
+def parse_grid_pos(text):
+    """'(3, 7)' -> (3, 7), None for anything else (the saves write str(tuple))."""
+    match = _GRID_POS.match(text or "")
+    if match is None:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+def parse_owner(text):
+    # Unowned systems are written as an empty cell or "None"
+    return None if text in ("", "None") else text
+
+def map_size(num_systems):
+    """Rows and columns of a galaxy: 40 x 15, scaled up (same shape) for more systems."""
+    scale = math.sqrt(max(1.0, num_systems * CELLS_PER_SYSTEM / (ROWS * COLS)))
+    return math.ceil(ROWS * scale), math.ceil(COLS * scale)
+
+def place_systems(count, rows, cols, taken=None):
+    """
+    Jittered grid: every system gets a 2 x 2 block of its own and a cell in it
+    that doesn't touch (left, right, above, below) a system placed before, if
+    the block has one. The set of taken cells is the spatial hash for that
+    check. Returns `count` distinct cells.
+    """
+    taken = set() if taken is None else taken
+    blocks = [(row, col) for row in range(0, rows, 2) for col in range(0, cols, 2)]
+    if count > len(blocks):
+        # Too small for one block per system
+        free = [(row, col) for row in range(rows) for col in range(cols) if (row, col) not in taken]
+        return random.sample(free, count)
+    positions = []
+    for row, col in random.sample(blocks, count):
+        cells = [(r, c) for r in (row, row + 1) for c in (col, col + 1)
+                 if r < rows and c < cols and (r, c) not in taken]
+        if not cells:
+            continue
+        random.shuffle(cells)
+        pos = next((cell for cell in cells if not any(
+            (cell[0] + dr, cell[1] + dc) in taken for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1)))), cells[0])
+        taken.add(pos)
+        positions.append(pos)
+    if len(positions) < count:
+        # Blocks that were already full (place_missing), take any free cells
+        free = [(row, col) for row in range(rows) for col in range(cols) if (row, col) not in taken]
+        positions += random.sample(free, count - len(positions))
+    return positions
+
+def fleet_turns(pos1, pos2):
+    return math.ceil(math.sqrt((pos1[0] - pos2[0]) ** 2 + (pos1[1] - pos2[1]) ** 2))
+
+class HotSeatGame:
+    def __init__(self, owners, owner_colors=None):
+        self.owners = list(owners)
+        # One color per owner for the whole game
+        self.owner_colors = dict(owner_colors or {})
+        for owner in self.owners:
+            self.owner_colors.setdefault(owner, "#{:06X}".format(random.randint(0, 0xFFFFFF)))
+        self.year = 1
+        self.ready_set = set()
+        self.galaxies = []   # [{system_id: System}]
+        self.fleets = []     # [[fleet dict]] per galaxy
+        self.listeners = []  # callback(changed) with changed = {galaxy: [system_id]}
+        # Changed since the last save
+        self.dirty_systems = {}   # galaxy -> {system_id}
+        self.dirty_fleets = set()  # galaxies
+
+    @classmethod
+    def new(cls, num_galaxies, num_systems, owners):
+        game = cls(owners)
+        rows, cols = map_size(num_systems)
+        for _ in range(num_galaxies):
+            positions = place_systems(num_systems, rows, cols)
+            game.galaxies.append({
+                i + 1: System(i + 1, positions[i],
+                              ship_production=random.randint(1, 10),
+                              defense_factor=round(random.uniform(0.7, 1.0), 2))
+                for i in range(num_systems)
+            })
+            game.fleets.append([])
+        return game
+
+    def notify(self, changed):
+        for galaxy, sys_ids in changed.items():
+            self.dirty_systems.setdefault(galaxy, set()).update(sys_ids)
+        for callback in list(self.listeners):
+            callback(changed)
+
+    # --- setup ---
+
+    def assign_starting_planets(self, owner_assignments):
+        """
+        Give every owner a starting planet in the galaxy owner_assignments maps
+        it to. Returns [(owner, galaxy, system_id)].
+        """
+        assigned = []
+        for galaxy, systems in enumerate(self.galaxies):
+            available_ids = list(systems)
+            random.shuffle(available_ids)
+            for owner in self.owners:
+                if owner_assignments.get(owner) != galaxy or not available_ids:
+                    continue
+                system = systems[available_ids.pop()]
+                system.owner = owner
+                system.current_ships = 250
+                system.ship_production = 10
+                system.defense_factor = 0.5
+                assigned.append((owner, galaxy, system.system_id))
+        return assigned
+
+    def assign_pirate_planets(self, share=0.35):
+        for systems in self.galaxies:
+            for system in systems.values():
+                if system.owner is None and random.random() < share:
+                    system.owner = "Pirates"
+
+    # --- moves ---
+
+    def distance(self, galaxy, sys1, sys2):
+        pos1, pos2 = self.galaxies[galaxy][sys1].grid_pos, self.galaxies[galaxy][sys2].grid_pos
+        return math.sqrt((pos1[0] - pos2[0]) ** 2 + (pos1[1] - pos2[1]) ** 2)
+
+    def launch_fleet(self, galaxy, source, destination, ships, owner):
+        """Raises ValueError if the order is not allowed, returns the fleet."""
+        systems = self.galaxies[galaxy]
+        if source not in systems or destination not in systems:
+            raise ValueError("Invalid source or destination.")
+        source_system = systems[source]
+        if source_system.owner != owner:
+            raise ValueError("You can only send fleets from systems you own.")
+        if ships <= 5:
+            raise ValueError("Fleet must consist of more than 5 ships to launch.")
+        if source_system.current_ships < ships:
+            raise ValueError("Not enough ships available!")
+        source_system.current_ships -= ships
+        fleet = {
+            "source": source,
+            "destination": destination,
+            "ships": ships,
+            "turns": fleet_turns(source_system.grid_pos, systems[destination].grid_pos),
+            "owner": owner,
+            "year": self.year
+        }
+        self.fleets[galaxy].append(fleet)
+        self.dirty_fleets.add(galaxy)
+        self.notify({galaxy: [source]})
+        return fleet
+
+    def set_ready(self, owner):
+        """Mark the owner ready, returns True if that ended the turn."""
+        self.ready_set.add(owner)
+        self.notify({})
+        if len(self.ready_set) < len(self.owners):
+            return False
+        self.ready_set.clear()
+        self.next_turn()
+        return True
+
+    def next_turn(self):
+        changed = {}
+        for galaxy, systems in enumerate(self.galaxies):
+            touched = set()
+            # Increase production on each system.
+            for system in systems.values():
+                if system.owner is not None:
+                    system.current_ships += system.ship_production
+                    touched.add(system.system_id)
+            # Process fleets: decrement turns and deliver if arrival reached.
+            remaining = []
+            for fleet in self.fleets[galaxy]:
+                fleet["turns"] -= 1
+                if fleet["turns"] > 0:
+                    remaining.append(fleet)
+                    continue
+                dest = systems.get(fleet["destination"])
+                if dest is None:
+                    continue
+                # If the destination is unowned or owned by the same player, add ships.
+                if dest.owner == fleet["owner"] or dest.owner is None:
+                    dest.current_ships += fleet["ships"]
+                    dest.owner = fleet["owner"]
+                # Simple combat logic: if fewer ships, take over.
+                elif fleet["ships"] > dest.current_ships:
+                    dest.owner = fleet["owner"]
+                    dest.current_ships = fleet["ships"] - dest.current_ships
+                else:
+                    dest.current_ships -= fleet["ships"]
+                touched.add(dest.system_id)
+            if self.fleets[galaxy]:
+                self.dirty_fleets.add(galaxy)
+            self.fleets[galaxy] = remaining
+            changed[galaxy] = list(touched)
+        self.year += 1
+        self.notify(changed)
+
+    # --- save and load ---
+
+    @staticmethod
+    def system_row(system):
+        return [system.system_id, system.grid_pos[0], system.grid_pos[1], system.owner,
+                system.current_ships, system.ship_production, system.defense_factor]
+
+    @staticmethod
+    def system_from_row(row):
+        sys_id, row_pos, col_pos, owner, ships, production, defense = row
+        return System(sys_id, (row_pos, col_pos), owner, ships, production, defense)
+
+    def to_dict(self):
+        return {
+            "owners": self.owners,
+            "owner_colors": self.owner_colors,
+            "year": self.year,
+            "ready": sorted(self.ready_set),
+            "galaxies": [[self.system_row(system) for system in systems.values()] for systems in self.galaxies],
+            "fleets": self.fleets
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        game = cls(data["owners"], data["owner_colors"])
+        game.year = data["year"]
+        game.ready_set = set(data.get("ready", []))
+        for rows in data["galaxies"]:
+            game.galaxies.append({row[0]: cls.system_from_row(row) for row in rows})
+        game.fleets = [list(fleets) for fleets in data["fleets"]]
+        return game
+
+    def take_changes(self):
+        """What changed since the last call, as a delta for apply_changes."""
+        delta = {
+            "year": self.year,
+            "ready": sorted(self.ready_set),
+            "systems": {str(galaxy): [self.system_row(self.galaxies[galaxy][sys_id]) for sys_id in sorted(sys_ids)]
+                        for galaxy, sys_ids in self.dirty_systems.items() if sys_ids},
+            "fleets": {str(galaxy): self.fleets[galaxy] for galaxy in sorted(self.dirty_fleets)}
+        }
+        self.dirty_systems = {}
+        self.dirty_fleets = set()
+        return delta
+
+    def apply_changes(self, delta):
+        self.year = delta["year"]
+        self.ready_set = set(delta.get("ready", []))
+        for galaxy, rows in delta.get("systems", {}).items():
+            systems = self.galaxies[int(galaxy)]
+            for row in rows:
+                systems[row[0]] = self.system_from_row(row)
+        for galaxy, fleets in delta.get("fleets", {}).items():
+            self.fleets[int(galaxy)] = list(fleets)
+
+    @classmethod
+    def load_csv(cls, folder):
+        """Raises OSError or ValueError for folders that are not a save."""
+        owners, owner_colors, ready = [], {}, set()
+        with open(os.path.join(folder, "players.csv"), "r", newline="") as csvfile:
+            reader = csv.reader(csvfile)
+            next(reader)  # skip header
+            for row in reader:
+                if len(row) >= 2:
+                    owners.append(row[0])
+                    owner_colors[row[0]] = row[1]
+                    if len(row) >= 3 and row[2] == "True":
+                        ready.add(row[0])
+        game = cls(owners, owner_colors)
+        game.ready_set = ready
+        galaxy_dirs = [d for d in os.listdir(folder) if re.fullmatch(r"galaxy_\d+", d)]
+        galaxy_dirs.sort(key=lambda d: int(d.split("_")[1]))
+        for galaxy_dir in galaxy_dirs:
+            systems = {}
+            with open(os.path.join(folder, galaxy_dir, "systems.csv"), "r", newline="") as csvfile:
+                reader = csv.reader(csvfile)
+                next(reader)  # skip header
+                for row in reader:
+                    if len(row) >= 8 and row[0] == "System":
+                        sys_id = int(row[1])
+                        systems[sys_id] = System(sys_id, parse_grid_pos(row[6]), parse_owner(row[5]),
+                                                 int(row[2]), int(row[3]), float(row[4]))
+                        game.year = int(row[7])
+            fleets = []
+            fleets_file = os.path.join(folder, galaxy_dir, "fleets.csv")
+            if os.path.exists(fleets_file):
+                with open(fleets_file, "r", newline="") as csvfile:
+                    reader = csv.reader(csvfile)
+                    next(reader)  # skip header
+                    for row in reader:
+                        if len(row) >= 7 and row[0] == "Fleet":
+                            fleets.append({"source": int(row[1]), "destination": int(row[2]),
+                                           "ships": int(row[3]), "turns": int(row[4]),
+                                           "owner": row[5], "year": int(row[6])})
+            game.place_missing(systems)
+            game.galaxies.append(systems)
+            game.fleets.append(fleets)
+        if not game.galaxies:
+            raise ValueError(f"No galaxy_<n> folders in {folder}")
+        return game
+
+    def place_missing(self, systems):
+        """Systems without a (readable) grid position get a free cell."""
+        used = {system.grid_pos for system in systems.values() if system.grid_pos is not None}
+        missing = [system for system in systems.values() if system.grid_pos is None]
+        if not missing:
+            return
+        rows, cols = map_size(len(systems))
+        rows = max([rows] + [row + 1 for row, _ in used])
+        cols = max([cols] + [col + 1 for _, col in used])
+        for system, pos in zip(missing, place_systems(len(missing), rows, cols, used)):
+            system.grid_pos = pos
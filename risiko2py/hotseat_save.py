@@ -0,0 +1,116 @@
+"""
+Single-file saves of the hot-seat game (*.r2save).
+
+A save is a header line followed by records: a 4 byte big-endian length and
+zlib compressed JSON. The first record is a snapshot of the whole game, every
+autosave appends a delta with the systems and fleets that changed since the
+previous record (HotSeatGame.take_changes). Loading reads the file once from
+start to end. Once the deltas together are bigger than the snapshot, the next
+save writes a new snapshot instead, so a file never has to be read for much
+longer than twice the size of the game. A record cut off by a crash while
+appending is ignored, the game is then restored from the records before it
+and loading cuts the broken bytes off the file, so later deltas are appended
+right after the last good record.
+
+Converting the old save folders (players.csv + galaxy_<n>/*.csv):
+
+    python hotseat_save.py convert saves/save_01.01.2025_120000 [more folders]
+"""
+import json
+import os
+import struct
+import sys
+import zlib
+from hotseat_engine import HotSeatGame
+
+MAGIC = b"R2SAVE1\n"
+EXTENSION = ".r2save"
+
+def encode_record(record):
+    data = zlib.compress(json.dumps(record, separators=(",", ":")).encode("utf-8"))
+    return struct.pack(">I", len(data)) + data
+
+def read_records(path):
+    """Returns ([(record, size on disk)], end of the last good record, file size)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not a Risiko save")
+    records = []
+    offset = len(MAGIC)
+    while offset + 4 <= len(data):
+        (length,) = struct.unpack_from(">I", data, offset)
+        chunk = data[offset + 4:offset + 4 + length]
+        if len(chunk) < length:
+            break  # cut off while appending
+        try:
+            records.append((json.loads(zlib.decompress(chunk)), 4 + length))
+        except (zlib.error, ValueError):
+            break
+        offset += 4 + length
+    return records, offset, len(data)
+
+class SaveFile:
+    def __init__(self, path):
+        self.path = path
+        self.snapshot_bytes = 0
+        self.delta_bytes = 0
+
+    def write_snapshot(self, game):
+        """Write the whole game, replacing the file."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        game.take_changes()
+        record = encode_record({"type": "snapshot", "game": game.to_dict()})
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(record)
+        os.replace(tmp_path, self.path)
+        self.snapshot_bytes = len(record)
+        self.delta_bytes = 0
+
+    def append_delta(self, game):
+        """Append what changed since the last record (the autosave after a turn)."""
+        if not os.path.exists(self.path) or self.delta_bytes >= self.snapshot_bytes:
+            self.write_snapshot(game)
+            return
+        record = encode_record(dict(game.take_changes(), type="delta"))
+        with open(self.path, "ab") as f:
+            f.write(record)
+        self.delta_bytes += len(record)
+
+    @classmethod
+    def load(cls, path):
+        """Returns (HotSeatGame, SaveFile). Raises OSError or ValueError."""
+        records, end, size = read_records(path)
+        if not records or records[0][0].get("type") != "snapshot":
+            raise ValueError(f"{path} has no game in it")
+        game = HotSeatGame.from_dict(records[0][0]["game"])
+        for record, _ in records[1:]:
+            if record.get("type") == "delta":
+                game.apply_changes(record)
+        if end < size:
+            # Drop what a crash left behind, deltas appended after it would be lost
+            with open(path, "r+b") as f:
+                f.truncate(end)
+        save = cls(path)
+        save.snapshot_bytes = records[0][1]
+        save.delta_bytes = sum(size for _, size in records[1:])
+        return game, save
+
+def convert_csv_folder(folder, path=None):
+    """Write the old CSV save folder as one .r2save file next to it, returns its path."""
+    game = HotSeatGame.load_csv(folder)
+    path = path or folder.rstrip("/\\") + EXTENSION
+    SaveFile(path).write_snapshot(game)
+    return path
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] != "convert":
+        print(__doc__)
+        sys.exit(1)
+    for folder in sys.argv[2:]:
+        try:
+            print(f"{folder} -> {convert_csv_folder(folder)}")
+        except (OSError, ValueError) as e:
+            print(f"{folder}: {e}")
@@ -2,60 +2,63 @@ import sys
 import os
 import random
 import math
-import csv
 from PyQt5.QtWidgets import (QApplication, QWidget, QPushButton, QGridLayout, 
     QVBoxLayout, QLineEdit, QHBoxLayout, QMenu, QMessageBox, QInputDialog, QDialog, QFileDialog, QLabel, QStackedWidget)
 from PyQt5.QtGui import QCursor, QIcon
 from PyQt5.QtCore import Qt, QEvent
 from functools import partial
-from worldgen import load_worldgen_options
+from worldgen import load_worldgen_preset
+from hotseat_engine import HotSeatGame
+from hotseat_save import SaveFile, EXTENSION
 
-# Global variable for keeping the chosen load folder.
-LOAD_FOLDER = None
+SAVE_FOLDER = os.path.join(os.getcwd(), "saves")
+
+def set_button_style(button, style):
+    # setStyleSheet makes Qt re-parse the CSS and re-polish the button, skip it if nothing changed
+    if getattr(button, "applied_style", None) != style:
+        button.applied_style = style
+        button.setStyleSheet(style)
+
+def owner_style(game, owner):
+    if owner in game.owner_colors:
+        return f"background-color: {game.owner_colors[owner]};"
+    # Unowned and pirates: white with black text
+    return "background-color: #FFFFFF; color: #000000;"
 
 class ButtonGrid(QWidget):
-    def __init__(self, num_buttons=80, owners=None):
+    """One galaxy of a HotSeatGame (hotseat_engine.py), the game itself lives in the engine."""
+    def __init__(self, game, galaxy_index=0, player_owner=None):
         super().__init__()
         self.setWindowIcon(QIcon("designs/icon.png"))  # Set your custom icon.
-        self.year = 1  # Initialize game year.
-        self.num_buttons = num_buttons
-        # Use provided owners or fallback.
-        self.owners = owners if owners is not None else ["Default_Player"]
-        # Assign each owner a unique random color.
-        self.owner_colors = {}
-        for owner in self.owners:
-            self.owner_colors[owner] = "#{:06X}".format(random.randint(0, 0xFFFFFF))
-        self.button_coords = {}  # Map: system ID -> grid position.
+        self.game = game
+        self.galaxy_index = galaxy_index
+        self.systems = game.galaxies[galaxy_index]  # Map: system ID -> System (owned by the engine).
+        self.owners = game.owners
+        self.owner_colors = game.owner_colors
+        self.player_owner = player_owner or (self.owners[0] if self.owners else "Default_Player")
+        self.player_color = self.owner_colors.get(self.player_owner, "#FFFFFF")
+        self.button_coords = {sys_id: system.grid_pos for sys_id, system in self.systems.items()}
         self.buttons = {}        # Map: system ID -> QPushButton.
-        self.fleets = []         # Initialize fleets array.
-        self.ready_set = set()   # Track which players have confirmed readiness.
         self.initUI()
+        game.listeners.append(self.gameChanged)
+
+    @property
+    def year(self):
+        return self.game.year
 
     def initUI(self):
         main_layout = QVBoxLayout()
         # Info label displays current owner and game year.
-        self.info_label = QLabel(f"Owner: {getattr(self, 'player_owner', 'N/A')} | Game Year: {self.year}")
+        self.info_label = QLabel(f"Owner: {self.player_owner} | Game Year: {self.year}")
         main_layout.addWidget(self.info_label)
         
         self.grid = QGridLayout()
-        rows, cols = 40, 15
-        positions = [(row, col) for row in range(rows) for col in range(cols)]
-        random.shuffle(positions)
-        for i in range(self.num_buttons):
-            button = QPushButton(str(i+1))
-            pos = positions[i]
-            button.grid_pos = pos
-            self.button_coords[i+1] = pos
-            self.buttons[i+1] = button
-
-            # Initialize button properties.
-            button.current_ships = 0
-            button.ship_production = random.randint(1, 10)
-            button.defense_factor = round(random.uniform(0.7, 1.0), 2)
-            button.owner = None
-            button.setStyleSheet("background-color: #FFFFFF; color: #000000;")
-            
-            self.grid.addWidget(button, pos[0], pos[1])
+        for sys_id, system in self.systems.items():
+            button = QPushButton(str(sys_id))
+            button.sys_id = sys_id
+            self.buttons[sys_id] = button
+            set_button_style(button, owner_style(self.game, system.owner))
+            self.grid.addWidget(button, system.grid_pos[0], system.grid_pos[1])
             button.installEventFilter(self)
         main_layout.addLayout(self.grid)
         
@@ -77,6 +80,16 @@ class ButtonGrid(QWidget):
         self.setLayout(main_layout)
         self.input_field.clearFocus()
 
+    def gameChanged(self, changed):
+        # Only the systems the engine changed in this galaxy are restyled
+        for sys_id in changed.get(self.galaxy_index, ()):
+            set_button_style(self.buttons[sys_id], owner_style(self.game, self.systems[sys_id].owner))
+        self.updateInfoLabel()
+
+    def detach(self):
+        if self.gameChanged in self.game.listeners:
+            self.game.listeners.remove(self.gameChanged)
+
     def changeOwner(self):
         current, ok = QInputDialog.getItem(self, "Change Current Owner",
                                            "Select your new owner:", self.owners, 0, False)
@@ -86,17 +99,6 @@ class ButtonGrid(QWidget):
             QMessageBox.information(self, "Owner Changed",
                                     f"Your current owner is now '{current}' with color {self.player_color}.")
 
-    def recreateGridLayout(self):
-        while self.grid.count():
-            item = self.grid.takeAt(0)
-            widget = item.widget()
-            if widget is not None:
-                widget.setParent(None)
-        for sys_id, button in self.buttons.items():
-            pos = button.grid_pos if button.grid_pos is not None else self.button_coords.get(sys_id)
-            if pos:
-                self.grid.addWidget(button, pos[0], pos[1])
-
     def openGameMenuAtStart(self):
         dialog = QDialog(self)
         dialog.setWindowTitle("Game Menu")
@@ -121,7 +123,6 @@ class ButtonGrid(QWidget):
 
     def startNewGame(self, dialog):
         self.choosePlayerOwner()
-        self.assignStartingPlanets()
         dialog.accept()
 
     def choosePlayerOwner(self):
@@ -139,73 +140,16 @@ class ButtonGrid(QWidget):
             f"You are '{self.player_owner}' with color {self.player_color}")
         self.updateInfoLabel()
 
-    def assignStartingPlanets(self, galaxy_index, total_galaxies, owner_assignments):
-        """
-        Assign starting planets evenly across all galaxies.
-        Only assign a starting planet for an owner if that owner’s chosen galaxy matches galaxy_index.
-        """
-        available_ids = list(self.buttons.keys())
-        random.shuffle(available_ids)
-        self.starting_planets = {}
-        for owner in self.owners:
-            # Only assign a starting planet in this galaxy for owners preselected for it.
-            if owner_assignments.get(owner) == galaxy_index:
-                if not available_ids:
-                    break
-                sys_id = available_ids.pop()
-                self.starting_planets[owner] = sys_id
-                button = self.buttons[sys_id]
-                button.owner = owner
-                button.current_ships = 250
-                button.ship_production = 10
-                button.defense_factor = 0.5
-                button.setStyleSheet(f"background-color: {self.owner_colors[owner]};")
-                QMessageBox.information(self, "Starting Planet Assigned",
-                                        f"System {sys_id} in Galaxy {galaxy_index + 1} is now assigned to {owner}.")
-
-    def assignPiratePlanets(self):
-        for sys_id, button in self.buttons.items():
-            if button.owner is None and random.random() < 0.35:
-                button.owner = "Pirates"
-                # Unowned-style (white) with black text
-                button.setStyleSheet("background-color: #FFFFFF; color: #000000;")
-
-    def nextTurn(self):
-        # Increase production on each system.
-        for num, button in self.buttons.items():
-            if button.owner is not None:
-                button.current_ships += button.ship_production
-
-        # Process fleets: decrement turns and deliver if arrival reached.
-        fleets_to_remove = []
-        for fleet in list(self.fleets):
-            fleet["turns"] -= 1
-            if fleet["turns"] <= 0:
-                dest_button = self.buttons.get(fleet["destination"])
-                if dest_button:
-                    # If the destination is unowned or owned by the same player, add ships.
-                    if dest_button.owner == fleet["owner"] or dest_button.owner is None:
-                        dest_button.current_ships += fleet["ships"]
-                        dest_button.owner = fleet["owner"]
-                        dest_button.setStyleSheet(f"background-color: {self.owner_colors.get(fleet['owner'], '#FFFFFF')};")
-                    else:
-                        # Simple combat logic: if fewer ships, take over.
-                        if fleet["ships"] > dest_button.current_ships:
-                            dest_button.owner = fleet["owner"]
-                            dest_button.current_ships = fleet["ships"] - dest_button.current_ships
-                            dest_button.setStyleSheet(f"background-color: {self.owner_colors.get(fleet['owner'], '#FFFFFF')};")
-                        else:
-                            dest_button.current_ships -= fleet["ships"]
-                fleets_to_remove.append(fleet)
-        
-        # Remove processed fleets.
-        for f in fleets_to_remove:
-            self.fleets.remove(f)
+    def multiGrid(self):
+        parent = self.parent()
+        while parent is not None and not isinstance(parent, MultiGrid):
+            parent = parent.parent()
+        return parent
 
-        QMessageBox.information(self, "Turn Ended", "Production added and fleets processed!")
-        self.year += 1
-        self.updateInfoLabel()
-        self.refreshGameState()
+    def loadGame(self):
+        multi = self.multiGrid()
+        if multi is not None:
+            multi.loadGame()
 
     def eventFilter(self, obj, event):
         if isinstance(obj, QPushButton):
@@ -219,11 +163,12 @@ class ButtonGrid(QWidget):
         return super().eventFilter(obj, event)
 
     def openMenu(self, button):
+        system = self.systems[button.sys_id]
         menu = QMenu(self)
-        menu.addAction(f"Current Ships: {button.current_ships}")
-        menu.addAction(f"Ship Production: {button.ship_production}")
-        menu.addAction(f"Defense Factor: {button.defense_factor}")
-        menu.addAction(f"Owner: {button.owner}")
+        menu.addAction(f"Current Ships: {system.current_ships}")
+        menu.addAction(f"Ship Production: {system.ship_production}")
+        menu.addAction(f"Defense Factor: {system.defense_factor}")
+        menu.addAction(f"Owner: {system.owner}")
         menu.addSeparator()
         action1 = menu.addAction("Select as first system for distance calculation")
         action1.triggered.connect(lambda: self.selectFirstSystem(button))
@@ -246,7 +191,7 @@ class ButtonGrid(QWidget):
         self.input_field.setFocus()
 
     def selectSourceForFleetSend(self, button):
-        if button.owner != self.player_owner:
+        if self.systems[button.sys_id].owner != self.player_owner:
             QMessageBox.warning(self, "Invalid Source", "You can only send fleets from systems you own.")
             return
         src = int(button.text())
@@ -309,10 +254,9 @@ class ButtonGrid(QWidget):
                 return
             value = int(text)
             if len(self.fleet_inputs) == 0:
-                if value not in self.buttons:
+                if value not in self.systems:
                     raise ValueError("Invalid system id.")
-                source_button = self.buttons[value]
-                if source_button.owner != self.player_owner:
+                if self.systems[value].owner != self.player_owner:
                     raise ValueError("You can only send fleets from systems you own.")
             self.fleet_inputs.append(value)
             if len(self.fleet_inputs) == 1:
@@ -323,28 +267,13 @@ class ButtonGrid(QWidget):
                 self.input_field.setPlaceholderText("Enter number of ships to send")
             elif len(self.fleet_inputs) == 3:
                 src, dest, ships_to_send = self.fleet_inputs
-                if ships_to_send <= 5:
+                try:
+                    fleet = self.game.launch_fleet(self.galaxy_index, src, dest, ships_to_send, self.player_owner)
+                except ValueError:
                     self.input_field.clear()
                     self.fleet_inputs = []
-                    raise ValueError("Fleet must consist of more than 5 ships to launch.")
-                pos1 = self.button_coords.get(src)
-                pos2 = self.button_coords.get(dest)
-                if pos1 is None or pos2 is None:
-                    raise ValueError("Invalid source or destination.")
-                distance = math.sqrt((pos1[0]-pos2[0])**2 + (pos1[1]-pos2[1])**2)
-                turns_required = math.ceil(distance)
-                source_button = self.buttons.get(src)
-                if source_button.current_ships < ships_to_send:
-                    raise ValueError("Not enough ships available!")
-                source_button.current_ships -= ships_to_send
-                self.fleets.append({
-                    "source": src,
-                    "destination": dest,
-                    "ships": ships_to_send,
-                    "turns": turns_required,
-                    "owner": source_button.owner,
-                    "year": self.year
-                })
+                    raise
+                turns_required = fleet["turns"]
                 QMessageBox.information(self, "Fleet Launched",
                     f"Fleet from system {src} to system {dest} with {ships_to_send} ships launched.\nArrival in {turns_required} turn(s).")
                 self.input_field.clear()
@@ -394,140 +323,60 @@ class ButtonGrid(QWidget):
         self.input_field.setFocus()
     
     def toggleSaveGame(self):
-        try:
-            from datetime import datetime
-            base_save_folder = os.path.join(os.getcwd(), "saves")
-            if not os.path.exists(base_save_folder):
-                os.makedirs(base_save_folder)
-            timestamp = datetime.now().strftime("%d.%m.%Y")
-            folder_name = ",".join(self.owners) + "_" + timestamp
-            full_path = os.path.join(base_save_folder, folder_name)
-            if not os.path.exists(full_path):
-                os.makedirs(full_path)
-            players_file = os.path.join(full_path, "players.csv")
-            with open(players_file, "w", newline="") as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(["Owner", "Color", "Ready"])
-                for owner in self.owners:
-                    ready_value = "True" if owner in self.ready_set else "False"
-                    writer.writerow([owner, self.owner_colors.get(owner, "#FFFFFF"), ready_value])
-            systems_file = os.path.join(full_path, "systems.csv")
-            with open(systems_file, "w", newline="") as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(["Type", "ID", "Current Ships", "Ship Production", "Defense Factor", "Owner", "Grid Position", "Year"])
-                for sys_id, button in self.buttons.items():
-                    writer.writerow([
-                        "System",
-                        sys_id,
-                        button.current_ships,
-                        button.ship_production,
-                        button.defense_factor,
-                        button.owner,
-                        str(button.grid_pos),
-                        self.year
-                    ])
-            fleets_file = os.path.join(full_path, "fleets.csv")
-            with open(fleets_file, "w", newline="") as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(["Type", "Source", "Destination", "Ships", "Turns", "Owner", "Year"])
-                for fleet in self.fleets:
-                    writer.writerow([
-                        "Fleet",
-                        fleet["source"],
-                        fleet["destination"],
-                        fleet["ships"],
-                        fleet["turns"],
-                        fleet["owner"],
-                        fleet["year"]
-                    ])
-            self.current_save_folder = full_path
-            QMessageBox.information(self, "Save Game", f"Game state saved in folder:\n{full_path}")
-        except Exception as e:
-            QMessageBox.warning(self, "Save Error", str(e))
-
-    def refreshGameState(self):
-        if not hasattr(self, "current_save_file") or not self.current_save_file:
-            return
-        try:
-            with open(self.current_save_file, "r", newline="") as csvfile:
-                reader = csv.reader(csvfile)
-                rows = list(reader)
-            sep_index = None
-            for i, row in enumerate(rows):
-                if not any(cell.strip() for cell in row):
-                    sep_index = i
-                    break
-            if sep_index is None:
-                system_rows = rows[1:]
-                fleet_rows = []
-            else:
-                system_rows = rows[2:sep_index]
-                fleet_rows = rows[sep_index+2:] if sep_index+2 < len(rows) else []
-            for sys_row in system_rows:
-                if len(sys_row) >= 8 and sys_row[0] == "System":
-                    sys_id = int(sys_row[1])
-                    if sys_id in self.buttons:
-                        button = self.buttons[sys_id]
-                        button.current_ships = int(sys_row[2])
-                        button.ship_production = int(sys_row[3])
-                        button.defense_factor = float(sys_row[4])
-                        button.owner = sys_row[5]
-                        try:
-                            button.grid_pos = eval(sys_row[6])
-                        except Exception:
-                            button.grid_pos = None
-                        if button.owner == self.player_owner:
-                            button.setStyleSheet(f"background-color: {self.player_color};")
-                        else:
-                            # ensure unowned buttons show black text
-                            button.setStyleSheet("background-color: #FFFFFF; color: #000000;")
-            if system_rows:
-                self.year = int(system_rows[0][7])
-            self.fleets.clear()
-            for fleet_row in fleet_rows:
-                if len(fleet_row) >= 7 and fleet_row[0] == "Fleet":
-                    fleet = {
-                        "source": int(fleet_row[1]),
-                        "destination": int(fleet_row[2]),
-                        "ships": int(fleet_row[3]),
-                        "turns": int(fleet_row[4]),
-                        "owner": fleet_row[5],
-                        "year": int(fleet_row[6])
-                    }
-                    self.fleets.append(fleet)
-            self.recreateGridLayout()
-        except Exception as e:
-            QMessageBox.warning(self, "Refresh Error", str(e))
+        multi = self.multiGrid()
+        if multi is not None:
+            multi.saveGame()
+        else:
+            saveGameDialog(self, self.game)
 
     def readyNextTurn(self):
-        non_ready = [owner for owner in self.owners if owner not in self.ready_set]
+        non_ready = [owner for owner in self.owners if owner not in self.game.ready_set]
         if non_ready:
             current, ok = QInputDialog.getItem(self, "Player Confirmation",
                                                "Select a player confirming readiness:", non_ready, 0, False)
             if ok and current:
-                self.ready_set.add(current)
-                QMessageBox.information(self, "Ready Confirmation",
-                                        f"Player {current} is ready for the next turn.")
-        if len(self.ready_set) == len(self.owners):
-            self.ready_set.clear()
-            self.nextTurn()
+                if self.game.set_ready(current):
+                    QMessageBox.information(self, "Turn Ended", "Production added and fleets processed!")
+                else:
+                    QMessageBox.information(self, "Ready Confirmation",
+                                            f"Player {current} is ready for the next turn.")
 
     def updateInfoLabel(self):
-        galaxy_num = getattr(self, 'galaxy_index', 0)
-        self.info_label.setText(f"Owner: {self.player_owner} | Game Year: {self.year} | Galaxy: {galaxy_num + 1}")
+        self.info_label.setText(f"Owner: {self.player_owner} | Game Year: {self.year} | Galaxy: {self.galaxy_index + 1}")
+
+def newSavePath(prefix="save"):
+    from datetime import datetime
+    timestamp = datetime.now().strftime("%d.%m.%Y_%H%M%S")
+    return os.path.join(SAVE_FOLDER, f"{prefix}_{timestamp}{EXTENSION}")
+
+def saveGameDialog(parent, game):
+    """Write the whole game into a new save file, returns its SaveFile (None on errors)."""
+    save_file = SaveFile(newSavePath())
+    try:
+        save_file.write_snapshot(game)
+    except OSError as e:
+        QMessageBox.warning(parent, "Save Error", str(e))
+        return None
+    QMessageBox.information(parent, "Save Game", f"Game state saved in:\n{save_file.path}")
+    return save_file
+
+def chooseSaveFile(parent):
+    # Old save folders can be converted with: python hotseat_save.py convert <folder>
+    path, _ = QFileDialog.getOpenFileName(parent, "Select Save File", SAVE_FOLDER,
+                                          f"Risiko saves (*{EXTENSION})")
+    return path or None
 
 # New integrated class: MultiGrid combines multiple ButtonGrids and handles arrow key navigation.
 class MultiGrid(QWidget):
-    def __init__(self, grids):
+    def __init__(self, game, player_owner=None, save_file=None):
         super().__init__()
         self.setFocusPolicy(Qt.StrongFocus)  # Accept key events
         self.setFocus()  # Request initial focus
         self.stack = QStackedWidget()
-        self.grids = grids
-
-        # Add each ButtonGrid to the stack
-        for grid in grids:
-            self.stack.addWidget(grid)
+        self.grids = []
+        self.game = None
+        self.save_file = None
+        self.setGame(game, player_owner, save_file)
 
         # Create navigation buttons
         self.prev_button = QPushButton("Previous Galaxy")
@@ -550,6 +399,28 @@ class MultiGrid(QWidget):
         self.stack.setCurrentIndex(0)
         self.grids[0].updateInfoLabel()
 
+    def setGame(self, game, player_owner=None, save_file=None):
+        """
+        Show another game (new or loaded), one ButtonGrid per galaxy. After
+        every turn the changes are appended to save_file (a new autosave file
+        if none is given).
+        """
+        for grid in self.grids:
+            grid.detach()
+            self.stack.removeWidget(grid)
+            grid.deleteLater()
+        if self.game is not None and self.autosave in self.game.listeners:
+            self.game.listeners.remove(self.autosave)
+        self.game = game
+        self.saved_year = game.year
+        self.save_file = save_file or SaveFile(newSavePath("autosave"))
+        game.listeners.append(self.autosave)
+        self.grids = [ButtonGrid(game, index, player_owner) for index in range(len(game.galaxies))]
+        for grid in self.grids:
+            self.stack.addWidget(grid)
+        self.stack.setCurrentIndex(0)
+        self.grids[0].updateInfoLabel()
+
     def showPreviousGalaxy(self):
         current_index = self.stack.currentIndex()
         new_index = (current_index - 1) % self.stack.count()
@@ -590,221 +461,44 @@ class MultiGrid(QWidget):
         else:
             super().keyPressEvent(event)
 
+    def autosave(self, changed):
+        # Only once per turn, the moves in between end up in the same delta
+        if self.game.year == self.saved_year:
+            return
+        self.saved_year = self.game.year
+        try:
+            self.save_file.append_delta(self.game)
+        except OSError as e:
+            QMessageBox.warning(self, "Autosave Error", str(e))
+
     def saveGame(self):
-        from datetime import datetime
-        base_save_folder = os.path.join(os.getcwd(), "saves")
-        if not os.path.exists(base_save_folder):
-            os.makedirs(base_save_folder)
-        timestamp = datetime.now().strftime("%d.%m.%Y_%H%M%S")
-        save_folder = os.path.join(base_save_folder, f"save_{timestamp}")
-        os.makedirs(save_folder)
-        # Save global players info (assumed same for all grids)
-        players_file = os.path.join(save_folder, "players.csv")
-        with open(players_file, "w", newline="") as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(["Owner", "Color"])
-            for owner in self.grids[0].owners:
-                writer.writerow([owner, self.grids[0].owner_colors.get(owner, "#FFFFFF")])
-        # Save each galaxy’s state
-        for idx, grid in enumerate(self.grids):
-            galaxy_folder = os.path.join(save_folder, f"galaxy_{idx}")
-            os.makedirs(galaxy_folder)
-            # Save systems info
-            systems_file = os.path.join(galaxy_folder, "systems.csv")
-            with open(systems_file, "w", newline="") as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(["Type", "ID", "Current Ships", "Ship Production", "Defense Factor", "Owner", "Grid Position", "Year"])
-                for sys_id, button in grid.buttons.items():
-                    writer.writerow(["System", sys_id, button.current_ships, button.ship_production,
-                                     button.defense_factor, button.owner, str(button.grid_pos), grid.year])
-            # Save fleets info
-            fleets_file = os.path.join(galaxy_folder, "fleets.csv")
-            with open(fleets_file, "w", newline="") as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(["Type", "Source", "Destination", "Ships", "Turns", "Owner", "Year"])
-                for fleet in grid.fleets:
-                    writer.writerow(["Fleet", fleet["source"], fleet["destination"], fleet["ships"],
-                                     fleet["turns"], fleet["owner"], fleet["year"]])
-        QMessageBox.information(self, "Save Game", f"Game state saved in folder:\n{save_folder}")
-
-    # New method: Load game state for all galaxies.
+        save_file = saveGameDialog(self, self.game)
+        if save_file is not None:
+            # The autosave continues in the new file
+            self.save_file = save_file
+
     def loadGame(self):
-        global LOAD_FOLDER
-        if LOAD_FOLDER is None:
-            folder = QFileDialog.getExistingDirectory(self, "Select Save Folder", os.getcwd())
-            if not folder:
-                return
-            LOAD_FOLDER = folder
-        else:
-            folder = LOAD_FOLDER
-        # Load global players info
-        players_file = os.path.join(folder, "players.csv")
-        players = []
-        owner_colors = {}
-        try:
-            with open(players_file, "r", newline="") as csvfile:
-                reader = csv.reader(csvfile)
-                next(reader)  # skip header
-                for row in reader:
-                    if len(row) >= 2:
-                        players.append(row[0])
-                        owner_colors[row[0]] = row[1]
-        except Exception as e:
-            QMessageBox.warning(self, "Load Error", f"Failed to load players info: {e}")
+        path = chooseSaveFile(self)
+        if path is None:
             return
-        # Get saved galaxy folders (assumed to be galaxy_0, galaxy_1, …)
-        galaxy_dirs = [d for d in os.listdir(folder) if d.startswith("galaxy_")]
-        galaxy_dirs.sort(key=lambda d: int(d.split("_")[1]))
-        if len(galaxy_dirs) != len(self.grids):
-            QMessageBox.warning(self, "Load Error", "Mismatch in number of saved galaxies versus current game.")
+        try:
+            game, save_file = SaveFile.load(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Load Error", f"Failed to load the game: {e}")
             return
-        # Load each galaxy
-        for idx, d in enumerate(galaxy_dirs):
-            galaxy_folder = os.path.join(folder, d)
-            # Load systems
-            systems_file = os.path.join(galaxy_folder, "systems.csv")
-            try:
-                with open(systems_file, "r", newline="") as csvfile:
-                    reader = csv.reader(csvfile)
-                    next(reader)  # skip header
-                    for row in reader:
-                        if len(row) >= 8 and row[0] == "System":
-                            sys_id = int(row[1])
-                            if sys_id in self.grids[idx].buttons:
-                                button = self.grids[idx].buttons[sys_id]
-                                button.current_ships = int(row[2])
-                                button.ship_production = int(row[3])
-                                button.defense_factor = float(row[4])
-                                button.owner = row[5]
-                                try:
-                                    button.grid_pos = eval(row[6])
-                                except Exception:
-                                    button.grid_pos = None
-                                if button.owner in owner_colors:
-                                    button.setStyleSheet(f"background-color: {owner_colors[button.owner]};")
-                                else:
-                                    # unowned: white + black text
-                                    button.setStyleSheet("background-color: #FFFFFF; color: #000000;")
-                                self.grids[idx].year = int(row[7])
-            except Exception as e:
-                QMessageBox.warning(self, "Load Error", f"Failed to load systems for galaxy {idx}: {e}")
-            # Load fleets
-            fleets_file = os.path.join(galaxy_folder, "fleets.csv")
-            try:
-                with open(fleets_file, "r", newline="") as csvfile:
-                    reader = csv.reader(csvfile)
-                    next(reader)
-                    self.grids[idx].fleets.clear()
-                    for row in reader:
-                        if len(row) >= 7 and row[0] == "Fleet":
-                            fleet = {
-                                "source": int(row[1]),
-                                "destination": int(row[2]),
-                                "ships": int(row[3]),
-                                "turns": int(row[4]),
-                                "owner": row[5],
-                                "year": int(row[6])
-                            }
-                            self.grids[idx].fleets.append(fleet)
-            except Exception as e:
-                QMessageBox.warning(self, "Load Error", f"Failed to load fleets for galaxy {idx}: {e}")
-            self.grids[idx].recreateGridLayout()
+        self.setGame(game, self.grids[self.stack.currentIndex()].player_owner if self.grids else None, save_file)
         QMessageBox.information(self, "Load Game", "Game state loaded successfully.")
 
 def loadGameFromFile():
-    global LOAD_FOLDER
-    if LOAD_FOLDER is None:
-        folder = QFileDialog.getExistingDirectory(None, "Select Save Folder", os.getcwd())
-        if not folder:
-            sys.exit(0)
-        LOAD_FOLDER = folder
-    else:
-        folder = LOAD_FOLDER
-    # Load global players info
-    players_file = os.path.join(folder, "players.csv")
-    players = []
-    owner_colors = {}
+    """Returns (game, save_file), exits if nothing could be loaded."""
+    path = chooseSaveFile(None)
+    if path is None:
+        sys.exit(0)
     try:
-        with open(players_file, "r", newline="") as csvfile:
-            reader = csv.reader(csvfile)
-            next(reader)  # skip header
-            for row in reader:
-                if len(row) >= 2:
-                    players.append(row[0])
-                    owner_colors[row[0]] = row[1]
-    except Exception as e:
-        QMessageBox.warning(None, "Load Error", f"Failed to load players info: {e}")
+        return SaveFile.load(path)
+    except (OSError, ValueError) as e:
+        QMessageBox.warning(None, "Load Error", f"Failed to load the game: {e}")
         sys.exit(0)
-    # Get saved galaxy folders (assumed to be named galaxy_0, galaxy_1, …)
-    galaxy_dirs = [d for d in os.listdir(folder) if d.startswith("galaxy_")]
-    galaxy_dirs.sort(key=lambda d: int(d.split("_")[1]))
-    grids = []
-    for gdir in galaxy_dirs:
-        galaxy_folder = os.path.join(folder, gdir)
-        systems_file = os.path.join(galaxy_folder, "systems.csv")
-        systems_data = []
-        try:
-            with open(systems_file, "r", newline="") as csvfile:
-                reader = csv.reader(csvfile)
-                header = next(reader)  # header line
-                for row in reader:
-                    if len(row) >= 8 and row[0] == "System":
-                        systems_data.append(row)
-        except Exception as e:
-            QMessageBox.warning(None, "Load Error", f"Failed to load systems for {gdir}: {e}")
-            continue
-        # Determine number of systems
-        num_buttons = max(int(row[1]) for row in systems_data) if systems_data else 80
-        # Create a grid for this galaxy using the loaded players
-        grid = ButtonGrid(num_buttons=num_buttons, owners=players)
-        try:
-            grid.year = int(systems_data[0][7])
-        except Exception:
-            grid.year = 1
-        # Update each button's state
-        for row in systems_data:
-            try:
-                sys_id = int(row[1])
-                if sys_id in grid.buttons:
-                    button = grid.buttons[sys_id]
-                    button.current_ships = int(row[2])
-                    button.ship_production = int(row[3])
-                    button.defense_factor = float(row[4])
-                    button.owner = row[5]
-                    try:
-                        button.grid_pos = eval(row[6])
-                    except Exception:
-                        button.grid_pos = None
-                    if button.owner in owner_colors:
-                        button.setStyleSheet(f"background-color: {owner_colors[button.owner]};")
-                    else:
-                        # unowned: white + black text
-                        button.setStyleSheet("background-color: #FFFFFF; color: #000000;")
-            except Exception as e:
-                QMessageBox.warning(None, "Load Error", f"Error in a system row of {gdir}: {e}")
-        # Load fleets data
-        fleets_file = os.path.join(galaxy_folder, "fleets.csv")
-        try:
-            with open(fleets_file, "r", newline="") as csvfile:
-                reader = csv.reader(csvfile)
-                next(reader)  # skip header
-                grid.fleets.clear()
-                for row in reader:
-                    if len(row) >= 7 and row[0] == "Fleet":
-                        fleet = {
-                            "source": int(row[1]),
-                            "destination": int(row[2]),
-                            "ships": int(row[3]),
-                            "turns": int(row[4]),
-                            "owner": row[5],
-                            "year": int(row[6])
-                        }
-                        grid.fleets.append(fleet)
-        except Exception as e:
-            QMessageBox.warning(None, "Load Error", f"Failed to load fleets for {gdir}: {e}")
-        grid.recreateGridLayout()
-        grids.append(grid)
-    return grids
 
 # --- Main block ---
 if __name__ == '__main__':
@@ -843,19 +537,25 @@ if __name__ == '__main__':
     if menu_dialog.exec_() == QDialog.Rejected or choice["option"] == "exit":
         sys.exit(0)
 
-    grids = []
+    save_file = None
     if choice["option"] == "load":
-        grids = loadGameFromFile()
+        game, save_file = loadGameFromFile()
+        chosen_owner = None
     elif choice["option"] == "new":
+        # The defaults come from the selected World Generation preset (worldgen.py)
+        preset = load_worldgen_preset()
+
         # Prompt for number of galaxies
         num_galaxies, ok = QInputDialog.getInt(None, "Galaxies",
-                                               "Enter number of galaxies (button grids):", 1, 1, 10)
+                                               "Enter number of galaxies (button grids):",
+                                               min(max(preset["galaxies"], 1), 10), 1, 10)
         if not ok:
             sys.exit(0)
 
         # Prompt for number of systems per galaxy
         num_systems, ok = QInputDialog.getInt(None, "Systems per Galaxy",
-                                              "Enter number of systems per galaxy:", 80, 10, 200)
+                                              "Enter number of systems per galaxy:",
+                                              min(max(preset["planets"], 10), 1000), 10, 1000)
         if not ok:
             sys.exit(0)
 
@@ -868,7 +568,8 @@ if __name__ == '__main__':
         # Get player names
         players = []
         for i in range(num_players):
-            name, ok = QInputDialog.getText(None, "Player Name", f"Enter name for player {i + 1}:")
+            default_name = preset["owners"][i] if i < len(preset["owners"]) else ""
+            name, ok = QInputDialog.getText(None, "Player Name", f"Enter name for player {i + 1}:", text=default_name)
             if ok and name.strip():
                 players.append(name.strip())
             else:
@@ -879,9 +580,6 @@ if __name__ == '__main__':
                                   "Select your owner (this stays the same across galaxies):", players, 0, False)
         if not ok:
             sys.exit(0)
-        # Update all players so that the human player owner is consistent.
-        # (If needed, you could also mark the chosen_owner in each grid.)
-        # Here we leave players as is but assume the chosen_owner is part of players.
 
         # Precompute an assignment of each owner to one galaxy.
         # For simplicity, if there are at least as many galaxies as players,
@@ -890,21 +588,13 @@ if __name__ == '__main__':
         for i, owner in enumerate(players):
             owner_assignments[owner] = i % num_galaxies
 
-        # Create ButtonGrids (each galaxy)
-        for galaxy_index in range(num_galaxies):
-            grid = ButtonGrid(num_buttons=num_systems, owners=players)
-            grid.galaxy_index = galaxy_index    # <-- Added property
-            grid.player_owner = chosen_owner
-            grid.player_color = grid.owner_colors.get(chosen_owner, "#FFFFFF")
-            grid.assignStartingPlanets(galaxy_index, num_galaxies, owner_assignments)
-            grid.assignPiratePlanets()
-            grids.append(grid)
-
-    # Wrap the grids in MultiGrid
-    main_window = MultiGrid(grids)
-    if choice["option"] == "load":
-        main_window.loadGame()  # call loadGame on the MultiGrid instance
+        game = HotSeatGame.new(num_galaxies, num_systems, players)
+        for owner, galaxy_index, sys_id in game.assign_starting_planets(owner_assignments):
+            QMessageBox.information(None, "Starting Planet Assigned",
+                                    f"System {sys_id} in Galaxy {galaxy_index + 1} is now assigned to {owner}.")
+        game.assign_pirate_planets()
+
+    # One ButtonGrid per galaxy in a MultiGrid
+    main_window = MultiGrid(game, chosen_owner, save_file)
     main_window.showMaximized()
     sys.exit(app.exec_())
-
-
@@ -13,22 +13,32 @@ from datetime import timedelta
 app = Flask(__name__)
 
 # Configuration for the database and JWT
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///game.db'  # Use SQLite for simplicity
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///game.db')  # Use SQLite for simplicity
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['JWT_SECRET_KEY'] = 'your_jwt_secret_key'  # Change this to a secure key
 app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(minutes=180)  # default
+app.config['PUBSUB_URL'] = os.environ.get('PUBSUB_URL')  # e.g. redis://localhost:6379, empty = only this process
+app.config['GALAXY_POOL'] = os.environ.get('GALAXY_POOL') == '1'  # pre-generate galaxies in a background thread
 
 # Initialize extensions
 db.init_app(app)
 jwt = JWTManager(app)
+from utils.ratelimit import limiter
+limiter.init_app(app)
+from utils.events import game_events
+game_events.init_app(app)
+from utils.galaxy_pool import galaxy_pool
+galaxy_pool.init_app(app)
 
 # Import blueprints *after* app and db are set up
 from routes.game import game_bp
 from routes.user import user_bp
+from routes.metrics import metrics_bp
 
 # Register blueprints for routes with /api prefix
 app.register_blueprint(game_bp, url_prefix='/api')
 app.register_blueprint(user_bp, url_prefix='/api')
+app.register_blueprint(metrics_bp, url_prefix='/api')
 
 @app.route('/')
 def home():
@@ -51,12 +61,17 @@ def games_list():
     return render_template('games.html', games=games_data)
 
 if __name__ == '__main__':
-    run_check = input("Check Dependencies (y/n): ").strip().lower()
-    if run_check == 'y':
+    import argparse
+    parser = argparse.ArgumentParser(description="Risiko2Py game server")
+    parser.add_argument("--host", default="0.0.0.0")  # Run the server on all interfaces
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--check-dependencies", action="store_true", help="install/update the dependencies with pip before starting")
+    args = parser.parse_args()
+    if args.check_dependencies:
         dependency_check_script = os.path.abspath(os.path.join(os.path.dirname(__file__), "../check_dependencies.py"))
         subprocess.check_call([sys.executable, dependency_check_script])
     with app.app_context():
         db.create_all()
-    app.run(host='0.0.0.0', port=5000, debug=False)  # Run the server on all interfaces
+    app.run(host=args.host, port=args.port, debug=False)
 
 
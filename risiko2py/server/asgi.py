@@ -0,0 +1,123 @@
+"""
+ASGI entry point for the game server. Run it from this folder with:
+
+    uvicorn asgi:application --host 0.0.0.0 --port 5000
+
+All blueprints of app.py are served through a WSGI adapter with a bounded
+worker pool. Routes that clients keep hitting or keep open (see ASYNC_ROUTES)
+are answered natively with async database access, so an idle connection costs
+a coroutine instead of a thread.
+"""
+import json
+import os
+import re
+from urllib.parse import parse_qs
+from a2wsgi import WSGIMiddleware
+from flask_jwt_extended import decode_token
+
+from app import app
+from database import db
+from database import async_db
+from utils.waiters import game_waiters, wait_response, WAIT_TIMEOUT
+
+# Threads used for the (blocking) Flask views
+WSGI_WORKERS = int(os.environ.get("RISIKO_WSGI_WORKERS", 32))
+
+wsgi_app = WSGIMiddleware(app, workers=WSGI_WORKERS)
+
+async def send_json(send, status, data):
+    await send_body(send, status, json.dumps(data).encode("utf-8"))
+
+async def send_body(send, status, body):
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("ascii"))
+        ]
+    })
+    await send({"type": "http.response.body", "body": body})
+
+def get_identity(scope):
+    """Return the JWT identity of the request or None if the token is missing or invalid."""
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            parts = value.decode("latin1").split(" ")
+            if len(parts) != 2 or parts[0] != "Bearer":
+                return None
+            try:
+                with app.app_context():
+                    return decode_token(parts[1])["sub"]
+            except Exception:
+                return None
+    return None
+
+async def get_game_info(scope, receive, send, game_id):
+    game_state = await async_db.get_game_state(int(game_id))
+    if not game_state:
+        return await send_json(send, 404, {'msg': 'Game not found'})
+    await send_json(send, 200, {
+        'game_id': game_state.id,
+        'players': game_state.players,
+        'state': game_state.state
+    })
+
+async def wait_for_turn(scope, receive, send, game_id):
+    """Async version of the long poll in routes/game.py, a waiting client costs no thread here."""
+    game_id = int(game_id)
+    params = parse_qs(scope["query_string"].decode("latin1"))
+    try:
+        year = int(params["year"][0])
+    except (KeyError, ValueError):
+        return await send_json(send, 400, {'msg': 'Missing year'})
+    try:
+        timeout = min(float(params.get("timeout", [WAIT_TIMEOUT])[0]), WAIT_TIMEOUT)
+    except ValueError:
+        return await send_json(send, 400, {'msg': 'timeout must be a number of seconds'})
+
+    with game_waiters.watch(game_id) as waiter:
+        generation = waiter.generation
+        game_state = await async_db.get_game_state(game_id)
+        if not game_state:
+            return await send_json(send, 404, {'msg': 'Game not found'})
+        state = json.loads(game_state.state)
+        if state.get("year", 1) > year:
+            return await send_json(send, 200, wait_response(game_id, state, json.loads(game_state.players)))
+
+        body = await game_waiters.wait_async(waiter, generation, timeout)
+    if body is None:
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        return await send({"type": "http.response.body", "body": b""})
+    await send_body(send, 200, body)
+
+# (method, path pattern, handler) - all of them need a valid token
+ASYNC_ROUTES = [
+    ("GET", re.compile(r"^/api/game/(\d+)$"), get_game_info),
+    ("GET", re.compile(r"^/api/game/(\d+)/wait$"), wait_for_turn),
+]
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            with app.app_context():
+                db.create_all()
+            async_db.init_async_db(app)
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await async_db.close_async_db()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await lifespan(receive, send)
+    if scope["type"] == "http":
+        for method, pattern, handler in ASYNC_ROUTES:
+            match = pattern.match(scope["path"])
+            if match and scope["method"] == method:
+                if get_identity(scope) is None:
+                    return await send_json(send, 401, {'msg': 'Missing or invalid token'})
+                return await handler(scope, receive, send, *match.groups())
+    await wsgi_app(scope, receive, send)
@@ -0,0 +1,34 @@
+"""
+Async access to the game database, used by the ASGI server (asgi.py).
+It talks to the same database as the Flask app, through SQLAlchemy's asyncio engine.
+"""
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from . import db
+from .models import GameState
+
+# Async driver for each database backend the server supports
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg"
+}
+
+async_engine = None
+async_session = None
+
+def init_async_db(app):
+    global async_engine, async_session
+    with app.app_context():
+        url = db.engine.url
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if not driver:
+        raise RuntimeError(f"No async driver for database backend '{url.get_backend_name()}'")
+    async_engine = create_async_engine(url.set(drivername=driver))
+    async_session = async_sessionmaker(async_engine, expire_on_commit=False)
+
+async def close_async_db():
+    if async_engine is not None:
+        await async_engine.dispose()
+
+async def get_game_state(game_id):
+    async with async_session() as session:
+        return await session.get(GameState, game_id)
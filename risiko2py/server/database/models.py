@@ -34,4 +34,15 @@ class GameState(db.Model):
     state = db.Column(db.Text)    # JSON string: dict with systems, fleets, year, etc.
     created_at = db.Column(db.DateTime, server_default=db.func.now())
 
-    user = db.relationship('User', backref=db.backref('game_states', lazy=True))
\ No newline at end of file
+    user = db.relationship('User', backref=db.backref('game_states', lazy=True))
+
+class ImportedSave(db.Model):
+    """Save folders of the offline game that utils/legacy_import.py already turned into games."""
+    __tablename__ = 'imported_saves'
+
+    id = db.Column(db.Integer, primary_key=True)
+    folder = db.Column(db.String(1024), unique=True, nullable=False)
+    game_id = db.Column(db.Integer, db.ForeignKey('game_states.id', ondelete='CASCADE'), nullable=False)
+    imported_at = db.Column(db.DateTime, server_default=db.func.now())
+
+    game = db.relationship('GameState')
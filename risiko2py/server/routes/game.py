@@ -1,12 +1,25 @@
 import json
-from flask import Blueprint, request, jsonify, render_template
+from flask import Blueprint, Response, request, jsonify, render_template
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from database.models import GameState, User
+from database.models import GameState, User, ImportedSave
 from database import db
 from utils.security import create_game_state, validate_game_state
+from utils.turns import resolve_turn
+from utils.patches import bump_version, make_patch
+from utils.ratelimit import limiter
+from utils.waiters import game_waiters, wait_response, WAIT_TIMEOUT
+from utils.events import game_events, FLEET_LAUNCHED, READINESS_CHANGED, YEAR_ADVANCED, STATE_REPLACED
+from utils.patch_history import patch_history
+from utils.galaxy_gen import generate_galaxies, MAX_SYSTEMS
+from utils.galaxy_pool import galaxy_pool, build_state_json, can_use_templates, PRESETS
+from utils.bots import play_bots, LEVELS
 
 game_bp = Blueprint('game', __name__)
 
+def is_count(value, minimum=1):
+    # JSON numbers only, bools are ints in Python
+    return isinstance(value, int) and not isinstance(value, bool) and value >= minimum
+
 @game_bp.route('/game/start', methods=['POST'])
 @jwt_required()
 def start_game():
@@ -16,8 +29,28 @@ def start_game():
         return jsonify({'msg': 'Missing players data'}), 400
 
     players = data['players']
-    galaxies = data.get('galaxies', 1)
-    planets = data.get('planets', 80)
+    if not isinstance(players, list):
+        return jsonify({'msg': 'players is a list of names'}), 400
+    # Bots fill seats: {"name": level}, names that aren't players yet are added
+    bots = data.get('bots') or {}
+    if not isinstance(bots, dict) or any(not isinstance(level, str) or level not in LEVELS for level in bots.values()):
+        return jsonify({'msg': f"bots is {{name: level}}, the levels are {', '.join(LEVELS)}"}), 400
+    players = players + [name for name in bots if name not in players]
+    preset = PRESETS.get(data.get('preset'), {})
+    galaxies = data.get('galaxies', preset.get('galaxies', 1))
+    planets = data.get('planets', preset.get('planets', 80))
+    # Map size of every galaxy, follows the number of planets if not given
+    rows, cols = data.get('rows'), data.get('cols')
+    seed = data.get('seed')
+    if data.get('preset') is not None and not preset:
+        return jsonify({'msg': f"Unknown preset {data['preset']}"}), 400
+    for name, value in (('galaxies', galaxies), ('planets', planets), ('rows', rows), ('cols', cols)):
+        if not is_count(value) and (value is not None or name in ('galaxies', 'planets')):
+            return jsonify({'msg': f'{name} must be a positive integer'}), 400
+    if seed is not None and not is_count(seed, 0):
+        return jsonify({'msg': 'seed must be a non-negative integer'}), 400
+    if galaxies * planets > MAX_SYSTEMS:
+        return jsonify({'msg': f'Between 1 and {MAX_SYSTEMS} systems per game'}), 400
     user_id = get_jwt_identity()
     player_colors = data.get('colors')
 
@@ -27,71 +60,47 @@ def start_game():
     else:
         owner_colors = {player: "#{:06X}".format(random.randint(0, 0xFFFFFF)) for player in players}
 
-    # --- Generate button coordinates for each galaxy ---
-    rows, cols = 40, 15
-    galaxy_button_coords = {}
-    for galaxy_index in range(galaxies):
-        positions = [(row, col) for row in range(rows) for col in range(cols)]
-        random.shuffle(positions)
-        button_coords = {}
-        for i in range(planets):
-            button_coords[i+1] = positions[i]
-        galaxy_button_coords[galaxy_index] = button_coords
-
-    # --- Assign each player a starting planet in a different galaxy ---
-    # Cycle through galaxies if there are more players than galaxies
-    player_start_planets = {}
-    for idx, player in enumerate(players):
-        galaxy_index = idx % galaxies
-        # Pick a random system in this galaxy for the player
-        system_ids = list(range(1, planets + 1))
-        random.shuffle(system_ids)
-        chosen_sys = system_ids[0]
-        player_start_planets[player] = (galaxy_index, chosen_sys)
-
-    systems = []
-    for galaxy_index in range(galaxies):
-        for sys_id in range(1, planets + 1):
-            owner = None
-            current_ships = 0
-            ship_production = random.randint(1, 10)
-            defense_factor = round(random.uniform(0.7, 1.0), 2)
-            for player, (g_idx, s_id) in player_start_planets.items():
-                if galaxy_index == g_idx and sys_id == s_id:
-                    owner = player
-                    current_ships = 250
-                    ship_production = 10
-                    defense_factor = 1.0
-            coords = galaxy_button_coords[galaxy_index][sys_id]
-            systems.append({
-                "galaxy": galaxy_index,
-                "system_id": sys_id,
-                "owner": owner,
-                "current_ships": current_ships,
-                "ship_production": ship_production,
-                "defense_factor": defense_factor,
-                "coords": coords
-            })
-
     state = {
         "galaxies": galaxies,
         "planets": planets,
-        "systems": systems,
         "fleets": [],
         "year": 1,
-        "button_coords": galaxy_button_coords,
+        "version": 1,
         "owner_colors": owner_colors
     }
+    if rows is None and cols is None and can_use_templates(galaxies, players):
+        # The galaxies come ready from the pool, only the start planets are filled in
+        state_json = build_state_json(galaxy_pool.take(planets, galaxies, seed), players, state)
+    else:
+        try:
+            systems, button_coords = generate_galaxies(galaxies, planets, players, seed=seed, rows=rows, cols=cols)
+        except ValueError as e:
+            return jsonify({'msg': str(e)}), 400
+        state_json = json.dumps(dict(state, systems=systems, button_coords=button_coords))
+
+    stored_players = players
+    if bots:
+        # The bots play their first year right away and are ready
+        stored_players = [{"owner": player, "ready": False, "bot": bots[player]} if player in bots else player
+                          for player in players]
+        state = json.loads(state_json)
+        play_bots(state, stored_players)
+        state_json = json.dumps(state)
+
     game_state = GameState(
         user_id=user_id,
-        players=json.dumps(players),
-        state=json.dumps(state)
+        players=json.dumps(stored_players),
+        state=state_json
     )
     db.session.add(game_state)
     db.session.commit()
 
     return jsonify({'msg': 'Game started', 'game_id': game_state.id}), 201
 
+@game_bp.route('/game/presets', methods=['GET'])
+def get_presets():
+    return jsonify(PRESETS), 200
+
 @game_bp.route('/game/save', methods=['POST'])
 @jwt_required()
 def save_game():
@@ -103,9 +112,14 @@ def save_game():
     if not game_state:
         return jsonify({'msg': 'Game not found'}), 404
 
-    game_state.state = json.dumps(data['state'])
+    # A client save replaces the whole state, so it starts a new version
+    new_state = data['state']
+    new_state["version"] = json.loads(game_state.state).get("version", 0) + 1
+    game_state.state = json.dumps(new_state)
     game_state.players = json.dumps(data['players'])
     db.session.commit()
+    # There is no patch for a replaced state, clients have to load it again
+    game_events.publish(STATE_REPLACED, game_state.id)
 
     return jsonify({'msg': 'Game state saved'}), 200
 
@@ -122,8 +136,33 @@ def get_game_info(game_id):
         'state': game_state.state
     }), 200
 
+@game_bp.route('/game/<int:game_id>/since/<int:version>', methods=['GET'])
+@jwt_required()
+def get_game_since(game_id, version):
+    """
+    Catch up from a version the client has (e.g. cached): the patches since
+    that version, or the full game like /game/<id> if they are not all known.
+    """
+    game_state = GameState.query.get(game_id)
+    if not game_state:
+        return jsonify({'msg': 'Game not found'}), 404
+    state = json.loads(game_state.state)
+    patches = patch_history.since(game_id, version, state.get("version", 0))
+    if patches is None:
+        return jsonify({
+            'game_id': game_state.id,
+            'players': game_state.players,
+            'state': game_state.state
+        }), 200
+    return jsonify({
+        'game_id': game_state.id,
+        'version': state.get("version", 0),
+        'patches': patches
+    }), 200
+
 @game_bp.route('/game/send_fleet', methods=['POST'])
 @jwt_required()
+@limiter.limit("send_fleet")
 def send_fleet():
     data = request.get_json()
     game_id = data.get("game_id")
@@ -139,10 +178,14 @@ def send_fleet():
         return jsonify({'msg': 'Game not found'}), 404
     state = json.loads(game_state.state)
 
-    # Find the galaxy for source and destination systems
+    # Find the galaxy for source and destination systems.
+    # Clients that know the galaxy send it along, system ids repeat per galaxy.
     systems = state["systems"]
-    source_sys = next((s for s in systems if s["system_id"] == source and s["owner"] == owner), None)
-    dest_sys = next((s for s in systems if s["system_id"] == destination), None)
+    galaxy = data.get("galaxy")
+    source_sys = next((s for s in systems if s["system_id"] == source and s["owner"] == owner
+                       and (galaxy is None or s["galaxy"] == galaxy)), None)
+    dest_sys = next((s for s in systems if s["system_id"] == destination
+                     and (galaxy is None or s["galaxy"] == galaxy)), None)
     if not source_sys or not dest_sys:
         return jsonify({'msg': 'Invalid source or destination'}), 400
 
@@ -178,12 +221,17 @@ def send_fleet():
         "dest_galaxy": dest_galaxy
     }
     state.setdefault("fleets", []).append(fleet)
+    bump_version(state)
     game_state.state = json.dumps(state)
     db.session.commit()
-    return jsonify({'state': game_state.state}), 200
+    # Only send back what changed: the source system and the new fleet
+    patch = make_patch(state, systems=[source_sys], new_fleets=[fleet])
+    game_events.publish(FLEET_LAUNCHED, game_id, patch=patch)
+    return jsonify({'patch': patch}), 200
 
 @game_bp.route('/game/ready', methods=['POST'])
 @jwt_required()
+@limiter.limit("ready")
 def player_ready():
     data = request.get_json()
     game_id = data.get("game_id")
@@ -211,53 +259,64 @@ def player_ready():
     # Check if all players are ready
     all_ready = all((p.get("ready") if isinstance(p, dict) else False) for p in players)
     if all_ready:
-        # --- Process fleets ---
-        systems = state["systems"]
-        fleets = state.get("fleets", [])
-        fleets_to_remove = []
-        for fleet in fleets:
-            fleet["turns"] -= 1
-            if fleet["turns"] <= 0:
-                # Find destination system
-                dest = next((s for s in systems if s["system_id"] == fleet["destination"] and s["galaxy"] == systems[0]["galaxy"]), None)
-                if not dest:
-                    continue
-                # If unowned or same owner, add ships and set owner
-                if dest["owner"] == fleet["owner"] or dest["owner"] is None:
-                    dest["current_ships"] += fleet["ships"]
-                    dest["owner"] = fleet["owner"]
-                else:
-                    # Combat: more ships wins
-                    if fleet["ships"] > dest["current_ships"]:
-                        dest["owner"] = fleet["owner"]
-                        dest["current_ships"] = fleet["ships"] - dest["current_ships"]
-                    else:
-                        dest["current_ships"] -= fleet["ships"]
-                fleets_to_remove.append(fleet)
-        # Remove processed fleets
-        state["fleets"] = [f for f in fleets if f not in fleets_to_remove]
-
-        # --- Production phase ---
-        for sys in systems:
-            if sys["owner"]:
-                sys["current_ships"] += sys["ship_production"]
-
-        # --- Advance year ---
-        state["year"] = state.get("year", 1) + 1
+        touched = resolve_turn(state)
 
         # --- Reset readiness ---
         for p in players:
             if isinstance(p, dict):
                 p["ready"] = False
+        # Bots send their fleets for the new year and are ready again
+        bot_systems, _ = play_bots(state, players)
+        touched = list({(s["galaxy"], s["system_id"]): s for s in touched + bot_systems}.values())
+        bump_version(state)
+        patch = make_patch(state, systems=touched, fleets=state["fleets"], players=players)
+    else:
+        bump_version(state)
+        patch = make_patch(state, players=players)
 
     # Save updated state and players
     game_state.state = json.dumps(state)
     game_state.players = json.dumps(players)
     db.session.commit()
-    return jsonify({'state': game_state.state}), 200
+    # Wake everyone waiting for this game in /game/<id>/wait, in every server process
+    game_events.publish(YEAR_ADVANCED if all_ready else READINESS_CHANGED, game_id,
+                        response=wait_response(game_id, state, players, patch))
+    return jsonify({'patch': patch}), 200
+
+@game_bp.route('/game/<int:game_id>/wait', methods=['GET'])
+@jwt_required()
+def wait_for_turn(game_id):
+    """
+    Long poll: answer as soon as the year is past `year` or a player's readiness
+    changed. Answers 204 if nothing happened within the timeout.
+    """
+    year = request.args.get('year', type=int)
+    if year is None:
+        return jsonify({'msg': 'Missing year'}), 400
+    try:
+        timeout = min(float(request.args.get('timeout', WAIT_TIMEOUT)), WAIT_TIMEOUT)
+    except ValueError:
+        return jsonify({'msg': 'timeout must be a number of seconds'}), 400
+
+    with game_waiters.watch(game_id) as waiter:
+        generation = waiter.generation
+        game_state = GameState.query.get(game_id)
+        if not game_state:
+            return jsonify({'msg': 'Game not found'}), 404
+        state = json.loads(game_state.state)
+        if state.get("year", 1) > year:
+            return jsonify(wait_response(game_id, state, json.loads(game_state.players))), 200
+        # Don't hold a database connection while waiting
+        db.session.remove()
+
+        body = game_waiters.wait(waiter, generation, timeout)
+    if body is None:
+        return '', 204
+    return Response(body, status=200, mimetype='application/json')
 
 @game_bp.route('/game/list', methods=['GET'])
 @jwt_required()
+@limiter.limit("list")
 def list_games():
     games = GameState.query.all()
     result = []
@@ -274,8 +333,11 @@ def list_games():
 @jwt_required()
 def delete_all_games():
     # Only allow if the user is an admin or add your own check if needed
+    ImportedSave.query.delete()  # imported save folders can be imported again
     GameState.query.delete()
     db.session.commit()
+    # Game ids can be used again
+    game_events.publish(STATE_REPLACED, None)
     return jsonify({'msg': 'All games deleted.'}), 200
 
 
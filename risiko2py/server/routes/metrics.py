@@ -0,0 +1,14 @@
+import os
+from flask import Blueprint, jsonify
+from utils.ratelimit import limiter
+from utils.galaxy_pool import galaxy_pool
+
+metrics_bp = Blueprint('metrics', __name__)
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    return jsonify({
+        'shard': os.environ.get('RISIKO_SHARD'),
+        'rate_limit': limiter.metrics(),
+        'galaxy_pool': galaxy_pool.stats()
+    }), 200
@@ -1,11 +1,19 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 from database.models import GameState, User
-from utils.security import hash_password, verify_password, create_game_state, validate_game_state
+from utils.security import hash_password, verify_password, create_game_state, validate_game_state, HashingBusy
+from utils.user_cache import user_cache, get_current_user
 from database import db
+from utils.ratelimit import limiter
 
 user_bp = Blueprint('user', __name__)
 
+def busy_response():
+    response = jsonify({"msg": "Server busy, please try again."})
+    response.status_code = 503
+    response.headers["Retry-After"] = "1"
+    return response
+
 @user_bp.route('/user/register', methods=['POST'])
 def register():
     data = request.get_json()
@@ -18,20 +26,29 @@ def register():
     if User.query.filter_by(username=username).first():
         return jsonify({"msg": "Username already exists."}), 400
 
-    hashed_password = hash_password(password)
+    try:
+        hashed_password = hash_password(password)
+    except HashingBusy:
+        return busy_response()
     new_user = User(username=username, password=hashed_password)
     db.session.add(new_user)
     db.session.commit()
+    user_cache.invalidate(str(new_user.id))
     return jsonify({"msg": "User registered successfully."}), 201
 
 @user_bp.route('/user/login', methods=['POST'])
+@limiter.limit("login")
 def login():
     data = request.get_json()
     username = data.get('username')
     password = data.get('password')
 
     user = User.query.filter_by(username=username).first()
-    if not user or not verify_password(user.password, password):
+    try:
+        valid = user is not None and verify_password(user.password, password)
+    except HashingBusy:
+        return busy_response()
+    if not valid:
         return jsonify({"msg": "Invalid credentials."}), 401
 
     access_token = create_access_token(identity=str(user.id))
@@ -40,10 +57,9 @@ def login():
 @user_bp.route('/user', methods=['GET'])
 @jwt_required()
 def get_user():
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = get_current_user()
 
     if user:
-        return jsonify({"username": user.username}), 200
+        return jsonify({"username": user["username"]}), 200
 
     return jsonify({"msg": "User not found."}), 404
\ No newline at end of file
@@ -0,0 +1,37 @@
+import bisect
+import hashlib
+
+class HashRing:
+    """
+    Consistent hashing of game ids onto shards. Every shard gets `replicas`
+    points on the ring, a game belongs to the first point after its own hash.
+    Adding or removing a shard only moves the games next to its points.
+    """
+    def __init__(self, nodes, replicas=100):
+        self.replicas = replicas
+        self.points = []
+        self.nodes = {}
+        for node in nodes:
+            self.add(node)
+
+    @staticmethod
+    def hash(key):
+        return int.from_bytes(hashlib.blake2b(str(key).encode("utf-8"), digest_size=8).digest(), "big")
+
+    def add(self, node):
+        for i in range(self.replicas):
+            point = self.hash(f"{node}#{i}")
+            bisect.insort(self.points, point)
+            self.nodes[point] = node
+
+    def remove(self, node):
+        for i in range(self.replicas):
+            point = self.hash(f"{node}#{i}")
+            self.points.remove(point)
+            del self.nodes[point]
+
+    def node_for(self, key):
+        if not self.points:
+            raise LookupError("No shards on the ring")
+        i = bisect.bisect(self.points, self.hash(key)) % len(self.points)
+        return self.nodes[self.points[i]]
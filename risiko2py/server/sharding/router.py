@@ -0,0 +1,97 @@
+"""
+Thin HTTP router in front of the game shards.
+
+Every request that belongs to a game (/api/game/<id>/..., or a game_id in the
+JSON body of send_fleet, ready and save) goes to the shard that owns the game on
+the hash ring, so a game's in-memory state and its turn processing live in one
+process only. Everything else (login, game list, new games) goes to the shards
+in turn. Usually started by supervisor.py.
+
+    python -m sharding.router --port 5000 --shard http://127.0.0.1:5001 --shard http://127.0.0.1:5002
+"""
+import argparse
+import http.client
+import itertools
+import json
+import re
+import threading
+from urllib.parse import urlparse
+from werkzeug.serving import run_simple
+
+from sharding.hashring import HashRing
+
+GAME_PATH = re.compile(r"^/api/game/(\d+)(/|$)")
+BODY_ROUTES = {"/api/game/send_fleet", "/api/game/ready", "/api/game/save"}
+# Headers that belong to one connection and must not be passed on
+HOP_HEADERS = {"connection", "keep-alive", "transfer-encoding", "te", "trailer", "upgrade",
+               "proxy-authorization", "proxy-authenticate"}
+# Long polls wait up to 25 s on the shard
+SHARD_TIMEOUT = 60
+
+def game_id_for(path, body):
+    match = GAME_PATH.match(path)
+    if match:
+        return int(match.group(1))
+    if path in BODY_ROUTES and body:
+        try:
+            return json.loads(body).get("game_id")
+        except (ValueError, AttributeError):
+            return None
+    return None
+
+class Router:
+    def __init__(self, shard_urls):
+        self.shards = [urlparse(url) for url in shard_urls]
+        self.ring = HashRing(range(len(self.shards)))
+        self.round_robin = itertools.cycle(range(len(self.shards)))
+        self.round_robin_lock = threading.Lock()
+
+    def shard_for(self, game_id):
+        if game_id is None:
+            with self.round_robin_lock:
+                return next(self.round_robin)
+        return self.ring.node_for(game_id)
+
+    def __call__(self, environ, start_response):
+        length = int(environ.get("CONTENT_LENGTH") or 0)
+        body = environ["wsgi.input"].read(length) if length else b""
+        path = environ.get("PATH_INFO", "")
+        shard = self.shards[self.shard_for(game_id_for(path, body))]
+
+        headers = {}
+        for key, value in environ.items():
+            if key.startswith("HTTP_"):
+                name = key[5:].replace("_", "-").lower()
+                if name not in HOP_HEADERS:
+                    headers[name] = value
+        if environ.get("CONTENT_TYPE"):
+            headers["content-type"] = environ["CONTENT_TYPE"]
+        headers["x-forwarded-for"] = environ.get("REMOTE_ADDR", "")
+        target = path
+        if environ.get("QUERY_STRING"):
+            target += "?" + environ["QUERY_STRING"]
+
+        connection = http.client.HTTPConnection(shard.hostname, shard.port, timeout=SHARD_TIMEOUT)
+        try:
+            connection.request(environ["REQUEST_METHOD"], target, body=body or None, headers=headers)
+            response = connection.getresponse()
+            data = response.read()
+        except OSError as e:
+            start_response("502 Bad Gateway", [("Content-Type", "application/json")])
+            return [json.dumps({"msg": f"Shard {shard.netloc} not reachable: {e}"}).encode("utf-8")]
+        finally:
+            connection.close()
+        response_headers = [(k, v) for k, v in response.getheaders() if k.lower() not in HOP_HEADERS]
+        start_response(f"{response.status} {response.reason}", response_headers)
+        return [data]
+
+def main():
+    parser = argparse.ArgumentParser(description="Route game requests to the shard that owns the game.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--shard", action="append", required=True, help="shard URL, in shard order")
+    args = parser.parse_args()
+    run_simple(args.host, args.port, Router(args.shard), threaded=True)
+
+if __name__ == "__main__":
+    main()
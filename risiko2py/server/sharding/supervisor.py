@@ -0,0 +1,138 @@
+"""
+Start the game server as N shards plus the router on this machine.
+Run it from the server folder:
+
+    python -m sharding.supervisor --shards 4 --port 5000
+
+The shards listen on 127.0.0.1 on the ports after --port and share the
+database. Their game events (utils/events.py) go through utils/resp_server.py
+on the port after the last shard, so a turn, a fleet or delete_all on one
+shard reaches the waiters and patch histories of all of them. --pubsub-url
+uses a running Redis instead. Shards that die are started again. Ctrl+C
+stops everything.
+"""
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+SERVER_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+def wait_until_up(url, proc, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"{url} exited with code {proc.returncode}")
+        try:
+            urllib.request.urlopen(url + "/", timeout=1)
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"{url} did not start within {timeout} seconds")
+
+def wait_for_port(port, proc, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"port {port} exited with code {proc.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"port {port} did not open within {timeout} seconds")
+
+class Supervisor:
+    def __init__(self, shards, host, port, pubsub_url=None):
+        self.host = host
+        self.port = port
+        self.shard_ports = [port + 1 + i for i in range(shards)]
+        # None: start utils/resp_server.py for the shards
+        self.pubsub_url = pubsub_url
+        self.pubsub_port = port + 1 + shards
+        self.procs = {}
+
+    def shard_url(self, index):
+        return f"http://127.0.0.1:{self.shard_ports[index]}"
+
+    def start_shard(self, index):
+        env = dict(os.environ, RATE_LIMIT_TRUST_FORWARDED="1", RISIKO_SHARD=str(index),
+                   PUBSUB_URL=self.pubsub_url or f"redis://127.0.0.1:{self.pubsub_port}")
+        env.setdefault("GALAXY_POOL", "1")
+        cmd = [sys.executable, "app.py", "--host", "127.0.0.1",
+               "--port", str(self.shard_ports[index])]
+        proc = subprocess.Popen(cmd, cwd=SERVER_DIR, env=env, stdin=subprocess.DEVNULL)
+        self.procs[f"shard {index}"] = proc
+        wait_until_up(self.shard_url(index), proc)
+
+    def start_pubsub(self):
+        cmd = [sys.executable, "-m", "utils.resp_server", "--host", "127.0.0.1", "--port", str(self.pubsub_port)]
+        proc = subprocess.Popen(cmd, cwd=SERVER_DIR, stdin=subprocess.DEVNULL)
+        self.procs["pubsub"] = proc
+        wait_for_port(self.pubsub_port, proc)
+
+    def start_router(self):
+        cmd = [sys.executable, "-m", "sharding.router", "--host", self.host, "--port", str(self.port)]
+        for index in range(len(self.shard_ports)):
+            cmd += ["--shard", self.shard_url(index)]
+        self.procs["router"] = subprocess.Popen(cmd, cwd=SERVER_DIR, stdin=subprocess.DEVNULL)
+
+    def start(self):
+        if self.pubsub_url is None:
+            self.start_pubsub()
+        # One after the other, so only the first shard creates the database tables
+        for index in range(len(self.shard_ports)):
+            self.start_shard(index)
+        self.start_router()
+        print(f"Router on port {self.port}, shards on ports {self.shard_ports}")
+
+    def watch(self):
+        while True:
+            time.sleep(1)
+            for name, proc in list(self.procs.items()):
+                if proc.poll() is None:
+                    continue
+                print(f"{name} exited with code {proc.returncode}, restarting")
+                if name == "router":
+                    self.start_router()
+                elif name == "pubsub":
+                    # The shards' subscribers reconnect by themselves
+                    self.start_pubsub()
+                else:
+                    self.start_shard(int(name.split()[1]))
+
+    def stop(self):
+        for proc in self.procs.values():
+            if proc.poll() is None:
+                proc.terminate()
+        for proc in self.procs.values():
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the game server as shards behind a router.")
+    parser.add_argument("--shards", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--host", default="0.0.0.0", help="address of the router")
+    parser.add_argument("--port", type=int, default=5000, help="router port, shards use the ports after it")
+    parser.add_argument("--pubsub-url", default=os.environ.get("PUBSUB_URL"),
+                        help="redis://host:port for the game events, default: start utils/resp_server.py")
+    args = parser.parse_args()
+
+    supervisor = Supervisor(args.shards, args.host, args.port, args.pubsub_url)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        supervisor.start()
+        supervisor.watch()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        supervisor.stop()
+
+if __name__ == "__main__":
+    main()
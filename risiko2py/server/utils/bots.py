@@ -0,0 +1,167 @@
+"""
+Bot players.
+
+A bot is a player dict with "bot": <level> (see LEVELS). Bots play when a
+year begins, at /game/start and after every resolved turn: each bot scores
+targets for its systems, sends its fleets in one batch straight into the
+state and is ready right away. A game of bots only is advanced by calling
+/game/ready for any of them (benchmarks/bot_load.py uses that as a load
+generator).
+
+Scoring works on numpy arrays of a galaxy, built once per game and year and
+shared by all bots of the game. For a bot the distance table between its
+source systems and the candidate targets is computed at once, the levels
+differ in how big that table is and how much they look at.
+"""
+import math
+import numpy as np
+
+# sources: own systems that may send (the ones with the most ships)
+# targets: candidate targets per galaxy, None = every system
+# orders: fleets per year and galaxy, keep: share of ships that stays home
+# incoming: count fleets already underway to the targets
+LEVELS = {
+    "easy": {"sources": 3, "targets": 24, "orders": 1, "keep": 0.5, "incoming": False},
+    "normal": {"sources": 12, "targets": 200, "orders": 3, "keep": 0.4, "incoming": False},
+    "hard": {"sources": None, "targets": None, "orders": 8, "keep": 0.25, "incoming": True}
+}
+DEFAULT_LEVEL = "normal"
+MIN_FLEET = 6
+# A target needs this many more ships than it will have on arrival
+MARGIN = 1.2
+
+def fleet_turns(distance):
+    # Same as /game/send_fleet
+    return max(1, int(round(distance)))
+
+def is_bot(player):
+    return isinstance(player, dict) and player.get("bot") is not None
+
+class GalaxyArrays:
+    """The systems of one galaxy as arrays, index i is systems[i]."""
+    def __init__(self, systems, coords):
+        self.systems = systems
+        self.index = {system["system_id"]: i for i, system in enumerate(systems)}
+        self.rows = np.array([pos[0] for pos in coords], dtype=np.float64)
+        self.cols = np.array([pos[1] for pos in coords], dtype=np.float64)
+        self.owners = np.array([system["owner"] or "" for system in systems], dtype=object)
+        self.ships = np.array([system["current_ships"] for system in systems], dtype=np.float64)
+        self.production = np.array([system["ship_production"] for system in systems], dtype=np.float64)
+        self.fleets = []  # fleets underway to this galaxy
+
+class BotView:
+    """Arrays of every galaxy of a game, for all bots of one year."""
+    def __init__(self, state):
+        button_coords = state.get("button_coords", {})
+        by_galaxy = {}
+        for system in state["systems"]:
+            # Older states only have the positions in button_coords
+            pos = system.get("coords") or button_coords.get(str(system["galaxy"]), {}).get(str(system["system_id"]))
+            if pos is not None:
+                systems, coords = by_galaxy.setdefault(system["galaxy"], ([], []))
+                systems.append(system)
+                coords.append(pos)
+        self.galaxies = {galaxy: GalaxyArrays(systems, coords) for galaxy, (systems, coords) in by_galaxy.items()}
+        for fleet in state.get("fleets", []):
+            arrays = self.galaxies.get(fleet.get("dest_galaxy"))
+            if arrays is not None and fleet["destination"] in arrays.index:
+                arrays.fleets.append(fleet)
+
+    def incoming(self, arrays, owner):
+        """Own ships minus other ships that are underway to every system."""
+        incoming = np.zeros(len(arrays.systems))
+        for fleet in arrays.fleets:
+            sign = 1 if fleet["owner"] == owner else -1
+            incoming[arrays.index[fleet["destination"]]] += sign * fleet["ships"]
+        return incoming
+
+def plan_orders(view, owner, level, rng):
+    """The fleets the bot sends this year: [(galaxy, source system, destination system, ships)]."""
+    config = LEVELS.get(level, LEVELS[DEFAULT_LEVEL])
+    orders = []
+    for galaxy, arrays in view.galaxies.items():
+        own = np.flatnonzero((arrays.owners == owner) & (arrays.ships >= MIN_FLEET / (1 - config["keep"])))
+        if own.size == 0:
+            continue
+        if config["sources"] is not None and own.size > config["sources"]:
+            own = own[np.argsort(-arrays.ships[own])[:config["sources"]]]
+        targets = np.flatnonzero(arrays.owners != owner)
+        if targets.size == 0:
+            continue
+        if config["targets"] is not None and targets.size > config["targets"]:
+            targets = rng.choice(targets, size=config["targets"], replace=False)
+
+        # Distance table sources x targets
+        distance = np.hypot(arrays.rows[own, None] - arrays.rows[None, targets],
+                            arrays.cols[own, None] - arrays.cols[None, targets])
+        turns = np.maximum(1, np.round(distance))
+        # Owned targets keep producing until the fleet arrives, unowned ones don't
+        grows = arrays.owners[targets] != ""
+        defenders = arrays.ships[targets][None, :] + np.where(grows, arrays.production[targets], 0)[None, :] * turns
+        if config["incoming"]:
+            defenders = defenders - view.incoming(arrays, owner)[targets][None, :]
+        needed = np.maximum(MIN_FLEET, np.ceil(np.maximum(defenders, 0) * MARGIN + 1))
+        available = np.floor(arrays.ships[own] * (1 - config["keep"]))
+        # Production gained per ship sent and turn waited
+        score = arrays.production[targets][None, :] / (needed * turns)
+        score[needed > available[:, None]] = -np.inf
+
+        sent_from = {}
+        taken = set()
+        for flat in np.argsort(-score, axis=None)[:config["orders"] * 4]:
+            s, t = divmod(int(flat), targets.size)
+            if not np.isfinite(score[s, t]) or len(taken) >= config["orders"]:
+                break
+            source, target = int(own[s]), int(targets[t])
+            ships = int(needed[s, t])
+            if target in taken or sent_from.get(source, 0) + ships > available[s]:
+                continue
+            taken.add(target)
+            sent_from[source] = sent_from.get(source, 0) + ships
+            orders.append((galaxy, source, target, ships))
+    return orders
+
+def apply_orders(view, owner, orders):
+    """Send the planned fleets in one go. Returns (changed systems, new fleets)."""
+    changed, fleets = {}, []
+    for galaxy, source, target, ships in orders:
+        arrays = view.galaxies[galaxy]
+        source_sys, dest_sys = arrays.systems[source], arrays.systems[target]
+        if source_sys["owner"] != owner or source_sys["current_ships"] < ships:
+            continue
+        source_sys["current_ships"] -= ships
+        arrays.ships[source] -= ships
+        distance = math.hypot(arrays.rows[source] - arrays.rows[target], arrays.cols[source] - arrays.cols[target])
+        fleet = {
+            "source": source_sys["system_id"],
+            "destination": dest_sys["system_id"],
+            "ships": ships,
+            "owner": owner,
+            "turns": fleet_turns(distance),
+            "source_galaxy": galaxy,
+            "dest_galaxy": galaxy
+        }
+        fleets.append(fleet)
+        arrays.fleets.append(fleet)
+        changed[(galaxy, source_sys["system_id"])] = source_sys
+    return list(changed.values()), fleets
+
+def play_bots(state, players, seed=None):
+    """
+    Every bot that isn't ready yet sends its fleets and gets ready. Returns
+    (changed systems, new fleets), the fleets are already in state["fleets"].
+    """
+    bots = [player for player in players if is_bot(player) and not player.get("ready")]
+    if not bots:
+        return [], []
+    rng = np.random.default_rng(seed)
+    view = BotView(state)
+    changed, new_fleets = {}, []
+    for player in bots:
+        systems, fleets = apply_orders(view, player["owner"], plan_orders(view, player["owner"], player["bot"], rng))
+        for system in systems:
+            changed[(system["galaxy"], system["system_id"])] = system
+        new_fleets += fleets
+        player["ready"] = True
+    state.setdefault("fleets", []).extend(new_fleets)
+    return list(changed.values()), new_fleets
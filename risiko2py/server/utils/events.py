@@ -0,0 +1,59 @@
+"""
+Game events, published through utils/pubsub.py so every server process sees them.
+An event is a dict with "type", "game_id" and event specific data.
+"""
+import logging
+import threading
+from utils.pubsub import LocalPubSub, create_pubsub
+
+GAME_EVENTS_CHANNEL = "risiko:game_events"
+
+YEAR_ADVANCED = "year_advanced"          # data: response (see utils/waiters.py)
+READINESS_CHANGED = "readiness_changed"  # data: response
+FLEET_LAUNCHED = "fleet_launched"        # data: patch
+STATE_REPLACED = "state_replaced"        # no data, game_id None for all games
+
+logger = logging.getLogger(__name__)
+
+class GameEvents:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.callbacks = []
+        self.pubsub = None
+        self.use(LocalPubSub())
+
+    def init_app(self, app):
+        self.use(create_pubsub(app.config.get("PUBSUB_URL")))
+
+    def use(self, pubsub):
+        if self.pubsub is not None:
+            self.pubsub.close()
+        self.pubsub = pubsub
+        pubsub.subscribe(GAME_EVENTS_CHANNEL, self.dispatch)
+
+    def publish(self, event_type, game_id, **data):
+        """
+        Called after the change is committed, so it never raises: if the pubsub
+        can't be reached the event is logged and only this process sees it.
+        """
+        event = dict(data, type=event_type, game_id=game_id)
+        try:
+            self.pubsub.publish(GAME_EVENTS_CHANNEL, event)
+        except Exception:
+            logger.exception("publishing %s of game %s failed", event_type, game_id)
+            self.dispatch(event)
+
+    def subscribe(self, callback):
+        with self.lock:
+            self.callbacks.append(callback)
+
+    def dispatch(self, event):
+        with self.lock:
+            callbacks = list(self.callbacks)
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception:
+                logger.exception("game event callback for %s failed", event.get("type"))
+
+game_events = GameEvents()
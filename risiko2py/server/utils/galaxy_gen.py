@@ -0,0 +1,146 @@
+"""
+Generates the galaxies of a new game (used by /game/start).
+
+Positions, production and defense of every system are drawn at once with
+numpy, one array per value for all galaxies. Start planets are drawn per
+galaxy without repeats and looked up by (galaxy, system_id), so the cost does
+not grow with the number of players.
+
+Positions come from a jittered grid: the map is cut into 2 x 2 blocks, every
+system gets a block of its own and a random cell in it. The block grid is the
+spatial hash for the neighbour check: systems whose cells touch a system in
+one of the 8 blocks around them draw a new cell, a few rounds for all
+galaxies at once. Maps too small for one block per system fall back to
+random cells.
+"""
+import math
+import numpy as np
+
+ROWS, COLS = 40, 15
+# 600 cells for the default 80 planets, bigger maps keep that density
+CELLS_PER_SYSTEM = ROWS * COLS / 80
+MAX_SYSTEMS = 100_000  # per game, all galaxies together
+# Cells per game, custom rows and cols may leave room around the systems
+MAX_CELLS = int(4 * MAX_SYSTEMS * CELLS_PER_SYSTEM)
+BLOCK = 2
+# Cells closer than this (squared) count as touching: left, right, above, below
+MIN_DISTANCE_SQ = 2
+JITTER_ROUNDS = 20
+
+# Values of a player's start planet
+START_SHIPS = 250
+START_PRODUCTION = 10
+START_DEFENSE = 1.0
+
+def map_size(planets):
+    """Rows and columns of a galaxy: 40 x 15, scaled up (same shape) for more planets."""
+    scale = math.sqrt(max(1.0, planets * CELLS_PER_SYSTEM / (ROWS * COLS)))
+    return math.ceil(ROWS * scale), math.ceil(COLS * scale)
+
+def place_systems(rng, galaxies, planets, rows, cols):
+    """Returns (row, col) arrays of shape (galaxies, planets), distinct cells per galaxy."""
+    block_rows, block_cols = -(-rows // BLOCK), -(-cols // BLOCK)
+    if planets > block_rows * block_cols:
+        cells = np.argsort(rng.random((galaxies, rows * cols)), axis=1)[:, :planets]
+        return cells // cols, cells % cols
+
+    blocks = np.argsort(rng.random((galaxies, block_rows * block_cols)), axis=1)[:, :planets]
+    block_r = blocks // block_cols + 1  # +1 for the empty border of the hash
+    block_c = blocks % block_cols + 1
+    galaxy = np.arange(galaxies)[:, None]
+
+    def jitter(block, size, count):
+        # The last block row/column is cut off if rows/cols are odd
+        return np.minimum((block - 1) * BLOCK + rng.integers(0, BLOCK, size=count), size - 1)
+
+    galaxy = np.broadcast_to(galaxy, blocks.shape).ravel()
+    block_r, block_c = block_r.ravel(), block_c.ravel()
+    pos_r = jitter(block_r, rows, block_r.size)
+    pos_c = jitter(block_c, cols, block_c.size)
+    # Spatial hash: the cell of the system in every block, far away for empty blocks
+    hash_r = np.full((galaxies, block_rows + 2, block_cols + 2), -BLOCK * 4)
+    hash_c = np.full_like(hash_r, -BLOCK * 4)
+    hash_r[galaxy, block_r, block_c] = pos_r
+    hash_c[galaxy, block_r, block_c] = pos_c
+    # Systems that still have to be checked, at first all of them
+    check = np.arange(block_r.size)
+    for _ in range(JITTER_ROUNDS):
+        g, br, bc = galaxy[check], block_r[check], block_c[check]
+        touching = np.zeros(check.size, dtype=bool)
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                if dr or dc:
+                    near_r = hash_r[g, br + dr, bc + dc] - pos_r[check]
+                    near_c = hash_c[g, br + dr, bc + dc] - pos_c[check]
+                    touching |= near_r ** 2 + near_c ** 2 < MIN_DISTANCE_SQ
+        check = check[touching]
+        if not check.size:
+            break
+        # Only the systems that were checked move, the cells stay distinct (one
+        # system per block), the next round checks the moved ones again
+        pos_r[check] = jitter(block_r[check], rows, check.size)
+        pos_c[check] = jitter(block_c[check], cols, check.size)
+        hash_r[galaxy[check], block_r[check], block_c[check]] = pos_r[check]
+        hash_c[galaxy[check], block_r[check], block_c[check]] = pos_c[check]
+    return pos_r.reshape(blocks.shape), pos_c.reshape(blocks.shape)
+
+def pick_start_planets(rng, galaxies, planets, players):
+    """
+    Every player gets a planet in galaxy index % galaxies, players that share
+    a galaxy get different planets. Returns {(galaxy, system_id): player}.
+    """
+    by_galaxy = {}
+    for idx, player in enumerate(players):
+        by_galaxy.setdefault(idx % galaxies, []).append(player)
+    start_planets = {}
+    for galaxy, galaxy_players in by_galaxy.items():
+        count = min(len(galaxy_players), planets)
+        ids = rng.choice(planets, size=count, replace=False) + 1
+        for player, sys_id in zip(galaxy_players, ids.tolist()):
+            start_planets[(galaxy, sys_id)] = player
+    return start_planets
+
+def generate_galaxies(galaxies, planets, players, seed=None, rows=None, cols=None):
+    """
+    Returns (systems, button_coords): the system dicts of the game state and
+    {galaxy: {system_id: (row, col)}}. Without rows and cols the map size
+    follows the number of planets (map_size). Raises ValueError for more
+    than MAX_SYSTEMS systems or MAX_CELLS cells, or if the planets don't fit.
+    """
+    if galaxies * planets > MAX_SYSTEMS:
+        raise ValueError(f"Between 1 and {MAX_SYSTEMS} systems per game")
+    if rows is None or cols is None:
+        rows, cols = map_size(planets)
+    if galaxies * rows * cols > MAX_CELLS:
+        raise ValueError(f"At most {MAX_CELLS} cells per game")
+    if planets > rows * cols:
+        raise ValueError(f"{planets} planets don't fit on {rows} x {cols} cells")
+    rng = np.random.default_rng(seed)
+    pos_r, pos_c = place_systems(rng, galaxies, planets, rows, cols)
+    cell_rows = pos_r.tolist()
+    cell_cols = pos_c.tolist()
+    production = rng.integers(1, 11, size=(galaxies, planets)).tolist()
+    defense = np.round(rng.uniform(0.7, 1.0, size=(galaxies, planets)), 2).tolist()
+    start_planets = pick_start_planets(rng, galaxies, planets, players)
+
+    systems = []
+    button_coords = {}
+    for galaxy in range(galaxies):
+        coords = list(zip(cell_rows[galaxy], cell_cols[galaxy]))
+        button_coords[galaxy] = dict(zip(range(1, planets + 1), coords))
+        systems += [{
+            "galaxy": galaxy,
+            "system_id": i + 1,
+            "owner": None,
+            "current_ships": 0,
+            "ship_production": production[galaxy][i],
+            "defense_factor": defense[galaxy][i],
+            "coords": coords[i]
+        } for i in range(planets)]
+    for (galaxy, sys_id), player in start_planets.items():
+        system = systems[galaxy * planets + sys_id - 1]
+        system["owner"] = player
+        system["current_ships"] = START_SHIPS
+        system["ship_production"] = START_PRODUCTION
+        system["defense_factor"] = START_DEFENSE
+    return systems, button_coords
@@ -0,0 +1,184 @@
+"""
+Pre-generated galaxies for /game/start.
+
+A template is one galaxy generated by utils/galaxy_gen.py for a number of
+planets and a seed, already as JSON text. /game/start takes templates out of
+the pool and only fills in the galaxy index, the start planets and the
+colors (the state is joined from text, not built and dumped). Templates the
+pool doesn't have are generated in the request.
+
+The pool is off unless the app config has GALAXY_POOL (the environment
+variable GALAXY_POOL=1, the shards of sharding/supervisor.py set it), so
+tools and benchmarks that import the app don't generate galaxies. When it is
+on, a background thread keeps a few templates ready per planet count of the
+presets and of the last other planet counts asked for, and refills after
+every take. Games with more galaxies than that still generate the rest.
+
+A game with a seed is the same map every time: its templates are
+(planets, seed + galaxy) and are kept in a small cache instead of being
+taken out of the pool.
+"""
+import json
+import random
+import threading
+from collections import OrderedDict, deque
+from utils.galaxy_gen import generate_galaxies, START_SHIPS, START_PRODUCTION, START_DEFENSE
+
+# Named game sizes, /game/start takes "preset" instead of galaxies and planets.
+# worldgen.py offers the same ones for the hot-seat game (BUILTIN_PRESETS).
+PRESETS = {
+    "small": {"galaxies": 1, "planets": 40},
+    "classic": {"galaxies": 1, "planets": 80},
+    "large": {"galaxies": 5, "planets": 300},
+    "huge": {"galaxies": 20, "planets": 1000},
+    "epic": {"galaxies": 100, "planets": 1000}
+}
+# Systems per template that can become a start planet, more players in one
+# galaxy are generated directly (see can_use_templates)
+START_SLOTS = 16
+SEEDED_CACHE_SIZE = 256
+# Templates kept ready per planet count
+POOL_TARGET = 8
+# Planet counts other than the presets' that get templates too, the oldest is dropped
+EXTRA_SIZES = 4
+# Galaxy index of the template systems, the text is cut at every "galaxy" value
+TEMPLATE_GALAXY = -1
+
+class GalaxyTemplate:
+    """One galaxy as JSON text, the start slots are kept apart as dicts."""
+    __slots__ = ("planets", "seed", "systems_parts", "start_slots", "coords_text")
+
+    def __init__(self, planets, seed):
+        self.planets = planets
+        self.seed = seed
+        systems, button_coords = generate_galaxies(1, planets, [], seed=seed)
+        for system in systems:
+            system["galaxy"] = TEMPLATE_GALAXY
+        # Random systems of the galaxy, they go to the end of its system list
+        slot_ids = set(random.Random(seed).sample(range(1, planets + 1), min(START_SLOTS, planets)))
+        self.start_slots = [system for system in systems if system["system_id"] in slot_ids]
+        rest = [system for system in systems if system["system_id"] not in slot_ids]
+        # The text around the galaxy values, systems_json puts the index in between
+        galaxy_text = json.dumps({"galaxy": TEMPLATE_GALAXY})[1:-1]
+        self.systems_parts = json.dumps(rest)[1:-1].split(galaxy_text)
+        if len(self.systems_parts) != len(rest) + 1:
+            raise ValueError(f"{galaxy_text} found {len(self.systems_parts) - 1} times for {len(rest)} systems")
+        self.coords_text = json.dumps(button_coords[0])
+
+    def systems_json(self, galaxy, players):
+        """The systems of this galaxy as JSON list items, players get the first start slots."""
+        slots = []
+        for i, system in enumerate(self.start_slots):
+            system = dict(system, galaxy=galaxy)
+            if i < len(players):
+                system.update(owner=players[i], current_ships=START_SHIPS,
+                              ship_production=START_PRODUCTION, defense_factor=START_DEFENSE)
+            slots.append(system)
+        text = json.dumps({"galaxy": galaxy})[1:-1].join(self.systems_parts)
+        return ", ".join(part for part in (text, json.dumps(slots)[1:-1]) if part)
+
+def can_use_templates(galaxies, players):
+    # Players are spread over the galaxies like pick_start_planets does
+    return -(-len(players) // galaxies) <= START_SLOTS
+
+def build_state_json(templates, players, state):
+    """
+    The game state as JSON text: `state` with the systems and button_coords
+    of the templates, the players on start slots of galaxy index % galaxies.
+    """
+    by_galaxy = {}
+    for idx, player in enumerate(players):
+        by_galaxy.setdefault(idx % len(templates), []).append(player)
+    systems = ", ".join(template.systems_json(galaxy, by_galaxy.get(galaxy, []))
+                        for galaxy, template in enumerate(templates))
+    coords = ", ".join(f'"{galaxy}": {template.coords_text}' for galaxy, template in enumerate(templates))
+    text = json.dumps(dict(state, systems=None, button_coords=None))
+    return text.replace('"systems": null', f'"systems": [{systems}]', 1) \
+               .replace('"button_coords": null', f'"button_coords": {{{coords}}}', 1)
+
+class GalaxyPool:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.templates = {}  # planets -> deque of GalaxyTemplate
+        self.targets = {}    # planets -> templates to keep ready
+        self.extra = deque()  # planet counts in targets that are no preset
+        self.seeded = OrderedDict()  # (planets, seed) -> GalaxyTemplate
+        self.wanted = threading.Event()
+        self.thread = None
+        self.misses = 0
+
+    def init_app(self, app):
+        if not app.config.get("GALAXY_POOL"):
+            return
+        for preset in PRESETS.values():
+            self.targets[preset["planets"]] = POOL_TARGET
+        self.thread = threading.Thread(target=self.fill, daemon=True)
+        self.thread.start()
+        self.wanted.set()
+
+    def fill(self):
+        # Background thread: refill whatever was taken, then wait for the next take
+        while True:
+            self.wanted.wait()
+            self.wanted.clear()
+            with self.lock:
+                targets = list(self.targets.items())
+            for planets, target in targets:
+                while True:
+                    with self.lock:
+                        if len(self.templates.get(planets, ())) >= self.targets.get(planets, 0):
+                            break
+                    template = GalaxyTemplate(planets, random.getrandbits(32))
+                    with self.lock:
+                        # Dropped by keep_ready while this one was generated
+                        if planets not in self.targets:
+                            break
+                        self.templates.setdefault(planets, deque()).append(template)
+
+    def take(self, planets, count, seed=None):
+        """`count` templates with `planets` planets, generated here if the pool has too few."""
+        if seed is not None:
+            return [self.seeded_template(planets, seed + i) for i in range(count)]
+        with self.lock:
+            ready = self.templates.get(planets, deque())
+            taken = [ready.popleft() for _ in range(min(count, len(ready)))]
+            if len(taken) < count:
+                self.misses += 1
+            if self.thread is not None and planets not in self.targets:
+                self.keep_ready(planets)
+        if len(taken) < count:
+            taken += [GalaxyTemplate(planets, random.getrandbits(32)) for _ in range(count - len(taken))]
+        if self.thread is not None:
+            self.wanted.set()
+        return taken
+
+    def keep_ready(self, planets):
+        # With the lock held: pool templates for a planet count that is no preset
+        self.targets[planets] = POOL_TARGET
+        self.extra.append(planets)
+        if len(self.extra) > EXTRA_SIZES:
+            dropped = self.extra.popleft()
+            del self.targets[dropped]
+            self.templates.pop(dropped, None)
+
+    def seeded_template(self, planets, seed):
+        key = (planets, seed)
+        with self.lock:
+            template = self.seeded.get(key)
+            if template is not None:
+                self.seeded.move_to_end(key)
+                return template
+        template = GalaxyTemplate(planets, seed)
+        with self.lock:
+            self.seeded[key] = template
+            while len(self.seeded) > SEEDED_CACHE_SIZE:
+                self.seeded.popitem(last=False)
+        return template
+
+    def stats(self):
+        with self.lock:
+            return {"enabled": self.thread is not None,
+                    "ready": {planets: len(ready) for planets, ready in self.templates.items()},
+                    "targets": dict(self.targets), "misses": self.misses}
+
+galaxy_pool = GalaxyPool()
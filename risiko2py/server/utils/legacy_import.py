@@ -0,0 +1,197 @@
+"""
+Import the save folders of the offline game (old_game.py) as server games.
+Run it from the server folder:
+
+    python -m utils.legacy_import --user alice ../saves
+
+Every argument is a save folder (players.csv + galaxy_<n>/systems.csv and
+fleets.csv) or a folder with save folders in it. The CSVs are parsed in a
+process pool, the games are inserted in batches, one transaction per batch.
+Imported folders are remembered in the imported_saves table and skipped the
+next time, folders that failed are reported and tried again.
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+_GRID_POS = re.compile(r"^\s*[\(\[]\s*(-?\d+)\s*,\s*(-?\d+)\s*[\)\]]\s*$")
+_GALAXY_DIR = re.compile(r"galaxy_(\d+)")
+
+def is_save_folder(path):
+    return os.path.isfile(os.path.join(path, "players.csv"))
+
+def find_save_folders(paths):
+    folders = []
+    for path in paths:
+        path = os.path.abspath(path)
+        if is_save_folder(path):
+            folders.append(path)
+        elif os.path.isdir(path):
+            folders += sorted(entry.path for entry in os.scandir(path)
+                              if entry.is_dir() and is_save_folder(entry.path))
+    return folders
+
+def read_rows(path):
+    # Streams the rows after the header
+    with open(path, "r", newline="") as csvfile:
+        reader = csv.reader(csvfile)
+        next(reader, None)
+        yield from reader
+
+def parse_save_folder(folder):
+    """
+    Turn one save folder into the server's (players, state), both as JSON
+    strings so the result is cheap to send back from the worker process.
+    Returns (folder, players, state, system count) or (folder, error).
+    """
+    try:
+        players, owner_colors = [], {}
+        for row in read_rows(os.path.join(folder, "players.csv")):
+            if len(row) >= 2:
+                players.append({"owner": row[0], "ready": len(row) >= 3 and row[2] == "True"})
+                owner_colors[row[0]] = row[1]
+
+        galaxy_dirs = sorted((int(match.group(1)), name) for name in os.listdir(folder)
+                             for match in [_GALAXY_DIR.fullmatch(name)] if match)
+        if not galaxy_dirs:
+            raise ValueError("no galaxy_<n> folders")
+        systems, fleets, button_coords = [], [], {}
+        year, planets = 1, 0
+        # The folders can skip numbers, the server counts galaxies from 0
+        for galaxy, (_, name) in enumerate(galaxy_dirs):
+            coords = button_coords[str(galaxy)] = {}
+            used = set()
+            missing = []
+            for row in read_rows(os.path.join(folder, name, "systems.csv")):
+                if len(row) < 8 or row[0] != "System":
+                    continue
+                match = _GRID_POS.match(row[6])
+                pos = [int(match.group(1)), int(match.group(2))] if match else None
+                system = {
+                    "galaxy": galaxy,
+                    "system_id": int(row[1]),
+                    "owner": None if row[5] in ("", "None") else row[5],
+                    "current_ships": int(row[2]),
+                    "ship_production": int(row[3]),
+                    "defense_factor": float(row[4]),
+                    "coords": pos
+                }
+                systems.append(system)
+                if pos is None:
+                    missing.append(system)
+                else:
+                    used.add(tuple(pos))
+                    coords[str(system["system_id"])] = pos
+                year = int(row[7])
+            # Systems without a readable position get a free cell, like the offline game does
+            free = ([row, col] for row in range(40) for col in range(15) if (row, col) not in used)
+            for system in missing:
+                system["coords"] = coords[str(system["system_id"])] = next(free)
+            planets = max(planets, len(coords))
+
+            fleets_file = os.path.join(folder, name, "fleets.csv")
+            if os.path.exists(fleets_file):
+                for row in read_rows(fleets_file):
+                    if len(row) >= 7 and row[0] == "Fleet":
+                        fleets.append({"source": int(row[1]), "destination": int(row[2]),
+                                       "ships": int(row[3]), "owner": row[5], "turns": int(row[4]),
+                                       "source_galaxy": galaxy, "dest_galaxy": galaxy})
+        state = {
+            "galaxies": len(galaxy_dirs),
+            "planets": planets,
+            "systems": systems,
+            "fleets": fleets,
+            "year": year,
+            "version": 1,
+            "button_coords": button_coords,
+            "owner_colors": owner_colors
+        }
+        return folder, json.dumps(players), json.dumps(state), len(systems)
+    except (OSError, ValueError, IndexError, StopIteration) as e:
+        return folder, f"{type(e).__name__}: {e}"
+
+def import_folders(folders, user_id, workers=None, batch_size=50):
+    """Returns (imported, failed) counts, prints progress after every batch."""
+    from database import db
+    from database.models import GameState, ImportedSave
+
+    imported = failed = systems_total = 0
+    batch = []
+    started = time.perf_counter()
+
+    def commit_batch():
+        nonlocal imported
+        for folder, players, state, _ in batch:
+            game = GameState(user_id=user_id, players=players, state=state)
+            db.session.add(game)
+            db.session.add(ImportedSave(folder=folder, game=game))
+        db.session.commit()
+        imported += len(batch)
+        batch.clear()
+        elapsed = time.perf_counter() - started
+        print(f"{imported + failed}/{len(folders)} folders, {imported} imported, {failed} failed, "
+              f"{imported / elapsed:.1f} games/s, {systems_total / elapsed:.0f} systems/s")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for result in executor.map(parse_save_folder, folders, chunksize=4):
+            if len(result) == 2:
+                failed += 1
+                print(f"{result[0]}: {result[1]}")
+                continue
+            batch.append(result)
+            systems_total += result[3]
+            if len(batch) >= batch_size:
+                commit_batch()
+    if batch:
+        commit_batch()
+    return imported, failed
+
+def make_app():
+    """
+    Only the database of the server app. Importing app.py would set up the
+    whole server (extensions, blueprints) before the worker processes fork.
+    """
+    from flask import Flask
+    from database import db
+    server_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    # Same instance folder as app.py, so sqlite:///game.db is the server's database
+    app = Flask(__name__, instance_path=os.path.join(server_dir, "instance"))
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///game.db')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description="Import save folders of the offline game as server games.")
+    parser.add_argument("paths", nargs="+", help="save folders or folders with save folders in them")
+    parser.add_argument("--user", required=True, help="username the games belong to")
+    parser.add_argument("--workers", type=int, default=None, help="parser processes (default: one per CPU)")
+    parser.add_argument("--batch-size", type=int, default=50, help="games per transaction")
+    args = parser.parse_args()
+
+    from database import db
+    from database.models import User, ImportedSave
+    app = make_app()
+
+    folders = find_save_folders(args.paths)
+    with app.app_context():
+        db.create_all()
+        user = User.query.filter_by(username=args.user).first()
+        if user is None:
+            sys.exit(f"Unknown user {args.user}")
+        done = {folder for (folder,) in db.session.query(ImportedSave.folder)}
+        todo = [folder for folder in folders if folder not in done]
+        print(f"{len(folders)} save folders, {len(folders) - len(todo)} already imported")
+        if not todo:
+            return
+        started = time.perf_counter()
+        imported, failed = import_folders(todo, user.id, args.workers, args.batch_size)
+    print(f"Imported {imported} games in {time.perf_counter() - started:.1f} s, {failed} folders failed")
+
+if __name__ == "__main__":
+    main()
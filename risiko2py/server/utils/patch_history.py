@@ -0,0 +1,72 @@
+"""
+The last patches of every game, so a client that has an older version of the
+game (from its cache) can catch up with /game/<id>/since/<version> instead of
+downloading the whole state.
+
+Filled from the game events (utils/events.py), so every server process has
+the patches of all processes. A process that started later only knows the
+newer patches; clients that are further behind get the full state.
+"""
+import threading
+from collections import OrderedDict, deque
+from utils.events import game_events, FLEET_LAUNCHED, READINESS_CHANGED, YEAR_ADVANCED, STATE_REPLACED
+
+# Patches kept per game and number of games kept (least recently changed are dropped)
+MAX_PATCHES = 200
+MAX_GAMES = 1000
+
+class PatchHistory:
+    def __init__(self, max_patches=MAX_PATCHES, max_games=MAX_GAMES):
+        self.max_patches = max_patches
+        self.max_games = max_games
+        self.lock = threading.Lock()
+        self.games = OrderedDict()  # game_id -> deque of patches, oldest first
+
+    def record(self, game_id, patch):
+        with self.lock:
+            patches = self.games.pop(game_id, None)
+            if patches is None:
+                patches = deque(maxlen=self.max_patches)
+            elif patches and patch["version"] != patches[-1]["version"] + 1:
+                # A version went missing, the older patches can't be chained any more
+                patches.clear()
+            patches.append(patch)
+            self.games[game_id] = patches
+            while len(self.games) > self.max_games:
+                self.games.popitem(last=False)
+
+    def forget(self, game_id=None):
+        with self.lock:
+            if game_id is None:
+                self.games.clear()
+            else:
+                self.games.pop(game_id, None)
+
+    def since(self, game_id, version, current_version):
+        """
+        The patches from version to current_version, or None if they are not
+        all known.
+        """
+        if version == current_version:
+            return []
+        if version > current_version:
+            return None
+        with self.lock:
+            patches = list(self.games.get(game_id, ()))
+        if not patches or patches[0]["version"] > version + 1 or patches[-1]["version"] != current_version:
+            return None
+        return [patch for patch in patches if patch["version"] > version]
+
+patch_history = PatchHistory()
+
+def record_patches(event):
+    if event["type"] == FLEET_LAUNCHED:
+        patch_history.record(event["game_id"], event["patch"])
+    elif event["type"] in (READINESS_CHANGED, YEAR_ADVANCED):
+        patch = event["response"].get("patch")
+        if patch is not None:
+            patch_history.record(event["game_id"], patch)
+    elif event["type"] == STATE_REPLACED:
+        patch_history.forget(event["game_id"])
+
+game_events.subscribe(record_patches)
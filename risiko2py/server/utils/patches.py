@@ -0,0 +1,26 @@
+def bump_version(state):
+    """Increase the state version. Every change to a game gets a new version."""
+    state["version"] = state.get("version", 0) + 1
+    return state["version"]
+
+def make_patch(state, systems=None, new_fleets=None, fleets=None, players=None):
+    """
+    Build a patch with only the parts of the game that changed.
+    - systems: changed system dicts, replace by (galaxy, system_id)
+    - new_fleets: fleets to append
+    - fleets: the complete new fleet list (after a turn every fleet changes)
+    - players: the complete player list (readiness)
+    """
+    patch = {
+        "version": state.get("version", 0),
+        "year": state.get("year", 1)
+    }
+    if systems:
+        patch["systems"] = systems
+    if new_fleets:
+        patch["new_fleets"] = new_fleets
+    if fleets is not None:
+        patch["fleets"] = fleets
+    if players is not None:
+        patch["players"] = players
+    return patch
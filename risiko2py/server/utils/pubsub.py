@@ -0,0 +1,199 @@
+"""
+Publish/subscribe of game events between server processes.
+
+With several workers (gunicorn, shards) a turn resolved in one process has to
+reach the clients waiting in the others. Routes publish events, interested
+parts of the server (like the long-poll waiters) subscribe to them.
+
+- LocalPubSub delivers inside the process, it is the default.
+- RespPubSub talks the Redis protocol, to a real Redis or to the small
+  stand-in from utils/resp_server.py. Set PUBSUB_URL=redis://host:port.
+
+Messages are dicts and sent as JSON.
+"""
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+class PubSub:
+    def publish(self, channel, message):
+        raise NotImplementedError
+
+    def subscribe(self, channel, callback):
+        """Call callback(message) for every message on channel. Returns a function that unsubscribes."""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class LocalPubSub(PubSub):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.callbacks = {}
+
+    def publish(self, channel, message):
+        with self.lock:
+            callbacks = list(self.callbacks.get(channel, ()))
+        for callback in callbacks:
+            try:
+                callback(message)
+            except Exception:
+                logger.exception("pubsub callback for %s failed", channel)
+
+    def subscribe(self, channel, callback):
+        with self.lock:
+            self.callbacks.setdefault(channel, []).append(callback)
+
+        def unsubscribe():
+            with self.lock:
+                if callback in self.callbacks.get(channel, ()):
+                    self.callbacks[channel].remove(callback)
+        return unsubscribe
+
+# --- Redis protocol (RESP) ---
+
+def encode_command(*args):
+    parts = [f"*{len(args)}\r\n".encode("ascii")]
+    for arg in args:
+        if isinstance(arg, str):
+            arg = arg.encode("utf-8")
+        parts.append(f"${len(arg)}\r\n".encode("ascii") + arg + b"\r\n")
+    return b"".join(parts)
+
+def read_reply(stream):
+    """Read one reply from a file-like socket stream."""
+    line = stream.readline()
+    if not line:
+        raise ConnectionError("Connection closed")
+    kind, rest = line[:1], line[1:-2]
+    if kind == b"+":
+        return rest.decode("utf-8")
+    if kind == b"-":
+        raise RuntimeError(rest.decode("utf-8"))
+    if kind == b":":
+        return int(rest)
+    if kind == b"$":
+        length = int(rest)
+        if length < 0:
+            return None
+        data = stream.read(length + 2)
+        return data[:-2]
+    if kind == b"*":
+        length = int(rest)
+        if length < 0:
+            return None
+        return [read_reply(stream) for _ in range(length)]
+    raise RuntimeError(f"Unknown reply {line!r}")
+
+class RespPubSub(PubSub):
+    # Seconds between reconnect attempts of the subscriber
+    RECONNECT_DELAY = 1.0
+
+    def __init__(self, host="127.0.0.1", port=6379):
+        self.address = (host, port)
+        self.lock = threading.Lock()
+        self.callbacks = {}
+        self.publisher = None
+        self.publisher_lock = threading.Lock()
+        self.subscriber = None
+        self.subscriber_lock = threading.Lock()
+        self.closed = False
+        self.thread = None
+
+    def connect(self):
+        sock = socket.create_connection(self.address)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock, sock.makefile("rb")
+
+    def publish(self, channel, message):
+        data = json.dumps(message)
+        with self.publisher_lock:
+            for attempt in range(2):
+                try:
+                    if self.publisher is None:
+                        self.publisher = self.connect()
+                    sock, stream = self.publisher
+                    sock.sendall(encode_command("PUBLISH", channel, data))
+                    return read_reply(stream)
+                except (OSError, ConnectionError):
+                    self.publisher = None
+                    if attempt:
+                        raise
+
+    def subscribe(self, channel, callback):
+        with self.lock:
+            new_channel = channel not in self.callbacks
+            self.callbacks.setdefault(channel, []).append(callback)
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.listen, daemon=True)
+            self.thread.start()
+        elif new_channel:
+            self.send_subscriber("SUBSCRIBE", channel)
+
+        def unsubscribe():
+            with self.lock:
+                if callback in self.callbacks.get(channel, ()):
+                    self.callbacks[channel].remove(callback)
+        return unsubscribe
+
+    def send_subscriber(self, *args):
+        with self.subscriber_lock:
+            if self.subscriber is not None:
+                try:
+                    self.subscriber[0].sendall(encode_command(*args))
+                except OSError:
+                    pass  # listen() subscribes again after reconnecting
+
+    def listen(self):
+        while not self.closed:
+            try:
+                sock, stream = self.connect()
+                with self.subscriber_lock:
+                    self.subscriber = (sock, stream)
+                    with self.lock:
+                        channels = list(self.callbacks)
+                    sock.sendall(encode_command("SUBSCRIBE", *channels))
+                while not self.closed:
+                    reply = read_reply(stream)
+                    if isinstance(reply, list) and reply and reply[0] == b"message":
+                        self.dispatch(reply[1].decode("utf-8"), json.loads(reply[2]))
+            except (OSError, ConnectionError, ValueError):
+                with self.subscriber_lock:
+                    self.subscriber = None
+                if not self.closed:
+                    time.sleep(self.RECONNECT_DELAY)
+
+    def dispatch(self, channel, message):
+        with self.lock:
+            callbacks = list(self.callbacks.get(channel, ()))
+        for callback in callbacks:
+            try:
+                callback(message)
+            except Exception:
+                logger.exception("pubsub callback for %s failed", channel)
+
+    def close(self):
+        self.closed = True
+        for connection in (self.publisher, self.subscriber):
+            if connection is not None:
+                try:
+                    connection[0].shutdown(socket.SHUT_RDWR)
+                    connection[0].close()
+                except OSError:
+                    pass
+
+def create_pubsub(url=None):
+    """PubSub for PUBSUB_URL: empty or local:// for in-process, redis://host:port for the Redis protocol."""
+    url = url or os.environ.get("PUBSUB_URL") or "local://"
+    parsed = urlparse(url)
+    if parsed.scheme == "local":
+        return LocalPubSub()
+    if parsed.scheme == "redis":
+        return RespPubSub(parsed.hostname or "127.0.0.1", parsed.port or 6379)
+    raise ValueError(f"Unknown pubsub url {url}")
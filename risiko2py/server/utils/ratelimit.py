@@ -0,0 +1,178 @@
+"""
+Admission control for the busy routes with token buckets.
+
+Every limited route has a bucket per user (JWT identity, or the client address
+for routes without a token) and optionally one per game. A bucket holds up to
+`capacity` requests and refills with `rate` requests per second. If a bucket is
+empty the request is answered with 429 and a Retry-After header.
+
+The buckets live in process memory. Set RATE_LIMIT_REDIS_URL in the app config
+(or the environment) to share them between server processes through Redis.
+RATE_LIMIT_ENABLED=0 switches the limits off, e.g. for benchmarks.
+"""
+import math
+import os
+import threading
+import time
+from collections import Counter
+from functools import wraps
+from flask import request, jsonify
+
+# route name -> {bucket scope: (rate per second, capacity)}
+DEFAULT_LIMITS = {
+    "send_fleet": {"user": (5, 20), "game": (20, 60)},
+    "ready": {"user": (2, 10), "game": (10, 30)},
+    "list": {"user": (1, 5)},
+    "login": {"user": (0.5, 5)}
+}
+
+class MemoryBucketStore:
+    # Above this many buckets, idle (= full again) buckets are dropped
+    MAX_BUCKETS = 100000
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets = {}
+
+    def take(self, key, rate, capacity, cost=1):
+        """Take `cost` tokens. Returns (allowed, seconds until enough tokens are back)."""
+        now = time.monotonic()
+        with self.lock:
+            tokens, last = self.buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - last) * rate)
+            if tokens >= cost:
+                self.buckets[key] = (tokens - cost, now)
+                allowed, retry_after = True, 0.0
+            else:
+                self.buckets[key] = (tokens, now)
+                allowed, retry_after = False, (cost - tokens) / rate
+            if len(self.buckets) > self.MAX_BUCKETS:
+                self.prune(now)
+        return allowed, retry_after
+
+    def prune(self, now):
+        # A bucket idle that long is full again, forgetting it changes nothing
+        self.buckets = {
+            key: (tokens, last) for key, (tokens, last) in self.buckets.items()
+            if now - last < 60
+        }
+
+class RedisBucketStore:
+    """Buckets shared by all server processes, kept in Redis and updated atomically in a script."""
+    SCRIPT = """
+    local rate = tonumber(ARGV[1])
+    local capacity = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local cost = tonumber(ARGV[4])
+    local data = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(data[1]) or capacity
+    local ts = tonumber(data[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    local allowed = 0
+    local retry_after = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+        allowed = 1
+    else
+        retry_after = (cost - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return {allowed, tostring(retry_after)}
+    """
+
+    def __init__(self, client, prefix="risiko:bucket:"):
+        self.client = client
+        self.prefix = prefix
+        self.script = client.register_script(self.SCRIPT)
+
+    @classmethod
+    def from_url(cls, url):
+        import redis  # only needed for the shared backend
+        return cls(redis.Redis.from_url(url))
+
+    def take(self, key, rate, capacity, cost=1):
+        allowed, retry_after = self.script(keys=[self.prefix + key],
+                                           args=[rate, capacity, time.time(), cost])
+        return bool(allowed), float(retry_after)
+
+class RateLimiter:
+    def __init__(self, store=None, limits=None):
+        self.store = store or MemoryBucketStore()
+        self.limits = dict(limits or DEFAULT_LIMITS)
+        self.enabled = True
+        self.trust_forwarded = False
+        self.metrics_lock = threading.Lock()
+        self.allowed = Counter()
+        self.rejected = Counter()
+
+    def init_app(self, app):
+        self.limits.update(app.config.get("RATE_LIMITS", {}))
+        self.enabled = app.config.get("RATE_LIMIT_ENABLED", os.environ.get("RATE_LIMIT_ENABLED", "1") != "0")
+        self.trust_forwarded = os.environ.get("RATE_LIMIT_TRUST_FORWARDED") == "1"
+        url = app.config.get("RATE_LIMIT_REDIS_URL") or os.environ.get("RATE_LIMIT_REDIS_URL")
+        if url:
+            self.store = RedisBucketStore.from_url(url)
+
+    def client_address(self):
+        # Behind the shard router (sharding/router.py) the real client is in X-Forwarded-For
+        if self.trust_forwarded and request.headers.get("X-Forwarded-For"):
+            return request.headers["X-Forwarded-For"].split(",")[0].strip()
+        return request.remote_addr
+
+    def bucket_keys(self, name):
+        """Yield (scope, key) for every bucket the current request has to pass."""
+        from flask_jwt_extended import get_jwt_identity
+        scopes = self.limits.get(name, {})
+        if "user" in scopes:
+            try:
+                identity = get_jwt_identity()
+            except RuntimeError:
+                # Route without @jwt_required, like the login
+                identity = None
+            who = f"id:{identity}" if identity is not None else f"ip:{self.client_address()}"
+            yield "user", f"{name}:user:{who}"
+        if "game" in scopes:
+            data = request.get_json(silent=True) or {}
+            game_id = (request.view_args or {}).get("game_id") or data.get("game_id")
+            if game_id is not None:
+                yield "game", f"{name}:game:{game_id}"
+
+    def check(self, name):
+        """Returns None if the request may pass, else the seconds to wait."""
+        for scope, key in self.bucket_keys(name):
+            rate, capacity = self.limits[name][scope]
+            allowed, retry_after = self.store.take(key, rate, capacity)
+            if not allowed:
+                with self.metrics_lock:
+                    self.rejected[f"{name}:{scope}"] += 1
+                return retry_after
+        with self.metrics_lock:
+            self.allowed[name] += 1
+        return None
+
+    def limit(self, name):
+        """Decorator for a route. Put it below @jwt_required so the identity is known."""
+        def decorator(f):
+            @wraps(f)
+            def decorated(*args, **kwargs):
+                if self.enabled:
+                    retry_after = self.check(name)
+                    if retry_after is not None:
+                        response = jsonify({'msg': 'Too many requests, slow down.'})
+                        response.status_code = 429
+                        response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+                        return response
+                return f(*args, **kwargs)
+            return decorated
+        return decorator
+
+    def metrics(self):
+        with self.metrics_lock:
+            return {
+                "allowed": dict(self.allowed),
+                "rejected": dict(self.rejected),
+                "rejected_total": sum(self.rejected.values())
+            }
+
+limiter = RateLimiter()
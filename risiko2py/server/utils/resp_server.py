@@ -0,0 +1,88 @@
+"""
+Tiny stand-in for Redis pub/sub, enough to run and test several server
+processes on one machine without installing Redis. Knows PING, PUBLISH,
+SUBSCRIBE and UNSUBSCRIBE.
+
+    python -m utils.resp_server --port 6379
+"""
+import argparse
+import asyncio
+
+def encode(value):
+    if isinstance(value, int):
+        return f":{value}\r\n".encode("ascii")
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    if isinstance(value, bytes):
+        return f"${len(value)}\r\n".encode("ascii") + value + b"\r\n"
+    return f"*{len(value)}\r\n".encode("ascii") + b"".join(encode(v) for v in value)
+
+async def read_command(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        # Inline command, as typed in telnet
+        return line.strip().split()
+    args = []
+    for _ in range(int(line[1:-2])):
+        length = int((await reader.readline())[1:-2])
+        args.append((await reader.readexactly(length + 2))[:-2])
+    return args
+
+class RespServer:
+    def __init__(self):
+        self.channels = {}
+
+    async def handle(self, reader, writer):
+        subscribed = set()
+        try:
+            while True:
+                args = await read_command(reader)
+                if args is None:
+                    break
+                if not args:
+                    continue
+                command = args[0].upper()
+                if command == b"PING":
+                    writer.write(b"+PONG\r\n")
+                elif command == b"PUBLISH" and len(args) == 3:
+                    receivers = self.channels.get(args[1], set())
+                    message = encode([b"message", args[1], args[2]])
+                    for receiver in receivers:
+                        receiver.write(message)
+                    writer.write(encode(len(receivers)))
+                elif command == b"SUBSCRIBE":
+                    for channel in args[1:]:
+                        self.channels.setdefault(channel, set()).add(writer)
+                        subscribed.add(channel)
+                        writer.write(encode([b"subscribe", channel, len(subscribed)]))
+                elif command == b"UNSUBSCRIBE":
+                    for channel in args[1:] or list(subscribed):
+                        self.channels.get(channel, set()).discard(writer)
+                        subscribed.discard(channel)
+                        writer.write(encode([b"unsubscribe", channel, len(subscribed)]))
+                else:
+                    writer.write(f"-ERR unknown command '{command.decode('latin1')}'\r\n".encode("utf-8"))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for channel in subscribed:
+                self.channels.get(channel, set()).discard(writer)
+            writer.close()
+
+async def serve(host, port):
+    server = await asyncio.start_server(RespServer().handle, host, port)
+    async with server:
+        await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Minimal Redis pub/sub stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port))
+
+if __name__ == "__main__":
+    main()
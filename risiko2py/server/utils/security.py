@@ -1,6 +1,9 @@
 from werkzeug.security import generate_password_hash, check_password_hash
 import jwt
 import datetime
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 from flask import request, jsonify, current_app
 from database.models import GameState
@@ -8,11 +11,56 @@ from database.models import GameState
 # Secret key for JWT encoding and decoding
 SECRET_KEY = "your_secret_key_here"
 
+# Hash method for new passwords. werkzeug's default (scrypt) is slow on purpose,
+# tests and benchmarks can use something cheap like "pbkdf2:sha256:1000".
+PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt")
+
+class HashingBusy(Exception):
+    """All hash workers are busy, the caller should try again later (503)."""
+
+class HashExecutor:
+    """
+    Runs the slow password hashing on a few worker threads instead of on every
+    request thread. At most `max_pending` hashes are accepted at a time, by
+    default as many as there are workers, so a hash never waits in a queue:
+    a login that finds every worker busy gets HashingBusy right away instead
+    of holding its request thread until the others are done. The request
+    thread still waits for its own hash (run), the executor doesn't make
+    that asynchronous, it keeps a burst from tying up more request threads
+    than there are workers.
+    """
+    def __init__(self, workers=None, max_pending=None):
+        self.workers = workers or int(os.environ.get("PASSWORD_HASH_WORKERS", os.cpu_count() or 2))
+        # More than workers lets a few hashes queue behind the running ones
+        self.max_pending = max_pending or int(os.environ.get("PASSWORD_HASH_MAX_PENDING", 0)) or self.workers
+        self.slots = threading.BoundedSemaphore(self.max_pending)
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+
+    def submit(self, fn, *args):
+        if not self.slots.acquire(blocking=False):
+            raise HashingBusy()
+        def task():
+            # Free the slot before the result is set, a caller may submit again right after
+            try:
+                return fn(*args)
+            finally:
+                self.slots.release()
+        try:
+            return self.executor.submit(task)
+        except Exception:
+            self.slots.release()
+            raise
+
+    def run(self, fn, *args):
+        return self.submit(fn, *args).result()
+
+hash_executor = HashExecutor()
+
 def hash_password(password):
-    return generate_password_hash(password)
+    return hash_executor.run(generate_password_hash, password, PASSWORD_HASH_METHOD)
 
 def verify_password(stored_password, provided_password):
-    return check_password_hash(stored_password, provided_password)
+    return hash_executor.run(check_password_hash, stored_password, provided_password)
 
 def generate_token(user_id):
     token = jwt.encode({
@@ -0,0 +1,52 @@
+def find_system(systems, galaxy, system_id):
+    for s in systems:
+        if s["galaxy"] == galaxy and s["system_id"] == system_id:
+            return s
+    return None
+
+def resolve_turn(state):
+    """
+    Move every fleet one turn forward, fight the arrivals, add production and
+    advance the year. Returns the list of systems that were changed.
+    """
+    systems = state["systems"]
+    fleets = state.get("fleets", [])
+    touched = {}
+
+    # --- Process fleets ---
+    remaining = []
+    for fleet in fleets:
+        fleet["turns"] -= 1
+        if fleet["turns"] <= 0:
+            # Older games did not store the destination galaxy on the fleet
+            dest_galaxy = fleet.get("dest_galaxy", systems[0]["galaxy"])
+            dest = find_system(systems, dest_galaxy, fleet["destination"])
+            if not dest:
+                remaining.append(fleet)
+                continue
+            # If unowned or same owner, add ships and set owner
+            if dest["owner"] == fleet["owner"] or dest["owner"] is None:
+                dest["current_ships"] += fleet["ships"]
+                dest["owner"] = fleet["owner"]
+            else:
+                # Combat: more ships wins
+                if fleet["ships"] > dest["current_ships"]:
+                    dest["owner"] = fleet["owner"]
+                    dest["current_ships"] = fleet["ships"] - dest["current_ships"]
+                else:
+                    dest["current_ships"] -= fleet["ships"]
+            touched[(dest["galaxy"], dest["system_id"])] = dest
+        else:
+            remaining.append(fleet)
+    # Keep only the fleets that are still underway
+    state["fleets"] = remaining
+
+    # --- Production phase ---
+    for sys in systems:
+        if sys["owner"]:
+            sys["current_ships"] += sys["ship_production"]
+            touched[(sys["galaxy"], sys["system_id"])] = sys
+
+    # --- Advance year ---
+    state["year"] = state.get("year", 1) + 1
+    return list(touched.values())
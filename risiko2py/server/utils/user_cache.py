@@ -0,0 +1,48 @@
+"""
+Short-lived cache of user records keyed by JWT identity, so routes that need
+the current user don't query the database on every request.
+"""
+import os
+import threading
+import time
+from flask_jwt_extended import get_jwt_identity
+from database.models import User
+
+USER_CACHE_TTL = float(os.environ.get("USER_CACHE_TTL", 60))
+
+class UserCache:
+    def __init__(self, ttl=USER_CACHE_TTL, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries = {}
+
+    def get(self, identity):
+        """Return {"id", "username"} for the identity, or None if there is no such user."""
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(identity)
+            if entry and entry[0] > now:
+                return entry[1]
+        user = User.query.get(identity)
+        record = {"id": user.id, "username": user.username} if user else None
+        with self.lock:
+            if len(self.entries) >= self.max_entries:
+                self.entries = {k: v for k, v in self.entries.items() if v[0] > now}
+                if len(self.entries) >= self.max_entries:
+                    self.entries.clear()
+            self.entries[identity] = (now + self.ttl, record)
+        return record
+
+    def invalidate(self, identity=None):
+        with self.lock:
+            if identity is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(identity, None)
+
+user_cache = UserCache()
+
+def get_current_user():
+    """The user of the current request (needs @jwt_required)."""
+    return user_cache.get(get_jwt_identity())
@@ -0,0 +1,115 @@
+"""
+Wake-up of clients waiting in /game/<id>/wait for the next turn.
+
+Each game has its own condition variable. The routes publish an event after a
+readiness change or a resolved turn (utils/events.py), so the waiters of every
+server process are woken. The response is serialized once per process and
+every waiter of the game gets the same bytes. Async waiters (asgi.py) are woken
+through futures on their event loop instead of the condition.
+"""
+import asyncio
+import json
+import threading
+from contextlib import contextmanager
+from utils.events import game_events, READINESS_CHANGED, YEAR_ADVANCED
+
+# Longest time in seconds a client may wait before it gets an empty answer
+WAIT_TIMEOUT = 25.0
+
+def wait_response(game_id, state, players, patch=None):
+    response = {
+        "game_id": game_id,
+        "year": state.get("year", 1),
+        "version": state.get("version", 0),
+        "players": players
+    }
+    if patch is not None:
+        response["patch"] = patch
+    return response
+
+class GameWaiter:
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.generation = 0
+        self.response = None
+        self.futures = []
+        self.users = 0  # requests in GameWaiters.watch
+
+class GameWaiters:
+    """
+    The waiters of the games someone is waiting for. A game's entry only lives
+    while requests are inside watch(), so a long running server doesn't keep
+    one for every game it has seen.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.games = {}
+
+    @contextmanager
+    def watch(self, game_id):
+        """
+        Keep the game's waiter while a request may wait for it. Take its
+        generation inside, before reading the game, so a change in between
+        is not missed.
+        """
+        with self.lock:
+            waiter = self.games.get(game_id)
+            if waiter is None:
+                waiter = self.games[game_id] = GameWaiter()
+            waiter.users += 1
+        try:
+            yield waiter
+        finally:
+            with self.lock:
+                waiter.users -= 1
+                if waiter.users == 0 and self.games.get(game_id) is waiter:
+                    del self.games[game_id]
+
+    def notify(self, game_id, response):
+        with self.lock:
+            waiter = self.games.get(game_id)
+        if waiter is None:
+            # Nobody waits, a request that starts now reads the changed game
+            return
+        body = json.dumps(response).encode("utf-8")
+        with waiter.condition:
+            waiter.generation += 1
+            waiter.response = body
+            futures, waiter.futures = waiter.futures, []
+            waiter.condition.notify_all()
+        for loop, future in futures:
+            loop.call_soon_threadsafe(_resolve, future, body)
+
+    def wait(self, waiter, generation, timeout=WAIT_TIMEOUT):
+        """Block until the game changes after `generation`. Returns the response bytes or None on timeout."""
+        with waiter.condition:
+            if waiter.condition.wait_for(lambda: waiter.generation > generation, timeout):
+                return waiter.response
+        return None
+
+    async def wait_async(self, waiter, generation, timeout=WAIT_TIMEOUT):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with waiter.condition:
+            if waiter.generation > generation:
+                return waiter.response
+            waiter.futures.append((loop, future))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            with waiter.condition:
+                if (loop, future) in waiter.futures:
+                    waiter.futures.remove((loop, future))
+            return None
+
+def _resolve(future, body):
+    if not future.done():
+        future.set_result(body)
+
+game_waiters = GameWaiters()
+
+def wake_waiters(event):
+    if event["type"] in (READINESS_CHANGED, YEAR_ADVANCED):
+        game_waiters.notify(event["game_id"], event["response"])
+
+game_events.subscribe(wake_waiters)
@@ -0,0 +1,71 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+# The hot-seat modules live in risiko2py/, the server imports itself as utils.*, routes.*
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "server"))
+
+# Read when the server modules are imported: a throwaway database, no limits, cheap hashes
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="risiko_tests_"), "game.db")
+os.environ["RATE_LIMIT_ENABLED"] = "0"
+os.environ["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:1000"
+
+@pytest.fixture(scope="session")
+def server():
+    from app import app, db
+    with app.app_context():
+        db.create_all()
+    return app
+
+@pytest.fixture
+def api(server):
+    """Test client and the headers of a logged in user."""
+    client = server.test_client()
+    client.post("/api/user/register", json={"username": "tester", "password": "tester"})
+    token = client.post("/api/user/login", json={"username": "tester", "password": "tester"}).get_json()["access_token"]
+    return client, {"Authorization": f"Bearer {token}"}
+
+@pytest.fixture
+def game(api):
+    """A new two player game: (client, headers, game_id, state)."""
+    client, headers = api
+    game_id = client.post("/api/game/start", json={"players": ["Alice", "Bob"], "planets": 40, "seed": 1},
+                          headers=headers).get_json()["game_id"]
+    return client, headers, game_id, load_state(client, headers, game_id)
+
+def load_state(client, headers, game_id):
+    return json.loads(client.get(f"/api/game/{game_id}", headers=headers).get_json()["state"])
+
+def start_planet(state, owner):
+    return next(system for system in state["systems"] if system["owner"] == owner)
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+@pytest.fixture
+def resp_server():
+    """utils/resp_server.py in its own process, yields its port."""
+    port = free_port()
+    proc = subprocess.Popen([sys.executable, "-m", "utils.resp_server", "--port", str(port)],
+                            cwd=os.path.join(ROOT, "server"))
+    try:
+        for _ in range(100):
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                time.sleep(0.05)
+        yield port
+    finally:
+        proc.kill()
+        proc.wait()
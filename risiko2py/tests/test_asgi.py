@@ -0,0 +1,32 @@
+import asyncio
+import json
+
+import pytest
+
+def call(path, query, headers):
+    from asgi import application
+    scope = {"type": "http", "method": "GET", "path": path, "query_string": query.encode("ascii"),
+             "headers": [(key.lower().encode("latin1"), value.encode("latin1")) for key, value in headers.items()]}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(application(scope, receive, send))
+    return sent[0]["status"], json.loads(sent[1]["body"] or b"null")
+
+@pytest.mark.parametrize("query, message", [("timeout=5", "Missing year"), ("year=1&timeout=soon", "timeout")])
+def test_wait_rejects_bad_parameters(api, query, message):
+    _, headers = api
+    status, body = call("/api/game/1/wait", query, headers)
+    assert status == 400
+    assert message in body["msg"]
+
+def test_flask_wait_rejects_bad_timeout(api):
+    client, headers = api
+    response = client.get("/api/game/1/wait?year=1&timeout=soon", headers=headers)
+    assert response.status_code == 400
+    assert "timeout" in response.get_json()["msg"]
@@ -0,0 +1,26 @@
+from conftest import free_port
+from utils.events import GameEvents, FLEET_LAUNCHED
+from utils.pubsub import RespPubSub
+
+def failing(event):
+    raise RuntimeError("subscriber failed")
+
+def test_failing_subscriber_doesnt_reach_the_publisher():
+    events = GameEvents()
+    seen = []
+    events.subscribe(failing)
+    events.subscribe(seen.append)
+    events.publish(FLEET_LAUNCHED, 1, patch={})
+    assert [event["game_id"] for event in seen] == [1]
+
+def test_unreachable_pubsub_is_logged_and_delivered_here(caplog):
+    events = GameEvents()
+    seen = []
+    events.subscribe(seen.append)
+    events.use(RespPubSub("127.0.0.1", free_port()))
+    try:
+        events.publish(FLEET_LAUNCHED, 2, patch={})
+    finally:
+        events.pubsub.close()
+    assert [event["game_id"] for event in seen] == [2]
+    assert "publishing fleet_launched of game 2 failed" in caplog.text
@@ -0,0 +1,66 @@
+import pytest
+
+from utils.galaxy_gen import generate_galaxies, map_size, MAX_CELLS, MAX_SYSTEMS, ROWS, COLS
+
+def check_galaxies(systems, coords, galaxies, planets):
+    assert len(systems) == galaxies * planets
+    assert len({(system["galaxy"], system["system_id"]) for system in systems}) == len(systems)
+    for galaxy in range(galaxies):
+        assert sorted(coords[galaxy]) == list(range(1, planets + 1))
+        # Distinct cells per galaxy
+        assert len(set(coords[galaxy].values())) == planets
+
+@pytest.mark.parametrize("galaxies, planets", [(1, 80), (3, 600), (2, 5000)])
+def test_ids_and_positions_are_unique(galaxies, planets):
+    systems, coords = generate_galaxies(galaxies, planets, ["A", "B", "C"], seed=3)
+    check_galaxies(systems, coords, galaxies, planets)
+    rows, cols = map_size(planets)
+    assert all(0 <= row < rows and 0 <= col < cols for positions in coords.values()
+               for row, col in positions.values())
+    assert sorted(system["owner"] for system in systems if system["owner"]) == ["A", "B", "C"]
+
+def test_full_map_falls_back_to_random_cells():
+    systems, coords = generate_galaxies(2, ROWS * COLS, [], seed=1, rows=ROWS, cols=COLS)
+    check_galaxies(systems, coords, 2, ROWS * COLS)
+
+def test_same_seed_same_map():
+    assert generate_galaxies(2, 100, ["A"], seed=9) == generate_galaxies(2, 100, ["A"], seed=9)
+
+def test_limits():
+    with pytest.raises(ValueError):
+        generate_galaxies(MAX_SYSTEMS // 1000 + 1, 1000, [])
+    with pytest.raises(ValueError):
+        generate_galaxies(1, 10, [], rows=MAX_CELLS, cols=2)
+    with pytest.raises(ValueError):
+        generate_galaxies(1, 50, [], rows=5, cols=5)
+
+def touching(positions):
+    cells = set(positions)
+    return sum(1 for row, col in cells if (row + 1, col) in cells or (row, col + 1) in cells)
+
+def test_map_grows_with_the_planets():
+    assert map_size(80) == (ROWS, COLS)
+    assert map_size(40) == (ROWS, COLS)
+    rows, cols = map_size(1000)
+    assert rows * cols >= 1000 * ROWS * COLS / 80
+    assert abs(rows / cols - ROWS / COLS) < 0.1
+
+def test_jittered_grid_keeps_systems_apart():
+    _, coords = generate_galaxies(10, 1000, [], seed=5)
+    # A few systems may keep touching after the jitter rounds
+    assert sum(touching(positions.values()) for positions in coords.values()) < 10 * 1000 * 0.01
+
+def test_hotseat_layout_matches_the_server():
+    import random
+    import hotseat_engine
+    assert hotseat_engine.map_size(1000) == map_size(1000)
+    random.seed(2)
+    rows, cols = hotseat_engine.map_size(1000)
+    positions = hotseat_engine.place_systems(1000, rows, cols)
+    assert len(set(positions)) == 1000
+    assert all(0 <= row < rows and 0 <= col < cols for row, col in positions)
+    assert touching(positions) < 1000 * 0.01
+    # Placing into a map with taken cells leaves them alone
+    taken = set(positions[:500])
+    more = hotseat_engine.place_systems(200, rows, cols, taken=set(taken))
+    assert not taken & set(more) and len(set(more)) == 200
@@ -0,0 +1,15 @@
+import json
+
+from utils.galaxy_pool import GalaxyTemplate, build_state_json
+
+def test_state_from_templates_has_the_galaxy_indices():
+    templates = [GalaxyTemplate(40, seed) for seed in range(3)]
+    state = json.loads(build_state_json(templates, ["A", "B", "C", "D"], {"year": 1}))
+    systems = state["systems"]
+    assert len(systems) == 3 * 40
+    assert sorted({system["galaxy"] for system in systems}) == [0, 1, 2]
+    assert len({(system["galaxy"], system["system_id"]) for system in systems}) == len(systems)
+    owners = {system["owner"]: system["galaxy"] for system in systems if system["owner"]}
+    # Players go to galaxy index % galaxies
+    assert owners == {"A": 0, "B": 1, "C": 2, "D": 0}
+    assert sorted(state["button_coords"]) == ["0", "1", "2"]
@@ -0,0 +1,136 @@
+import json
+import threading
+import time
+
+import pytest
+
+from conftest import load_state, start_planet
+
+@pytest.mark.parametrize("bots", [["Bot 1"], "Bot 1", {"Bot 1": "expert"}, {"Bot 1": ["easy"]}])
+def test_start_rejects_malformed_bots(api, bots):
+    client, headers = api
+    response = client.post("/api/game/start", json={"players": ["Alice"], "bots": bots}, headers=headers)
+    assert response.status_code == 400
+
+def test_start_with_bots(api):
+    client, headers = api
+    response = client.post("/api/game/start", json={"players": ["Alice"], "bots": {"Bot 1": "easy"}},
+                           headers=headers)
+    assert response.status_code == 201
+
+@pytest.mark.parametrize("options", [{"galaxies": "5"}, {"planets": 0}, {"planets": 2.5}, {"galaxies": True},
+                                     {"rows": "x"}, {"cols": -3}, {"seed": "abc"}, {"seed": -1},
+                                     {"galaxies": 101, "planets": 1000},
+                                     {"planets": 100, "rows": 10 ** 6, "cols": 10 ** 6}])
+def test_start_rejects_bad_sizes(api, options):
+    client, headers = api
+    response = client.post("/api/game/start", json=dict({"players": ["Alice"]}, **options), headers=headers)
+    assert response.status_code == 400
+
+def test_start_rejects_players_that_are_no_list(api):
+    client, headers = api
+    response = client.post("/api/game/start", json={"players": "Alice"}, headers=headers)
+    assert response.status_code == 400
+
+def test_start_with_map_size(api):
+    client, headers = api
+    response = client.post("/api/game/start", json={"players": ["Alice"], "planets": 50, "rows": 20, "cols": 10,
+                                                    "seed": 7}, headers=headers)
+    assert response.status_code == 201
+
+def send_fleet(client, headers, game_id, source, destination, ships):
+    return client.post("/api/game/send_fleet", json={
+        "game_id": game_id, "galaxy": source["galaxy"], "source": source["system_id"],
+        "destination": destination["system_id"], "ships": ships, "owner": source["owner"]}, headers=headers)
+
+def test_send_fleet_and_ready_patches_chain_their_versions(game):
+    client, headers, game_id, state = game
+    source = start_planet(state, "Alice")
+    destination = next(system for system in state["systems"] if system["owner"] is None)
+    version = state["version"]
+
+    patch = send_fleet(client, headers, game_id, source, destination, 10).get_json()["patch"]
+    assert patch["version"] == version + 1
+    assert patch["year"] == 1
+    assert patch["systems"] == [dict(source, current_ships=source["current_ships"] - 10)]
+    [fleet] = patch["new_fleets"]
+    assert (fleet["source"], fleet["destination"], fleet["ships"], fleet["owner"]) == \
+        (source["system_id"], destination["system_id"], 10, "Alice")
+    assert "fleets" not in patch and "players" not in patch
+
+    patch = client.post("/api/game/ready", json={"game_id": game_id, "player": "Alice"},
+                        headers=headers).get_json()["patch"]
+    assert patch["version"] == version + 2
+    assert patch["year"] == 1
+    assert patch["players"] == [{"owner": "Alice", "ready": True}, "Bob"]
+    assert "systems" not in patch
+
+    patch = client.post("/api/game/ready", json={"game_id": game_id, "player": "Bob"},
+                        headers=headers).get_json()["patch"]
+    assert patch["version"] == version + 3
+    assert patch["year"] == 2
+    assert [p["ready"] for p in patch["players"]] == [False, False]
+    assert patch["fleets"] == load_state(client, headers, game_id)["fleets"]
+    assert load_state(client, headers, game_id)["version"] == version + 3
+
+def test_send_fleet_refuses_more_ships_than_there_are(game):
+    client, headers, game_id, state = game
+    source = start_planet(state, "Alice")
+    response = send_fleet(client, headers, game_id, source, start_planet(state, "Bob"), source["current_ships"] + 1)
+    assert response.status_code == 400
+    assert load_state(client, headers, game_id)["version"] == state["version"]
+
+def since(client, headers, game_id, version):
+    return client.get(f"/api/game/{game_id}/since/{version}", headers=headers).get_json()
+
+def test_since_returns_the_missing_patches(game):
+    client, headers, game_id, state = game
+    version = state["version"]
+    client.post("/api/game/ready", json={"game_id": game_id, "player": "Alice"}, headers=headers)
+    client.post("/api/game/ready", json={"game_id": game_id, "player": "Bob"}, headers=headers)
+
+    answer = since(client, headers, game_id, version)
+    assert [patch["version"] for patch in answer["patches"]] == [version + 1, version + 2]
+    assert answer["version"] == version + 2
+    assert since(client, headers, game_id, version + 1)["patches"][0]["year"] == 2
+    assert since(client, headers, game_id, version + 2)["patches"] == []
+
+def test_since_with_a_gap_or_a_stale_version_sends_the_state(game):
+    from utils.patch_history import patch_history
+    client, headers, game_id, state = game
+    version = state["version"]
+    client.post("/api/game/ready", json={"game_id": game_id, "player": "Alice"}, headers=headers)
+    # This process missed the first patch, e.g. it was started after it
+    patch_history.forget(game_id)
+    client.post("/api/game/ready", json={"game_id": game_id, "player": "Bob"}, headers=headers)
+
+    assert [patch["version"] for patch in since(client, headers, game_id, version + 1)["patches"]] == [version + 2]
+    answer = since(client, headers, game_id, version)
+    assert "patches" not in answer
+    assert json.loads(answer["state"])["version"] == version + 2
+    # A cache of a deleted game with the same id can be ahead of the server
+    answer = since(client, headers, game_id, version + 50)
+    assert json.loads(answer["state"])["version"] == version + 2
+
+def test_wait_times_out_with_204(game):
+    client, headers, game_id, _ = game
+    response = client.get(f"/api/game/{game_id}/wait?year=1&timeout=0.1", headers=headers)
+    assert response.status_code == 204
+    response = client.get(f"/api/game/{game_id}/wait?year=1&timeout=soon", headers=headers)
+    assert response.status_code == 400
+
+def test_wait_is_woken_by_a_ready(game):
+    client, headers, game_id, _ = game
+    answers = []
+    waiter = threading.Thread(target=lambda: answers.append(client.application.test_client().get(
+        f"/api/game/{game_id}/wait?year=1&timeout=10", headers=headers)))
+    waiter.start()
+    time.sleep(0.2)
+    for player in ("Alice", "Bob"):
+        client.post("/api/game/ready", json={"game_id": game_id, "player": player}, headers=headers)
+    waiter.join(5)
+    assert not waiter.is_alive()
+    assert answers[0].status_code == 200
+    # Already past the year: answered at once
+    response = client.get(f"/api/game/{game_id}/wait?year=1&timeout=10", headers=headers)
+    assert response.status_code == 200 and response.get_json()["year"] == 2
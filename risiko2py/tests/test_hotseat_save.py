@@ -0,0 +1,42 @@
+import os
+import random
+
+from hotseat_engine import HotSeatGame
+from hotseat_save import SaveFile
+
+def new_game():
+    random.seed(1)
+    owners = ["Alice", "Bob"]
+    game = HotSeatGame.new(1, 40, owners)
+    game.assign_starting_planets({owner: 0 for owner in owners})
+    return game
+
+def play_turn(game):
+    for owner in game.owners:
+        game.set_ready(owner)
+
+def test_append_after_crash_is_not_lost(tmp_path):
+    path = str(tmp_path / "autosave.r2save")
+    game = new_game()
+    save_file = SaveFile(path)
+    save_file.write_snapshot(game)
+    play_turn(game)
+    save_file.append_delta(game)
+    good_size = os.path.getsize(path)
+
+    # Crash while appending the next delta: only half of the record is written
+    play_turn(game)
+    save_file.append_delta(game)
+    with open(path, "r+b") as f:
+        f.truncate(good_size + (os.path.getsize(path) - good_size) // 2)
+
+    game, save_file = SaveFile.load(path)
+    assert os.path.getsize(path) == good_size
+    year = game.year
+    for _ in range(2):
+        play_turn(game)
+        save_file.append_delta(game)
+
+    reloaded, _ = SaveFile.load(path)
+    assert reloaded.year == year + 2
+    assert reloaded.to_dict() == game.to_dict()
@@ -0,0 +1,90 @@
+import csv
+import json
+import os
+import random
+
+from hotseat_engine import HotSeatGame
+from utils.legacy_import import find_save_folders, import_folders, parse_save_folder
+
+def write_save_folder(game, folder):
+    # The CSV format of the offline game's save folders
+    os.makedirs(folder)
+    with open(os.path.join(folder, "players.csv"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Owner", "Color", "Ready"])
+        for owner in game.owners:
+            writer.writerow([owner, game.owner_colors[owner], "True" if owner in game.ready_set else "False"])
+    for galaxy, systems in enumerate(game.galaxies):
+        galaxy_folder = os.path.join(folder, f"galaxy_{galaxy}")
+        os.makedirs(galaxy_folder)
+        with open(os.path.join(galaxy_folder, "systems.csv"), "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Type", "ID", "Current Ships", "Ship Production", "Defense Factor", "Owner",
+                             "Grid Position", "Year"])
+            for system in systems.values():
+                writer.writerow(["System", system.system_id, system.current_ships, system.ship_production,
+                                 system.defense_factor, system.owner, str(system.grid_pos), game.year])
+        with open(os.path.join(galaxy_folder, "fleets.csv"), "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Type", "Source", "Destination", "Ships", "Turns", "Owner", "Year"])
+            for fleet in game.fleets[galaxy]:
+                writer.writerow(["Fleet", fleet["source"], fleet["destination"], fleet["ships"],
+                                 fleet["turns"], fleet["owner"], fleet["year"]])
+
+def played_game():
+    random.seed(4)
+    game = HotSeatGame.new(2, 30, ["Alice", "Bob"])
+    game.assign_starting_planets({"Alice": 0, "Bob": 1})
+    for galaxy, owner in ((0, "Alice"), (1, "Bob")):
+        source = next(system for system in game.galaxies[galaxy].values() if system.owner == owner)
+        game.launch_fleet(galaxy, source.system_id, source.system_id % 30 + 1, 20, owner)
+    game.set_ready("Alice")
+    return game
+
+def test_parse_matches_the_game(tmp_path):
+    game = played_game()
+    folder = str(tmp_path / "save_1")
+    write_save_folder(game, folder)
+
+    _, players, state, count = parse_save_folder(folder)
+    players, state = json.loads(players), json.loads(state)
+    assert players == [{"owner": "Alice", "ready": True}, {"owner": "Bob", "ready": False}]
+    assert state["owner_colors"] == game.owner_colors
+    assert (state["galaxies"], state["planets"], state["year"], count) == (2, 30, game.year, 60)
+    for system in state["systems"]:
+        original = game.galaxies[system["galaxy"]][system["system_id"]]
+        assert (system["owner"], system["current_ships"], system["ship_production"], system["defense_factor"],
+                tuple(system["coords"])) == (original.owner, original.current_ships, original.ship_production,
+                                             original.defense_factor, original.grid_pos)
+        assert state["button_coords"][str(system["galaxy"])][str(system["system_id"])] == system["coords"]
+    assert sorted((f["source_galaxy"], f["source"], f["destination"], f["ships"]) for f in state["fleets"]) == \
+        sorted((galaxy, f["source"], f["destination"], f["ships"])
+               for galaxy, fleets in enumerate(game.fleets) for f in fleets)
+
+def test_broken_folder_is_reported(tmp_path):
+    folder = tmp_path / "save_2"
+    folder.mkdir()
+    (folder / "players.csv").write_text("Owner,Color,Ready\nAlice,#FF0000,False\n")
+    assert len(parse_save_folder(str(folder))) == 2
+
+def test_import_round_trip(tmp_path, server, api):
+    from database.models import GameState, ImportedSave, User
+    game = played_game()
+    for name in ("save_a", "save_b"):
+        write_save_folder(game, str(tmp_path / name))
+    folders = find_save_folders([str(tmp_path)])
+    assert len(folders) == 2
+
+    client, headers = api
+    with server.app_context():
+        user = User.query.filter_by(username="tester").first()
+        assert import_folders(folders, user.id, workers=1, batch_size=1) == (2, 0)
+        imported = {save.folder: save.game_id for save in ImportedSave.query.filter(ImportedSave.folder.in_(folders))}
+    assert sorted(imported) == sorted(folders)
+
+    # The imported game is a normal server game
+    game_id = imported[folders[0]]
+    state = json.loads(client.get(f"/api/game/{game_id}", headers=headers).get_json()["state"])
+    assert len(state["systems"]) == 60 and state["year"] == game.year
+    response = client.post("/api/game/ready", json={"game_id": game_id, "player": "Bob"}, headers=headers)
+    assert response.get_json()["patch"]["year"] == game.year + 1
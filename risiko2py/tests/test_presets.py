@@ -0,0 +1,7 @@
+from utils.galaxy_pool import PRESETS
+from worldgen import BUILTIN_PRESETS
+
+def test_worldgen_presets_match_the_server():
+    sizes = {name: {"galaxies": preset["galaxies"], "planets": preset["planets"]}
+             for name, preset in BUILTIN_PRESETS.items()}
+    assert sizes == PRESETS
@@ -0,0 +1,66 @@
+import threading
+import time
+
+import pytest
+
+from utils.pubsub import LocalPubSub, RespPubSub, create_pubsub
+
+CHANNEL = "test:events"
+
+class Inbox:
+    def __init__(self):
+        self.messages = []
+        self.event = threading.Event()
+
+    def __call__(self, message):
+        self.messages.append(message)
+        self.event.set()
+
+def publish_when_subscribed(pubsub, message, receivers):
+    # The subscribers connect in the background, PUBLISH answers how many got it
+    deadline = time.monotonic() + 5
+    while pubsub.publish(CHANNEL, message) < receivers:
+        assert time.monotonic() < deadline, "subscribers didn't connect"
+        time.sleep(0.05)
+
+def test_local_pubsub_delivers_right_away():
+    pubsub = LocalPubSub()
+    inbox = Inbox()
+    unsubscribe = pubsub.subscribe(CHANNEL, inbox)
+    pubsub.publish(CHANNEL, {"n": 1})
+    unsubscribe()
+    pubsub.publish(CHANNEL, {"n": 2})
+    assert inbox.messages == [{"n": 1}]
+
+def test_resp_pubsub_delivers_to_every_process(resp_server):
+    # Two server processes, each with its own connection
+    first, second = RespPubSub(port=resp_server), RespPubSub(port=resp_server)
+    inboxes = [Inbox(), Inbox()]
+    try:
+        first.subscribe(CHANNEL, inboxes[0])
+        second.subscribe(CHANNEL, inboxes[1])
+        publish_when_subscribed(first, {"game_id": 1, "type": "ready"}, 2)
+        for inbox in inboxes:
+            assert inbox.event.wait(5)
+            assert inbox.messages == [{"game_id": 1, "type": "ready"}]
+    finally:
+        first.close()
+        second.close()
+
+def test_resp_pubsub_keeps_channels_apart(resp_server):
+    pubsub = RespPubSub(port=resp_server)
+    inbox, other = Inbox(), Inbox()
+    try:
+        pubsub.subscribe(CHANNEL, inbox)
+        pubsub.subscribe("test:other", other)
+        publish_when_subscribed(pubsub, {"n": 1}, 1)
+        assert inbox.event.wait(5)
+        assert other.messages == []
+    finally:
+        pubsub.close()
+
+@pytest.mark.parametrize("url, kind", [(None, LocalPubSub), ("local://", LocalPubSub),
+                                       ("redis://127.0.0.1:1", RespPubSub)])
+def test_create_pubsub(url, kind, monkeypatch):
+    monkeypatch.delenv("PUBSUB_URL", raising=False)
+    assert isinstance(create_pubsub(url), kind)
@@ -0,0 +1,22 @@
+from utils.ratelimit import MemoryBucketStore, limiter
+
+def test_bucket_empties_and_says_when_to_retry():
+    store = MemoryBucketStore()
+    assert [store.take("key", 0.5, 3)[0] for _ in range(3)] == [True, True, True]
+    allowed, retry_after = store.take("key", 0.5, 3)
+    assert not allowed
+    assert 1.9 < retry_after <= 2.0
+    # Other keys have their own bucket
+    assert store.take("other", 0.5, 3)[0]
+
+def test_route_answers_429_with_retry_after(game, monkeypatch):
+    client, headers, game_id, _ = game
+    monkeypatch.setattr(limiter, "enabled", True)
+    monkeypatch.setattr(limiter, "store", MemoryBucketStore())
+    monkeypatch.setitem(limiter.limits, "ready", {"user": (0.25, 2)})
+    ready = {"game_id": game_id, "player": "Alice"}
+    assert [client.post("/api/game/ready", json=ready, headers=headers).status_code for _ in range(2)] == [200, 200]
+    response = client.post("/api/game/ready", json=ready, headers=headers)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "4"
+    assert limiter.metrics()["rejected"]["ready:user"] >= 1
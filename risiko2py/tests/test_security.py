@@ -0,0 +1,21 @@
+import threading
+import time
+
+import pytest
+
+from utils.security import HashExecutor, HashingBusy
+
+def test_full_executor_rejects_instead_of_blocking():
+    executor = HashExecutor(workers=1)
+    release = threading.Event()
+    running = executor.submit(release.wait)
+    try:
+        start = time.perf_counter()
+        with pytest.raises(HashingBusy):
+            executor.run(lambda: None)
+        assert time.perf_counter() - start < 0.5
+    finally:
+        release.set()
+    running.result()
+    # The slot is free again once the hash is done
+    assert executor.run(lambda: 42) == 42
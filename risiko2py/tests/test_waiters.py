@@ -0,0 +1,25 @@
+import threading
+
+from utils.waiters import GameWaiters
+
+def test_waiters_are_dropped_when_nobody_waits():
+    waiters = GameWaiters()
+    waiters.notify(1, {"year": 2})
+    assert waiters.games == {}
+
+    with waiters.watch(1) as waiter:
+        generation = waiter.generation
+        threading.Timer(0.05, waiters.notify, (1, {"year": 2})).start()
+        assert waiters.wait(waiter, generation, timeout=5) == b'{"year": 2}'
+    assert waiters.games == {}
+
+def test_change_between_generation_and_wait_is_not_missed():
+    waiters = GameWaiters()
+    with waiters.watch(1) as waiter:
+        generation = waiter.generation
+        with waiters.watch(1) as other:
+            assert other is waiter
+        # The other request left, the entry has to stay for this one
+        waiters.notify(1, {"year": 3})
+        assert waiters.wait(waiter, generation, timeout=0) == b'{"year": 3}'
+    assert waiters.games == {}
@@ -1,24 +1,97 @@
 import csv
+import json
 import sys
-from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QSpinBox,
-                             QLineEdit, QPushButton, QMessageBox, QApplication)
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QSpinBox, QComboBox,
+                             QLineEdit, QPushButton, QMessageBox, QInputDialog, QApplication)
+
+PRESETS_FILE = 'worldgen_presets.json'
+# Options files of older versions, read once if there is no presets file yet
+LEGACY_OPTIONS_FILE = 'worldgen_options.csv'
+DEFAULT_OWNERS = ["Owner A", "Owner B", "Owner C", "Owner D", "Owner E"]
+# Same names and sizes as PRESETS in server/utils/galaxy_pool.py, keep them in step.
+# The hot-seat game builds every galaxy at once and stops at 10 (old_game.py).
+BUILTIN_PRESETS = {
+    "small": {"galaxies": 1, "planets": 40, "owners": DEFAULT_OWNERS},
+    "classic": {"galaxies": 1, "planets": 80, "owners": DEFAULT_OWNERS},
+    "large": {"galaxies": 5, "planets": 300, "owners": DEFAULT_OWNERS},
+    "huge": {"galaxies": 20, "planets": 1000, "owners": DEFAULT_OWNERS},
+    "epic": {"galaxies": 100, "planets": 1000, "owners": DEFAULT_OWNERS}
+}
+DEFAULT_PRESET = "classic"
+
+def load_presets():
+    """Returns {"selected": name, "presets": {name: {"galaxies", "planets", "owners"}}}."""
+    data = {"selected": DEFAULT_PRESET, "presets": {}}
+    try:
+        with open(PRESETS_FILE, 'r') as f:
+            data.update(json.load(f))
+    except FileNotFoundError:
+        legacy = load_legacy_options()
+        if legacy is not None:
+            data = {"selected": "saved", "presets": {"saved": legacy}}
+    except (OSError, ValueError) as e:
+        print("Error loading worldgen presets:", e)
+    data["presets"] = dict(BUILTIN_PRESETS, **data.get("presets", {}))
+    if data["selected"] not in data["presets"]:
+        data["selected"] = DEFAULT_PRESET
+    return data
+
+def save_preset(name, preset):
+    """Store a named preset (next to the built-in ones) and select it."""
+    data = load_presets()
+    saved = {key: value for key, value in data["presets"].items() if BUILTIN_PRESETS.get(key) != value}
+    saved[name] = preset
+    with open(PRESETS_FILE, 'w') as f:
+        json.dump({"selected": name, "presets": saved}, f, indent=2)
+
+def load_legacy_options():
+    try:
+        with open(LEGACY_OPTIONS_FILE, 'r', newline='') as csvfile:
+            lines = list(csv.reader(csvfile))
+        if len(lines) >= 2:
+            return {"galaxies": 1, "planets": int(lines[1][0]), "owners": lines[1][1].split("; ")}
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def load_worldgen_preset():
+    """The selected preset: {"galaxies", "planets", "owners"}."""
+    data = load_presets()
+    return data["presets"][data["selected"]]
 
 class WorldGenMenu(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.presets = load_presets()
         self.initUI()
-    
+
     def initUI(self):
         self.setWindowTitle("World Generation Options")
         layout = QVBoxLayout()
 
+        # Option: Preset.
+        preset_layout = QHBoxLayout()
+        preset_layout.addWidget(QLabel("Preset:"))
+        self.preset_combo = QComboBox()
+        self.preset_combo.addItems(list(self.presets["presets"]))
+        preset_layout.addWidget(self.preset_combo)
+        layout.addLayout(preset_layout)
+
+        # Option: Number of Galaxies.
+        galaxy_layout = QHBoxLayout()
+        galaxy_layout.addWidget(QLabel("Number of Galaxies:"))
+        self.galaxy_spinbox = QSpinBox()
+        self.galaxy_spinbox.setMinimum(1)
+        self.galaxy_spinbox.setMaximum(100)
+        galaxy_layout.addWidget(self.galaxy_spinbox)
+        layout.addLayout(galaxy_layout)
+
         # Option: Number of Planets.
         planet_layout = QHBoxLayout()
         planet_label = QLabel("Number of Planets:")
         self.planet_spinbox = QSpinBox()
         self.planet_spinbox.setMinimum(1)
         self.planet_spinbox.setMaximum(1000)
-        self.planet_spinbox.setValue(80)  # Default value.
         planet_layout.addWidget(planet_label)
         planet_layout.addWidget(self.planet_spinbox)
         layout.addLayout(planet_layout)
@@ -29,48 +102,51 @@ class WorldGenMenu(QDialog):
             owner_layout = QHBoxLayout()
             owner_label = QLabel(f"Owner {chr(65+i)} Name:")
             owner_edit = QLineEdit()
-            owner_edit.setText(f"Owner {chr(65+i)}")  # Default name.
             owner_layout.addWidget(owner_label)
             owner_layout.addWidget(owner_edit)
             layout.addLayout(owner_layout)
             self.owner_edits.append(owner_edit)
-        
+
         # Save Options Button.
         save_button = QPushButton("Save Options")
         save_button.clicked.connect(self.saveOptions)
         layout.addWidget(save_button)
-        
+
         self.setLayout(layout)
-    
+        self.preset_combo.currentTextChanged.connect(self.showPreset)
+        self.preset_combo.setCurrentText(self.presets["selected"])
+        self.showPreset(self.presets["selected"])
+
+    def showPreset(self, name):
+        preset = self.presets["presets"].get(name)
+        if preset is None:
+            return
+        self.galaxy_spinbox.setValue(preset["galaxies"])
+        self.planet_spinbox.setValue(preset["planets"])
+        for i, edit in enumerate(self.owner_edits):
+            edit.setText(preset["owners"][i] if i < len(preset["owners"]) else f"Owner {chr(65+i)}")
+
     def saveOptions(self):
-        num_planets = self.planet_spinbox.value()
-        owners = [edit.text() for edit in self.owner_edits]
-        # Save the options into a CSV file.
+        name, ok = QInputDialog.getText(self, "Save Preset", "Preset name:", text=self.preset_combo.currentText())
+        if not ok or not name.strip():
+            return
+        preset = {
+            "galaxies": self.galaxy_spinbox.value(),
+            "planets": self.planet_spinbox.value(),
+            "owners": [edit.text() for edit in self.owner_edits]
+        }
         try:
-            with open('worldgen_options.csv', 'w', newline='') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(['Number of Planets', 'Owner Names'])
-                writer.writerow([num_planets, "; ".join(owners)])
-            QMessageBox.information(self, "Save Successful", 
-                                    "Options saved to worldgen_options.csv")
-        except Exception as e:
+            save_preset(name.strip(), preset)
+            QMessageBox.information(self, "Save Successful",
+                                    f"Preset '{name.strip()}' saved to {PRESETS_FILE}")
+        except OSError as e:
             QMessageBox.warning(self, "Save Error", str(e))
         self.accept()
 
 def load_worldgen_options():
-    """Load world generation options from CSV. Returns a tuple: (number of planets, list of owners)."""
-    try:
-        with open('worldgen_options.csv', 'r', newline='') as csvfile:
-            reader = csv.reader(csvfile)
-            lines = list(reader)
-            if len(lines) >= 2:
-                num_planets = int(lines[1][0])
-                owners = lines[1][1].split("; ")
-                return num_planets, owners
-    except Exception as e:
-        print("Error loading worldgen options:", e)
-    # Fallback defaults.
-    return 80, ["Owner A", "Owner B", "Owner C", "Owner D", "Owner E"]
+    """Load world generation options of the selected preset. Returns a tuple: (number of planets, list of owners)."""
+    preset = load_worldgen_preset()
+    return preset["planets"], preset["owners"]
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
@@ -81,4 +157,4 @@ if __name__ == '__main__':
     print("Loaded World Generation Options:")
     print("Number of Planets:", num_planets)
     print("Owner Names:", owners)
-    sys.exit(0)
\ No newline at end of file
+    sys.exit(0)